@@ -1,11 +1,21 @@
 import os
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+# textures are bilinear-filtered when the GPU scales them (zoomed scene, icons)
+os.environ.setdefault('SDL_RENDER_SCALE_QUALITY', 'linear')
+# SDL only batches render calls by default when it picked the driver itself;
+# asking explicitly keeps the overlay fills/copies coalesced even when a
+# driver is forced with SDL_RENDER_DRIVER (e.g. opengl)
+os.environ.setdefault('SDL_RENDER_BATCHING', '1')
 import pygame
 import sys
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from math import sqrt
 from pathlib import Path
-from typing import Tuple, Dict, List, Tuple as Tup
+from typing import Tuple, Dict, List, Optional, Tuple as Tup
 from src.sand import SandSystem, SandParticle
 from src.water import WaterSystem, WaterParticle
 from src.lava import LavaSystem, LavaParticle
@@ -19,13 +29,17 @@ from src.diamond import DiamondSystem
 from src.milk import MilkSystem
 from src.dirt import DirtSystem
 from src.blocks import BlocksSystem
+from src.obstacle import ObstacleGrid
 from src.blood import BloodSystem
 from src.npc import NPC
+from src.spatial_hash import Grid
 from src.opt import get_or_create_optimizations
 from src.scaling import recommend_settings
 from src.zoom import Camera
 from src.admin import clear_everything, clear_living, clear_blocks
 from src.bg import GridBackground
+from src.glyphs import GlyphAtlas
+from src.shapes import nine_slice, rounded
 from src.menu import MainMenu
 from src.pause import PauseMenu
 from src.settings import load_settings, save_settings
@@ -35,6 +49,10 @@ from src.pluginman import pluginload
 from src import discord as dg_discord
 from src.col import CollisionManager, default_register_all
 from src import sound as sfx
+from src import _kernels
+from src import brush
+from src import raster
+from src import soa
 GPU_AVAILABLE = False
 try:
     from pygame._sdl2.video import Window, Renderer, Texture
@@ -42,6 +60,149 @@ try:
     GPU_AVAILABLE = True
 except Exception:
     GPU_AVAILABLE = False
+try:
+    from pygame._sdl2.video import compose_custom_blend_mode
+except Exception:
+    compose_custom_blend_mode = None
+
+_APP_DIR = Path(__file__).resolve().parent
+_ZOOM_IN_KEYS = (getattr(pygame, 'K_PLUS', pygame.K_EQUALS), pygame.K_EQUALS, pygame.K_KP_PLUS)
+_TEXT_CACHE_SIZE = 256
+_FPS_LABEL_EVERY = 10
+# SDL_BlendFactor / SDL_BlendOperation values for the overlay target's
+# premultiplied composite: dst = src + dst * (1 - src alpha)
+_BLENDFACTOR_ONE = 2
+_BLENDFACTOR_ONE_MINUS_SRC_ALPHA = 6
+_BLENDOPERATION_ADD = 1
+# past this many particles the GPU path stamps them into one framebuffer and
+# uploads it, rather than building a point tuple per particle for draw_points
+_FRAMEBUFFER_MIN = 4096
+_NO_NEIGHBORS: list = []
+# everything else (window/audio-device chatter) is blocked at the SDL queue so
+# handle_events never builds Event objects for it; text events stay enabled so
+# KEYDOWN keeps its unicode
+_HANDLED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL, pygame.VIDEORESIZE, pygame.TEXTINPUT, pygame.TEXTEDITING, pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN]
+_WINDOW_GONE_EVENTS = (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN)
+_WINDOW_BACK_EVENTS = (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN)
+# the system updates are pure Python, so threads only overlap them on a
+# free-threaded interpreter; under the GIL they'd just add switching
+_PARALLEL_UPDATES = not getattr(sys, '_is_gil_enabled', lambda: True)()
+_ASSET_INDEX: Dict[str, str] = {}
+_IMAGE_CACHE: Dict[str, pygame.Surface] = {}
+
+def _asset_index() -> Dict[str, str]:
+    if not _ASSET_INDEX:
+        try:
+            with os.scandir(_APP_DIR / 'src' / 'assets') as it:
+                for entry in it:
+                    if entry.is_file():
+                        _ASSET_INDEX.setdefault(entry.name.lower(), entry.path)
+        except OSError:
+            pass
+    return _ASSET_INDEX
+
+_SOLID_TILES: Dict[Tup[int, int, int], pygame.Surface] = {}
+
+def _solid_tile(color: Tup[int, int, int]) -> pygame.Surface:
+    # 1x1 placeholder for missing icons; every draw path scales icons to their rect
+    surf = _SOLID_TILES.get(color)
+    if surf is None:
+        surf = pygame.Surface((1, 1), pygame.SRCALPHA)
+        surf.fill((*color, 255))
+        _SOLID_TILES[color] = surf
+    return surf
+
+@lru_cache(maxsize=512)
+def _render_text(font: pygame.font.Font, text: str, color: Tup[int, int, int]) -> pygame.Surface:
+    # button_font renders shared by the CPU paths and the texture cache; evicting
+    # least-recent keeps the HUD strings warm where a full clear dropped them all
+    return font.render(text, True, color)
+
+_OVERLAY_SURFS: Dict[tuple, pygame.Surface] = {}
+
+def _overlay_cache(key: tuple):
+    if len(_OVERLAY_SURFS) >= 512:
+        _OVERLAY_SURFS.clear()
+    return _OVERLAY_SURFS.get(key)
+
+def _pack_atlas(surfs: List[pygame.Surface], max_w: int=1024) -> Tup[pygame.Surface, Dict[int, tuple]]:
+    # shelf-packs the surfaces into one sheet; each cell gets a one-pixel
+    # border repeating its edge so linear filtering at an icon's edge samples
+    # the icon, as it did when every icon had its own clamped texture
+    cells = []
+    x = y = row_h = sheet_w = 0
+    for surf in surfs:
+        w, h = surf.get_size()
+        if x and x + w + 2 > max_w:
+            x = 0
+            y += row_h
+            row_h = 0
+        cell = pygame.Surface((w + 2, h + 2), pygame.SRCALPHA)
+        cell.blit(surf, (1, 1), special_flags=pygame.BLEND_RGBA_MAX)
+        cell.blit(cell, (0, 0), (1, 0, 1, h + 2), pygame.BLEND_RGBA_MAX)
+        cell.blit(cell, (w + 1, 0), (w, 0, 1, h + 2), pygame.BLEND_RGBA_MAX)
+        cell.blit(cell, (0, 0), (0, 1, w + 2, 1), pygame.BLEND_RGBA_MAX)
+        cell.blit(cell, (0, h + 1), (0, h, w + 2, 1), pygame.BLEND_RGBA_MAX)
+        cells.append((surf, cell, x, y))
+        x += w + 2
+        row_h = max(row_h, h + 2)
+        sheet_w = max(sheet_w, x)
+    sheet = pygame.Surface((max(1, sheet_w), max(1, y + row_h)), pygame.SRCALPHA)
+    sheet.blits([(cell, (cx, cy), None, pygame.BLEND_RGBA_MAX) for _, cell, cx, cy in cells], doreturn=False)
+    return (sheet, {id(surf): (surf, (cx + 1, cy + 1, surf.get_width(), surf.get_height())) for surf, _, cx, cy in cells})
+
+def _tinted(size: Tup[int, int], rgba: Tup[int, int, int, int], radius: int=0) -> pygame.Surface:
+    # translucent panel backgrounds are the same every frame for a given size,
+    # so they are built once instead of allocated and filled per draw
+    key = ('tint', size, rgba, radius)
+    surf = _overlay_cache(key)
+    if surf is None:
+        if radius:
+            surf = rounded(size, rgba, radius)
+        else:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            surf.fill(rgba)
+        _OVERLAY_SURFS[key] = surf
+    return surf
+
+def _outline(size: Tup[int, int], rgb: Tup[int, int, int], radius: int=0) -> pygame.Surface:
+    key = ('outline', size, rgb, radius)
+    surf = _overlay_cache(key)
+    if surf is None:
+        if radius:
+            surf = rounded(size, (*rgb, 255), radius, 1)
+        else:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(surf, (*rgb, 255), surf.get_rect(), width=1)
+        _OVERLAY_SURFS[key] = surf
+    return surf
+
+def _menu_panel(size: Tup[int, int], header_h: int) -> pygame.Surface:
+    key = ('menu', size, header_h)
+    panel = _overlay_cache(key)
+    if panel is None:
+        # drawn once at the smallest size that holds the header and the
+        # bottom corners, then sliced out to the requested size
+        if size[0] >= 21 and size[1] >= header_h + 11 and header_h >= 20:
+            tkey = ('menu-template', header_h)
+            template = _overlay_cache(tkey)
+            if template is None:
+                template = _draw_menu_panel((21, header_h + 11), header_h)
+                _OVERLAY_SURFS[tkey] = template
+            panel = nine_slice(template, size, 10, header_h, 10, 10)
+        else:
+            panel = _draw_menu_panel(size, header_h)
+        _OVERLAY_SURFS[key] = panel
+    return panel
+
+def _draw_menu_panel(size: Tup[int, int], header_h: int) -> pygame.Surface:
+    mw, mh = size
+    panel = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.rect(panel, (0, 0, 0, 180), pygame.Rect(0, 0, mw, mh), border_radius=10)
+    pygame.draw.rect(panel, (12, 12, 12, 210), pygame.Rect(0, 0, mw, header_h), border_radius=10)
+    pygame.draw.rect(panel, (100, 100, 100, 220), pygame.Rect(0, 0, mw, mh), width=1, border_radius=10)
+    pygame.draw.rect(panel, (255, 255, 255, 25), pygame.Rect(1, 1, mw - 2, mh - 2), width=1, border_radius=9)
+    return panel
 
 class ParticleGame:
 
@@ -53,6 +214,11 @@ class ParticleGame:
         self.game_width = width
         self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE | pygame.DOUBLEBUF)
         pygame.display.set_caption('Dustground')
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(_HANDLED_EVENTS)
+        self._mouse_pos = (0, 0)
+        self._window_hidden = False
+        self._mouse_world = (0.0, 0.0)
         self.ready = False
         self._bench_done = False
         self._bench_cfg = None
@@ -61,6 +227,7 @@ class ParticleGame:
         self.max_particles = 50000
 
         def _bench_job():
+            _kernels.warmup()
             cfg = get_or_create_optimizations((self.game_width, self.height))
             self._bench_cfg = cfg
             self._bench_done = True
@@ -70,6 +237,10 @@ class ParticleGame:
         self.button_font = pygame.font.Font(None, 12)
         # HUD font for on-screen displays (clearer and larger)
         self.hud_font = pygame.font.Font(None, 18)
+        self._hud_glyphs = GlyphAtlas(self.hud_font, '0123456789.+-X FPSTime', (230, 230, 230))
+        # overlay titles, tile labels and search text share one white atlas,
+        # so every label copy on the GPU samples the same texture
+        self._ui_glyphs = GlyphAtlas(self.button_font, ''.join(map(chr, range(32, 127))), (255, 255, 255))
         self.sand_system = SandSystem(self.game_width, height)
         self.water_system = WaterSystem(self.game_width, height)
         self.lava_system = LavaSystem(self.game_width, height)
@@ -84,26 +255,46 @@ class ParticleGame:
         self.dirt_system = DirtSystem(self.game_width, height)
         self.blood_system = BloodSystem(self.game_width, height)
         self.blocks_system = BlocksSystem(self.game_width, height)
+        self.systems = [self.sand_system, self.water_system, self.lava_system, self.blue_lava_system, self.toxic_system, self.oil_system, self.metal_system, self.gold_system, self.ruby_system, self.diamond_system, self.milk_system, self.dirt_system, self.blood_system, self.blocks_system]
+        # stepped in this order between the sand/water begin_update and finish_update
+        self._frame_systems = [self.oil_system, self.lava_system, self.blue_lava_system, self.toxic_system, self.metal_system, self.ruby_system, self.diamond_system, self.gold_system, self.blood_system, self.dirt_system]
+        self._update_pool = None
+        if _PARALLEL_UPDATES and (os.cpu_count() or 1) > 1:
+            self._update_pool = ThreadPoolExecutor(max_workers=min(len(self._frame_systems) + 1, os.cpu_count()), thread_name_prefix='systems')
+        # with a pool the simulation steps for a frame run while the previous
+        # state is presented, so the picture trails the simulation by one frame
+        self._sim_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='simulation') if self._update_pool is not None else None
+        self._pending_steps = 0
+        # back-to-front draw order for the surface paths, and the point order
+        # the GPU path merges colours in
+        self._draw_systems = [self.blocks_system, self.metal_system, self.gold_system, self.ruby_system, self.diamond_system, self.dirt_system, self.sand_system, self.water_system, self.milk_system, self.oil_system, self.lava_system, self.blue_lava_system, self.toxic_system, self.blood_system]
+        self._render_systems = (self.dirt_system, self.sand_system, self.metal_system, self.gold_system, self.ruby_system, self.diamond_system, self.blocks_system, self.oil_system, self.water_system, self.milk_system, self.blue_lava_system, self.lava_system, self.toxic_system, self.blood_system)
+        # bound count getters, resolved once: the systems whose particles
+        # count against max_particles, and the ones the quality tier follows
+        self._particle_counters = tuple(s.get_particle_count for s in (self.sand_system, self.water_system, self.milk_system, self.oil_system, self.lava_system, self.blue_lava_system, self.toxic_system, self.metal_system, self.blood_system, self.dirt_system))
+        self._load_counters = tuple(s.get_particle_count for s in (self.sand_system, self.water_system, self.lava_system, self.blue_lava_system, self.toxic_system, self.blood_system))
+        # spawn-menu tools that paint a plain particle cluster under the brush
+        self._brush_systems = {'sand': self.sand_system, 'water': self.water_system, 'oil': self.oil_system, 'lava': self.lava_system, 'bluelava': self.blue_lava_system, 'ruby': self.ruby_system, 'diamond': self.diamond_system, 'gold': self.gold_system, 'metal': self.metal_system, 'toxic': self.toxic_system, 'dirt': self.dirt_system}
+        self._total_particles = 0
 
-        def _is_solid_obstacle(x: int, y: int) -> bool:
-            return self.metal_system.is_solid(x, y) or self.blocks_system.is_solid(x, y)
-        self._is_solid_obstacle = _is_solid_obstacle
+        self.obstacle_grid = ObstacleGrid(self.game_width, height)
+        self.metal_system.set_obstacle_grid(self.obstacle_grid)
+        self.blocks_system.set_obstacle_grid(self.obstacle_grid)
+        self._is_solid_obstacle = self.obstacle_grid.is_solid
         self.sand_system.set_obstacle_query(self._is_solid_obstacle)
         self.dirt_system.set_obstacle_query(self._is_solid_obstacle)
         self.water_system.set_obstacle_query(self._is_solid_obstacle)
+        self.water_system.set_obstacle_grid(self.obstacle_grid)
         self.lava_system.set_obstacle_query(self._is_solid_obstacle)
+        self.lava_system.set_obstacle_grid(self.obstacle_grid)
         self.blue_lava_system.set_obstacle_query(self._is_solid_obstacle)
         self.toxic_system.set_obstacle_query(self._is_solid_obstacle)
         self.oil_system.set_obstacle_query(self._is_solid_obstacle)
         self.blood_system.set_obstacle_query(self._is_solid_obstacle)
-        if hasattr(self, 'milk_system'):
-            self.milk_system.set_obstacle_query(self._is_solid_obstacle)
-        if hasattr(self, 'ruby_system'):
-            self.ruby_system.set_obstacle_query(self._is_solid_obstacle)
-        if hasattr(self, 'diamond_system'):
-            self.diamond_system.set_obstacle_query(self._is_solid_obstacle)
-        if hasattr(self, 'gold_system'):
-            self.gold_system.set_obstacle_query(self._is_solid_obstacle)
+        self.milk_system.set_obstacle_query(self._is_solid_obstacle)
+        self.ruby_system.set_obstacle_query(self._is_solid_obstacle)
+        self.diamond_system.set_obstacle_query(self._is_solid_obstacle)
+        self.gold_system.set_obstacle_query(self._is_solid_obstacle)
         self.blocks_system.set_external_obstacle(self.metal_system.is_solid)
                                                                                    
         try:
@@ -134,8 +325,12 @@ class ParticleGame:
             pass
         self.current_tool = 'sand'
         self.brush_size = 5
+        self._brush_key_hold = 0
         self.is_drawing = False
         self.buttons = {}
+        self._sidebar_key = None
+        self._sidebar_surf = None
+        self._sidebar_tex = None
         self.ui_show_spawn = False
         self.ui_show_admin = False
         self.ui_icon_size = 56
@@ -143,63 +338,57 @@ class ParticleGame:
         self.ui_admin_menu_size = (300, 220)
         self.ui_header_h = 36
         self.ui_grid_cols = 4
+        self.ui_admin_clear_rect = None
+        self.ui_admin_clear_npcs_rect = None
+        self.ui_admin_clear_blocks_rect = None
+        # placed by _layout_overlay_ui
+        self.ui_admin_rect = None
+        self.ui_admin_menu_rect = None
+        self.ui_search_rect = None
+        self._text_cache = OrderedDict()
         self.ui_flask_surf = self._load_image('src/assets/flask.png')
         if not self.ui_flask_surf:
-            self.ui_flask_surf = pygame.Surface((32, 32), pygame.SRCALPHA)
-            self.ui_flask_surf.fill((220, 220, 220, 255))
+            self.ui_flask_surf = _solid_tile((220, 220, 220))
+        self.ui_admin_surf = self._load_image('src/assets/admin.png')
+        if not self.ui_admin_surf:
+            self.ui_admin_surf = _solid_tile((220, 220, 220))
         self.ui_water_surf = self._load_image('src/assets/water.png')
         if not self.ui_water_surf:
-            self.ui_water_surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-            self.ui_water_surf.fill((80, 140, 255, 255))
+            self.ui_water_surf = _solid_tile((80, 140, 255))
         self.ui_sand_surf = self._load_image('src/assets/Sand.png')
         if not self.ui_sand_surf:
-            self.ui_sand_surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-            self.ui_sand_surf.fill((200, 180, 120, 255))
+            self.ui_sand_surf = _solid_tile((200, 180, 120))
         self.ui_lava_surf = self._load_image('src/assets/Lava.png')
         if not self.ui_lava_surf:
-            self.ui_lava_surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-            self.ui_lava_surf.fill((255, 120, 60, 255))
+            self.ui_lava_surf = _solid_tile((255, 120, 60))
         self.ui_npc_surf = self._load_image('src/assets/npc.png')
         if not self.ui_npc_surf:
-            self.ui_npc_surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-            self.ui_npc_surf.fill((180, 180, 200, 255))
+            self.ui_npc_surf = _solid_tile((180, 180, 200))
         self.ui_toxic_surf = self._load_image('src/assets/ToxicWaste.png')
         if not self.ui_toxic_surf:
-            self.ui_toxic_surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-            self.ui_toxic_surf.fill((90, 220, 90, 255))
+            self.ui_toxic_surf = _solid_tile((90, 220, 90))
         self.ui_oil_surf = self._load_image('src/assets/oil.png')
         if not self.ui_oil_surf:
-            self.ui_oil_surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-            self.ui_oil_surf.fill((60, 50, 30, 255))
+            self.ui_oil_surf = _solid_tile((60, 50, 30))
         self.ui_metal_surf = self._load_image('src/assets/metal.png')
         if not self.ui_metal_surf:
-            self.ui_metal_surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-            self.ui_metal_surf.fill((140, 140, 150, 255))
+            self.ui_metal_surf = _solid_tile((140, 140, 150))
         self.ui_dirt_surf = self._load_image('src/assets/dirt.png')
         if not self.ui_dirt_surf:
-            self.ui_dirt_surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-            self.ui_dirt_surf.fill((130, 100, 70, 255))
+            self.ui_dirt_surf = _solid_tile((130, 100, 70))
         self.ui_milk_surf = self._load_image('src/assets/milk.png')
         if not self.ui_milk_surf:
-            self.ui_milk_surf = pygame.Surface((64,64), pygame.SRCALPHA)
-            self.ui_milk_surf.fill((240,240,245,255))
+            self.ui_milk_surf = _solid_tile((240, 240, 245))
         self.ui_blocks_surf = self._load_image('src/assets/blocks.png')
         if not self.ui_blocks_surf:
-            self.ui_blocks_surf = pygame.Surface((64, 64), pygame.SRCALPHA)
-            self.ui_blocks_surf.fill((180, 180, 190, 255))
-        self._ui_flask_tex = None
-        self._ui_water_tex = None
-        self._ui_sand_tex = None
-        self._ui_lava_tex = None
-        self._ui_blue_lava_tex = None
-        self._ui_npc_tex = None
-        self._ui_toxic_tex = None
-        self._ui_oil_tex = None
-        self._ui_metal_tex = None
-        self._ui_dirt_tex = None
-        self._ui_blocks_tex = None
-                                                         
-        self._ui_admin_tex = None
+            self.ui_blocks_surf = _solid_tile((180, 180, 190))
+        self._ui_atlas = None
+        self._drag_preview_tex = None
+        self._drag_preview_surf = None
+        self._search_text_tex = None
+        self._search_text_key = None
+        # (x, top, bottom) of the search caret, set when the overlay repaints
+        self._search_caret = (0, 0, 0)
         self.ui_tiles = [
             {'key': 'blocks', 'label': 'BLOCKS', 'color': (180, 180, 190), 'surf': self.ui_blocks_surf},
             {'key': 'sand', 'label': 'SAND', 'color': (200, 180, 120), 'surf': self.ui_sand_surf},
@@ -219,24 +408,63 @@ class ParticleGame:
         ]
                                    
         self.ui_tile_rects = {}
+        self._ui_tile_key_list = []
+        self._ui_tile_rect_list = []
+        # (x0, y0, stride_x, stride_y, tile_w, tile_h, cols) of the tile grid
+        self._ui_tile_grid = (0, 0, 1, 1, 0, 0, 1)
         self.ui_spawn_search_text = ''
         self.ui_search_active = False
+        self._layout_cache = {}
+        self._overlay_geom = None
         self._layout_overlay_ui()
                                                                                 
         try:
             pluginload.load_enabled_plugins(self)
         except Exception:
             pass
+        self._layout_cache.clear()
+        self._overlay_geom = None
         self.fps = 0
         self._stats_cache_tex = None
         self._stats_cache_surf = None
         self._stats_updated_at = 0.0
         self._game_surface = None
+        self._gpu_layer = None
+        self._gpu_frame_tex = None
+        self._npc_layer = None
+        self._icon_fit_cache: Dict[tuple, tuple] = {}
+        self._npc_tex = None
+        self._gpu_frame_tex_size = None
+        self._fb_layer = None
+        self._fb_tex = None
+        # bumped by every simulation step and every batch of input events;
+        # while it holds still the zoomed frame can be reused as is
+        self._scene_version = 0
+        self._overlay_key = None
+        self._overlay_blits = []
+        self._ui_target = None
+        self._ui_target_size = None
+        self._ui_target_key = None
+        self._frame_rect_cache = None
+        self._hud_rects = None
+        self._overlay_ops = {False: (self._refresh_overlays_cpu, self._show_overlays_cpu, self._drag_preview_cpu, self._search_caret_cpu), True: (self._refresh_overlays_gpu, self._show_overlays_gpu, self._drag_preview_gpu, self._search_caret_gpu)}
+        self._zoom_cache = (None, None)
         self._frame_index = 0
         self._fps_avg = 0.0
+        # the HUD shows the averaged rate, re-labelled every _FPS_LABEL_EVERY
+        # presented frames rather than formatted per frame
+        self._fps_label = '0 FPS'
+        self._fps_frames = 0
         self._last_scale_apply = 0
+        self._applied_settings = None
         self._prev_mouse = None
         self.npcs = []
+        self._npc_grid = Grid(80.0)
+        self._neighbor_cache = {}
+        self._npc_grid_key = None
+        self._npc_pos_key = None
+        self._npc_pos = None
+        self._npc_refs = []
         self.active_npc = None
         self.npc_drag_index = None
         self._pan_active = False
@@ -247,14 +475,43 @@ class ParticleGame:
         # Time/speed controller for slow/fast/paused simulation
         self.speed = SpeedController()
 
-    def _get_text_texture(self, text: str, color: Tup[int, int, int]) -> 'Texture':
+    def _get_text_surf(self, text: str, color: Tup[int, int, int]) -> pygame.Surface:
+        return _render_text(self.button_font, text, color)
+
+    def _get_text_entry(self, text: str, color: Tup[int, int, int]) -> Tuple['Texture', pygame.Surface]:
         key = (text, color)
-        if key in getattr(self, '_text_cache', {}):
-            return self._text_cache[key]
-        surf = self.button_font.render(text, True, color)
-        tex = Texture.from_surface(self.renderer, surf)
-        self._text_cache[key] = tex
-        return tex
+        cache = self._text_cache
+        entry = cache.get(key)
+        if entry is not None:
+            cache.move_to_end(key)
+            return entry
+        surf = self._get_text_surf(text, color)
+        entry = (Texture.from_surface(self.renderer, surf), surf)
+        cache[key] = entry
+        while len(cache) > _TEXT_CACHE_SIZE:
+            _, (old_tex, _) = cache.popitem(last=False)
+            try:
+                old_tex.destroy()
+            except Exception:
+                pass
+        return entry
+
+    def _search_text_texture(self, text: str, color: Tup[int, int, int], max_w: int) -> Tuple['Texture', int, int]:
+        # the query changes on every keystroke, so text the glyph atlas cannot
+        # stamp is rewritten into one streaming texture rather than uploaded
+        # as a new texture per string
+        surf = self._get_text_surf(text, color)
+        w = max(1, min(surf.get_width(), max_w))
+        h = surf.get_height()
+        tex = self._search_text_tex
+        if tex is None or tex.renderer is not self.renderer or (tex.width, tex.height) != (max(1, max_w), h):
+            tex = self._search_text_tex = Texture(self.renderer, (max(1, max_w), h), streaming=True)
+            tex.blend_mode = 1
+            self._search_text_key = None
+        if self._search_text_key != (text, color):
+            self._search_text_key = (text, color)
+            tex.update(surf.subsurface((0, 0, w, h)), area=pygame.Rect(0, 0, w, h))
+        return (tex, w, h)
 
     def _on_menu_settings_change(self, new_settings: Dict):
         self.user_settings.update(new_settings or {})
@@ -290,13 +547,32 @@ class ParticleGame:
             pass
 
     def _load_image(self, rel_path: str):
-        candidates = [Path(rel_path), Path(__file__).resolve().parent / rel_path, Path(__file__).resolve().parent / rel_path.lstrip('./')]
+        cached = _IMAGE_CACHE.get(rel_path)
+        if cached is not None:
+            return cached
+        path = None
+        candidates = [Path(rel_path), _APP_DIR / rel_path, _APP_DIR / rel_path.lstrip('./')]
         for p in candidates:
             try:
                 if p.is_file():
-                    return pygame.image.load(str(p)).convert_alpha()
+                    path = str(p.resolve())
+                    break
             except Exception:
                 continue
+        if path is None:
+            # only a case-insensitive basename match in src/assets is left
+            path = _asset_index().get(Path(rel_path).name.lower())
+        if path is not None:
+            surf = _IMAGE_CACHE.get(path)
+            if surf is None:
+                try:
+                    surf = pygame.image.load(path).convert_alpha()
+                except Exception:
+                    surf = None
+            if surf is not None:
+                _IMAGE_CACHE[path] = surf
+                _IMAGE_CACHE[rel_path] = surf
+                return surf
         try:
             target = Path(rel_path).name.lower()
             dir_candidates = []
@@ -329,8 +605,8 @@ class ParticleGame:
             return None
 
     def _get_filtered_tiles(self):
-        q = getattr(self, 'ui_spawn_search_text', '') or ''
-        tiles = list(getattr(self, 'ui_tiles', []))
+        q = self.ui_spawn_search_text
+        tiles = list(self.ui_tiles)
         if not q:
             return tiles
         ql = q.lower()
@@ -351,7 +627,18 @@ class ParticleGame:
         self.ui_admin_menu_rect = pygame.Rect(self.ui_admin_rect.right + 10, 10, amw, amh)
         gpad = 14
         gap = 10
-        header_h = getattr(self, 'ui_header_h', 36)
+        header_h = self.ui_header_h
+        tiles_src = self.ui_tiles
+        key = (self.ui_spawn_search_text, self.ui_menu_rect.topleft, mw, mh, header_h, id(tiles_src), len(tiles_src))
+        cached = self._layout_cache.get(key)
+        if cached is not None:
+            self.ui_search_rect = cached[0].copy()
+            self.ui_tile_rects = dict(cached[1])
+            self._ui_tile_grid = cached[2]
+            self._ui_tile_key_list = list(self.ui_tile_rects)
+            self._ui_tile_rect_list = list(self.ui_tile_rects.values())
+            self._overlay_geom = None
+            return
         area_x = self.ui_menu_rect.x + gpad
         search_h = 26
         spad = 4
@@ -377,10 +664,49 @@ class ParticleGame:
             x = area_x + c * (tile_w + gap)
             y = area_y + r * (tile_h + gap)
             self.ui_tile_rects[tile['key']] = pygame.Rect(x, y, tile_w, tile_h)
+        self._ui_tile_key_list = list(self.ui_tile_rects)
+        self._ui_tile_rect_list = list(self.ui_tile_rects.values())
+        self._ui_tile_grid = (area_x, area_y, tile_w + gap, tile_h + gap, tile_w, tile_h, cols)
+        self._overlay_geom = None
+        if len(self._layout_cache) > 64:
+            self._layout_cache.clear()
+        self._layout_cache[key] = (self.ui_search_rect.copy(), dict(self.ui_tile_rects), self._ui_tile_grid)
+
+    def _hovered_tile(self, mx: int, my: int) -> Optional[str]:
+        # tiles sit on a regular grid, so the cell under the mouse is found by
+        # division and only the gap between tiles needs ruling out
+        x0, y0, sx, sy, tw, th, cols = self._ui_tile_grid
+        ix, ox = divmod(mx - x0, sx)
+        iy, oy = divmod(my - y0, sy)
+        if ix < 0 or iy < 0 or ix >= cols or ox >= tw or oy >= th:
+            return None
+        idx = iy * cols + ix
+        keys = self._ui_tile_key_list
+        return keys[idx] if idx < len(keys) else None
 
     def handle_events(self) -> bool:
-        for event in pygame.event.get():
-            if getattr(self, 'show_main_menu', False):
+        pan_dx = 0
+        pan_dy = 0
+        drag_pos = None
+        events = pygame.event.get()
+        # the pointer only moves when events are pumped, so this one read
+        # serves the simulation steps, hover tests and cursor for the frame
+        self._mouse_pos = pygame.mouse.get_pos()
+        if events:
+            self._scene_version += 1
+        for event in events:
+            if event.type != pygame.MOUSEMOTION and (pan_dx or pan_dy or drag_pos is not None):
+                self._apply_motion(pan_dx, pan_dy, drag_pos)
+                pan_dx = 0
+                pan_dy = 0
+                drag_pos = None
+            if event.type in _WINDOW_GONE_EVENTS:
+                self._window_hidden = True
+                continue
+            if event.type in _WINDOW_BACK_EVENTS:
+                self._window_hidden = False
+                continue
+            if self.show_main_menu:
                 if event.type == pygame.QUIT:
                     return False
                 if event.type == pygame.VIDEORESIZE:
@@ -393,15 +719,14 @@ class ParticleGame:
                         pluginload.load_enabled_plugins(self)
                     except Exception:
                         pass
-                    if hasattr(self, 'camera') and self.camera:
-                        self.camera.scale = 1.0
-                        self.camera.off_x = 0.0
-                        self.camera.off_y = 0.0
+                    self.camera.scale = 1.0
+                    self.camera.off_x = 0.0
+                    self.camera.off_y = 0.0
                     continue
                 elif action == 'quit':
                     return False
                 continue
-            if getattr(self, 'show_pause_menu', False):
+            if self.show_pause_menu:
                 if event.type == pygame.QUIT:
                     return False
                 if event.type == pygame.VIDEORESIZE:
@@ -414,12 +739,11 @@ class ParticleGame:
                 if action == 'exit':
                     self.show_pause_menu = False
                     self.show_main_menu = True
-                    if hasattr(self, 'camera') and self.camera:
-                        self.camera.scale = 1.0
-                        self.camera.off_x = 0.0
-                        self.camera.off_y = 0.0
+                    self.camera.scale = 1.0
+                    self.camera.off_x = 0.0
+                    self.camera.off_y = 0.0
                     self.ui_show_spawn = False
-                    setattr(self, 'ui_show_admin', False)
+                    self.ui_show_admin = False
                     continue
                 continue
             if event.type == pygame.QUIT:
@@ -432,27 +756,26 @@ class ParticleGame:
                     if self.ui_flask_rect.collidepoint(mx, my):
                         self.ui_show_spawn = not self.ui_show_spawn
                         if self.ui_show_spawn:
-                            setattr(self, 'ui_show_admin', False)
+                            self.ui_show_admin = False
                             self._layout_overlay_ui()
                             self.ui_search_active = False
                         continue
-                    if hasattr(self, 'ui_admin_rect') and self.ui_admin_rect.collidepoint(mx, my):
-                        self.ui_show_admin = not getattr(self, 'ui_show_admin', False)
+                    if self.ui_admin_rect.collidepoint(mx, my):
+                        self.ui_show_admin = not self.ui_show_admin
                         if self.ui_show_admin:
                             self.ui_show_spawn = False
                         continue
                     if self.ui_show_spawn and self.ui_menu_rect.collidepoint(mx, my):
-                        if hasattr(self, 'ui_search_rect') and self.ui_search_rect.collidepoint(mx, my):
+                        if self.ui_search_rect.collidepoint(mx, my):
                             self.ui_search_active = True
                         else:
                             self.ui_search_active = False
-                            for key, rect in getattr(self, 'ui_tile_rects', {}).items():
-                                if rect.collidepoint(mx, my):
-                                    self.current_tool = key
-                                    break
+                            hit = self._hovered_tile(mx, my)
+                            if hit is not None:
+                                self.current_tool = hit
                         continue
-                    if getattr(self, 'ui_show_admin', False) and hasattr(self, 'ui_admin_menu_rect') and self.ui_admin_menu_rect.collidepoint(mx, my):
-                        if hasattr(self, 'ui_admin_clear_rect') and self.ui_admin_clear_rect and self.ui_admin_clear_rect.collidepoint(mx, my):
+                    if self.ui_show_admin and self.ui_admin_menu_rect.collidepoint(mx, my):
+                        if self.ui_admin_clear_rect and self.ui_admin_clear_rect.collidepoint(mx, my):
                             try:
                                 clear_everything(self)
                             except Exception:
@@ -460,48 +783,38 @@ class ParticleGame:
                                     self.sand_system.clear()
                                     self.water_system.clear()
                                     self.lava_system.clear()
-                                    if hasattr(self, 'blue_lava_system'):
-                                        self.blue_lava_system.clear()
-                                    if hasattr(self, 'ruby_system'):
-                                        self.ruby_system.clear()
-                                    if hasattr(self, 'diamond_system'):
-                                        self.diamond_system.clear()
-                                    if hasattr(self, 'gold_system'):
-                                        self.gold_system.clear()
+                                    self.blue_lava_system.clear()
+                                    self.ruby_system.clear()
+                                    self.diamond_system.clear()
+                                    self.gold_system.clear()
                                     self.toxic_system.clear()
-                                    if hasattr(self, 'oil_system'):
-                                        self.oil_system.clear()
+                                    self.oil_system.clear()
                                     self.metal_system.clear()
                                     self.blood_system.clear()
                                     self.blocks_system.clear()
-                                    if hasattr(self, 'npcs'):
-                                        self.npcs.clear()
+                                    self.npcs.clear()
                                     self.active_npc = None
                                     self.npc_drag_index = None
                                 except Exception:
                                     pass
                             continue
-                        if hasattr(self, 'ui_admin_clear_npcs_rect') and self.ui_admin_clear_npcs_rect and self.ui_admin_clear_npcs_rect.collidepoint(mx, my):
+                        if self.ui_admin_clear_npcs_rect and self.ui_admin_clear_npcs_rect.collidepoint(mx, my):
                             try:
                                 clear_living(self)
                             except Exception:
                                 try:
-                                    if hasattr(self, 'npcs'):
-                                        self.npcs.clear()
+                                    self.npcs.clear()
                                     self.active_npc = None
                                     self.npc_drag_index = None
-                                    if hasattr(self, 'npc'):
-                                        self.npc = None
                                 except Exception:
                                     pass
                             continue
-                        if hasattr(self, 'ui_admin_clear_blocks_rect') and self.ui_admin_clear_blocks_rect and self.ui_admin_clear_blocks_rect.collidepoint(mx, my):
+                        if self.ui_admin_clear_blocks_rect and self.ui_admin_clear_blocks_rect.collidepoint(mx, my):
                             try:
                                 clear_blocks(self)
                             except Exception:
                                 try:
-                                    if hasattr(self, 'blocks_system'):
-                                        self.blocks_system.clear()
+                                    self.blocks_system.clear()
                                 except Exception:
                                     pass
                             continue
@@ -566,16 +879,11 @@ class ParticleGame:
                 if self._pan_active and self._pan_prev is not None:
                     mx, my = event.pos
                     pmx, pmy = self._pan_prev
-                    dx = mx - pmx
-                    dy = my - pmy
-                    self.camera.pan_by(-dx, -dy)
+                    pan_dx -= mx - pmx
+                    pan_dy -= my - pmy
                     self._pan_prev = (mx, my)
                 if self.current_tool == 'blocks' and self.blocks_drag_active:
-                    mx, my = event.pos
-                    if mx >= self.sidebar_width:
-                        vx = mx - self.sidebar_width
-                        gx, gy = self.camera.view_to_world(vx, my)
-                        self.blocks_drag_current = (int(gx), int(gy))
+                    drag_pos = event.pos
             elif event.type == pygame.KEYDOWN:
                 # Speed/time controls: LEFT slows, RIGHT speeds up, SPACE resets, P toggles pause
                 try:
@@ -585,7 +893,7 @@ class ParticleGame:
                 if event.key == pygame.K_ESCAPE:
                     self.show_pause_menu = True
                     continue
-                if self.ui_show_spawn and getattr(self, 'ui_search_active', False):
+                if self.ui_show_spawn and self.ui_search_active:
                     if event.key == pygame.K_BACKSPACE:
                         if self.ui_spawn_search_text:
                             self.ui_spawn_search_text = self.ui_spawn_search_text[:-1]
@@ -594,28 +902,51 @@ class ParticleGame:
                     elif event.key == pygame.K_RETURN:
                         continue
                     else:
-                        ch = getattr(event, 'unicode', '')
+                        ch = event.unicode
                         if ch and ch.isprintable() and not ch.isspace() or ch == ' ':
-                            self.ui_spawn_search_text = (self.ui_spawn_search_text or '') + ch
+                            self.ui_spawn_search_text += ch
                             self._layout_overlay_ui()
                             continue
                 mods = pygame.key.get_mods()
                 if mods & pygame.KMOD_CTRL:
-                    mx, my = pygame.mouse.get_pos()
+                    mx, my = self._mouse_pos
                     if mx >= self.sidebar_width:
                         vx = mx - self.sidebar_width
-                        if event.key in (getattr(pygame, 'K_PLUS', pygame.K_EQUALS), pygame.K_EQUALS, pygame.K_KP_PLUS):
+                        if event.key in _ZOOM_IN_KEYS:
                             scale = 1.1 if not self.invert_zoom else 1.0 / 1.1
                             self.camera.zoom_at(scale, vx, my)
                         elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
                             scale = 1.0 / 1.1 if not self.invert_zoom else 1.1
                             self.camera.zoom_at(scale, vx, my)
-                elif event.key == pygame.K_UP:
-                    self.brush_size = min(20, self.brush_size + 1)
-                elif event.key == pygame.K_DOWN:
-                    self.brush_size = max(1, self.brush_size - 1)
+        if pan_dx or pan_dy or drag_pos is not None:
+            self._apply_motion(pan_dx, pan_dy, drag_pos)
+        if not (self.show_main_menu or self.show_pause_menu):
+            self._poll_held_keys()
         return True
 
+    def _poll_held_keys(self):
+        keys = pygame.key.get_pressed()
+        step = 0
+        if keys[pygame.K_UP]:
+            step += 1
+        if keys[pygame.K_DOWN]:
+            step -= 1
+        if not step or pygame.key.get_mods() & pygame.KMOD_CTRL:
+            self._brush_key_hold = 0
+            return
+        if self._brush_key_hold % 6 == 0:
+            self.brush_size = max(1, min(20, self.brush_size + step))
+        self._brush_key_hold += 1
+
+    def _apply_motion(self, pan_dx: int, pan_dy: int, drag_pos):
+        if pan_dx or pan_dy:
+            self.camera.pan_by(pan_dx, pan_dy)
+        if drag_pos is not None and self.blocks_drag_active:
+            mx, my = drag_pos
+            if mx >= self.sidebar_width:
+                gx, gy = self.camera.view_to_world(mx - self.sidebar_width, my)
+                self.blocks_drag_current = (int(gx), int(gy))
+
     def _handle_sidebar_click(self, pos: Tuple[int, int]) -> bool:
         x, y = pos
         if x >= self.sidebar_width:
@@ -636,32 +967,9 @@ class ParticleGame:
             self.current_tool = 'npc'
             return True
         elif self.buttons['clear'].collidepoint(pos):
-            self.sand_system.clear()
-            self.water_system.clear()
-            if hasattr(self, 'dirt_system'):
-                self.dirt_system.clear()
-            if hasattr(self, 'milk_system'):
-                self.milk_system.clear()
-            if hasattr(self, 'blood_system'):
-                self.blood_system.clear()
-            if hasattr(self, 'lava_system'):
-                self.lava_system.clear()
-            if hasattr(self, 'blue_lava_system'):
-                self.blue_lava_system.clear()
-            if hasattr(self, 'ruby_system'):
-                self.ruby_system.clear()
-            if hasattr(self, 'diamond_system'):
-                self.diamond_system.clear()
-            if hasattr(self, 'gold_system'):
-                self.gold_system.clear()
-            if hasattr(self, 'toxic_system'):
-                self.toxic_system.clear()
-            if hasattr(self, 'oil_system'):
-                self.oil_system.clear()
-            if hasattr(self, 'blood_system'):
-                self.blood_system.clear()
-            if hasattr(self, 'metal_system'):
-                self.metal_system.clear()
+            for system in self.systems:
+                if system is not self.blocks_system:
+                    system.clear()
             self.npcs.clear()
             self.active_npc = None
             self.npc_drag_index = None
@@ -672,6 +980,8 @@ class ParticleGame:
         return int(max(120, min(260, w * 0.18)))
 
     def _layout_ui(self):
+        if self.sidebar_width <= 0:
+            return
         margin = 10
         bw = max(100, self.sidebar_width - margin * 2)
         bh = 40
@@ -690,45 +1000,11 @@ class ParticleGame:
         self.height = int(max(300, new_h))
         self.sidebar_width = 0
         self.game_width = self.width
-        self.sand_system.width = self.game_width
-        self.sand_system.height = self.height
-        if hasattr(self, 'dirt_system'):
-            self.dirt_system.width = self.game_width
-            self.dirt_system.height = self.height
-        self.water_system.width = self.game_width
-        self.water_system.height = self.height
-        if hasattr(self, 'milk_system'):
-            self.milk_system.width = self.game_width
-            self.milk_system.height = self.height
-        self.lava_system.width = self.game_width
-        self.lava_system.height = self.height
-        if hasattr(self, 'blue_lava_system'):
-            self.blue_lava_system.width = self.game_width
-            self.blue_lava_system.height = self.height
-        if hasattr(self, 'ruby_system'):
-            self.ruby_system.width = self.game_width
-            self.ruby_system.height = self.height
-        if hasattr(self, 'diamond_system'):
-            self.diamond_system.width = self.game_width
-            self.diamond_system.height = self.height
-        if hasattr(self, 'gold_system'):
-            self.gold_system.width = self.game_width
-            self.gold_system.height = self.height
-        if hasattr(self, 'toxic_system'):
-            self.toxic_system.width = self.game_width
-            self.toxic_system.height = self.height
-        if hasattr(self, 'oil_system'):
-            self.oil_system.width = self.game_width
-            self.oil_system.height = self.height
-        if hasattr(self, 'metal_system'):
-            self.metal_system.width = self.game_width
-            self.metal_system.height = self.height
-        if hasattr(self, 'blocks_system'):
-            self.blocks_system.width = self.game_width
-            self.blocks_system.height = self.height
-        if hasattr(self, 'blood_system'):
-            self.blood_system.width = self.game_width
-            self.blood_system.height = self.height
+        for system in self.systems:
+            system.width = self.game_width
+            system.height = self.height
+        if hasattr(self, 'obstacle_grid'):
+            self.obstacle_grid.resize(self.game_width, self.height)
         if hasattr(self, '_layout_overlay_ui'):
             self._layout_overlay_ui()
         if hasattr(self, 'camera') and self.camera:
@@ -762,95 +1038,36 @@ class ParticleGame:
     def _draw_on_canvas(self):
         if not self.is_drawing:
             return
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        if self.ui_flask_rect.collidepoint(mouse_x, mouse_y) or (getattr(self, 'ui_admin_rect', None) and self.ui_admin_rect.collidepoint(mouse_x, mouse_y)) or (self.ui_show_spawn and self.ui_menu_rect.collidepoint(mouse_x, mouse_y)) or (getattr(self, 'ui_show_admin', False) and getattr(self, 'ui_admin_menu_rect', None) and self.ui_admin_menu_rect.collidepoint(mouse_x, mouse_y)):
+        mouse_x, mouse_y = self._mouse_pos
+        if self.ui_flask_rect.collidepoint(mouse_x, mouse_y) or (self.ui_admin_rect and self.ui_admin_rect.collidepoint(mouse_x, mouse_y)) or (self.ui_show_spawn and self.ui_menu_rect.collidepoint(mouse_x, mouse_y)) or (self.ui_show_admin and self.ui_admin_menu_rect and self.ui_admin_menu_rect.collidepoint(mouse_x, mouse_y)):
             return
         if self.current_tool == 'blocks':
             return
-        view_x = mouse_x - self.sidebar_width
-        game_x, game_y = self.camera.view_to_world(view_x, mouse_y)
-        total = (self.sand_system.get_particle_count() +
-                  self.water_system.get_particle_count() +
-                  (self.milk_system.get_particle_count() if hasattr(self, 'milk_system') else 0) +
-                  (self.oil_system.get_particle_count() if hasattr(self, 'oil_system') else 0) +
-                  self.lava_system.get_particle_count() +
-                  (self.blue_lava_system.get_particle_count() if hasattr(self, 'blue_lava_system') else 0) +
-                  self.toxic_system.get_particle_count() +
-                  self.metal_system.get_particle_count() +
-                  self.blood_system.get_particle_count() +
-                  (self.dirt_system.get_particle_count() if hasattr(self, 'dirt_system') else 0))
-        if total >= self.max_particles:
+        game_x, game_y = self._mouse_world
+        if self._total_particles >= self.max_particles:
             if self.current_tool != 'npc':
                 return
         placed = False
-        if self.current_tool == 'sand':
-            self.sand_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
-            placed = True
-        elif self.current_tool == 'water':
-            self.water_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
-            placed = True
-        elif self.current_tool == 'oil':
-            self.oil_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
+        tool = self.current_tool
+        system = self._brush_systems.get(tool)
+        if system is not None:
+            system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
             placed = True
-        elif self.current_tool == 'lava':
-            self.lava_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
+        elif tool == 'milk':
+            self.milk_system.add_particle_batch(int(game_x), int(game_y), self.brush_size * 2)
             placed = True
-        elif self.current_tool == 'bluelava':
-            if hasattr(self, 'blue_lava_system'):
-                self.blue_lava_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
-                placed = True
-        elif self.current_tool == 'ruby':
-            if hasattr(self, 'ruby_system'):
-                self.ruby_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
-                placed = True
-        elif self.current_tool == 'diamond':
-            if hasattr(self, 'diamond_system'):
-                self.diamond_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
-                placed = True
-        elif self.current_tool == 'gold':
-            if hasattr(self, 'gold_system'):
-                self.gold_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
-                placed = True
-        elif self.current_tool == 'metal':
-            self.metal_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
+        elif tool == 'blood':
+            self.blood_system.add_spray(int(game_x), int(game_y), count=max(4, self.brush_size), speed=1.8)
             placed = True
-        elif self.current_tool == 'toxic':
-            self.toxic_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
-            placed = True
-        elif self.current_tool == 'milk':
-            if hasattr(self, 'milk_system'):
-                for _ in range(self.brush_size * 2):
-                    self.milk_system.add_particle(int(game_x), int(game_y))
-                placed = True
-        elif self.current_tool == 'blood':
-            if hasattr(self, 'blood_system'):
-                                                   
-                self.blood_system.add_spray(int(game_x), int(game_y), count=max(4, self.brush_size), speed=1.8)
-                placed = True
-        elif self.current_tool == 'dirt':
-            if hasattr(self, 'dirt_system'):
-                self.dirt_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
-                placed = True
-        elif self.current_tool == 'dirt':
-            if hasattr(self, 'dirt_system'):
-                self.dirt_system.add_particle_cluster(int(game_x), int(game_y), self.brush_size)
-                placed = True
-        elif self.current_tool == 'npc':
-            if self.active_npc is not None and self.npc_drag_index is not None:
-                try:
-                    p = self.active_npc.particles[self.npc_drag_index]
-                    p.pos[0] = float(game_x)
-                    p.pos[1] = float(game_y)
-                    p.prev[0] = float(game_x)
-                    p.prev[1] = float(game_y)
-                except Exception:
-                    pass
+        elif tool == 'npc':
+            # the grabbed NPC point follows the cursor in update()
+            pass
         else:
             try:
                 from DgPy.core import get_tools
                 tools = get_tools()
-                if self.current_tool in tools:
-                    spawn = tools[self.current_tool].get('spawn')
+                if tool in tools:
+                    spawn = tools[tool].get('spawn')
                     if callable(spawn):
                         spawn(self, int(game_x), int(game_y), int(self.brush_size))
             except Exception:
@@ -863,245 +1080,310 @@ class ParticleGame:
 
     def _handle_cross_material_collisions(self):
         MAX_NEIGHBORS = 12
-        if getattr(self, 'oil_system', None) and self.oil_system.particles:
-            for oil in self.oil_system.particles:
-                waters = self._get_nearby_water(oil.x, oil.y, radius=2)
-                if len(waters) > MAX_NEIGHBORS:
-                    waters = waters[:MAX_NEIGHBORS]
-                for w in waters:
-                    if w.y > oil.y + 0.5:
-                        oil.y -= 0.6
-                        oil.vy -= 0.25
-                        w.y += 0.3
-                        w.vy += 0.12
-        for water in self.water_system.particles:
-            sand_neighbors = self._get_nearby_sand(water.x, water.y, radius=2)
+        self._invalidate_neighbors()
+        sand_n = len(self.sand_system.particles)
+        water_n = len(self.water_system.particles)
+        lava_n = len(self.lava_system.particles)
+        oil_n = len(self.oil_system.particles) if getattr(self, 'oil_system', None) else 0
+        if oil_n and water_n:
+            if _kernels.NUMBA_AVAILABLE and oil_n >= _kernels.MIN_BATCH and _kernels._load():
+                self._oil_lift_jit(MAX_NEIGHBORS)
+            else:
+                self._oil_lift(MAX_NEIGHBORS)
+        if oil_n and lava_n:
+            if soa.NUMPY_AVAILABLE and lava_n + oil_n >= soa.MIN_BATCH:
+                self._ignite_oil_soa(MAX_NEIGHBORS)
+            else:
+                self._ignite_oil(MAX_NEIGHBORS)
+        # every remaining pair needs sand or water plus a second material
+        if not (sand_n and water_n) and not (lava_n and (sand_n or water_n)):
+            return
+        if soa.NUMPY_AVAILABLE and sand_n + water_n >= soa.MIN_BATCH:
+            self._cross_material_soa(MAX_NEIGHBORS)
+            return
+        near_sand = self._get_nearby_sand
+        near_water = self._get_nearby_water
+        for water in (self.water_system.particles if sand_n else ()):
+            wx = water.x
+            wy = water.y
+            sand_neighbors = near_sand(wx, wy, radius=2)
             if len(sand_neighbors) > MAX_NEIGHBORS:
                 sand_neighbors = sand_neighbors[:MAX_NEIGHBORS]
             for sand in sand_neighbors:
-                dx = sand.x - water.x
-                dy = sand.y - water.y
-                dist = (dx * dx + dy * dy) ** 0.5
-                if dist < 2.5 and dist > 0.1:
+                dx = sand.x - wx
+                dy = sand.y - wy
+                d2 = dx * dx + dy * dy
+                if 0.01 < d2 < 6.25:
                     sand.wet = True
-                    nx = dx / dist if dist > 0 else 0
-                    ny = dy / dist if dist > 0 else 1
+                    inv = 1.0 / sqrt(d2)
+                    nx = dx * inv
+                    ny = dy * inv
                     sand.vx += nx * 0.15
                     sand.vy += ny * 0.15
                     water.vx -= nx * 0.1
                     water.vy -= ny * 0.1
-        sand_kill = set()
-        water_kill = set()
+        sand_killed = False
+        water_killed = False
         for lava in self.lava_system.particles:
-            sands = self._get_nearby_sand(lava.x, lava.y, radius=2)
+            lx = lava.x
+            ly = lava.y
+            sands = near_sand(lx, ly, radius=2) if sand_n else _NO_NEIGHBORS
             if len(sands) > MAX_NEIGHBORS:
                 sands = sands[:MAX_NEIGHBORS]
             for s in sands:
-                dx = s.x - lava.x
-                dy = s.y - lava.y
+                dx = s.x - lx
+                dy = s.y - ly
                 d2 = dx * dx + dy * dy
-                if 0.01 < d2 < 2.5 * 2.5:
-                    sand_kill.add(id(s))
-                    d = d2 ** 0.5
-                    nx, ny = (dx / d, dy / d)
-                    lava.vx -= nx * 0.05
-                    lava.vy -= ny * 0.05
-            waters = self._get_nearby_water(lava.x, lava.y, radius=2)
+                if 0.01 < d2 < 6.25:
+                    s.dead = True
+                    sand_killed = True
+                    inv = 1.0 / sqrt(d2)
+                    lava.vx -= dx * inv * 0.05
+                    lava.vy -= dy * inv * 0.05
+            waters = near_water(lx, ly, radius=2) if water_n else _NO_NEIGHBORS
             if len(waters) > MAX_NEIGHBORS:
                 waters = waters[:MAX_NEIGHBORS]
             for w in waters:
-                dx = w.x - lava.x
-                dy = w.y - lava.y
+                dx = w.x - lx
+                dy = w.y - ly
                 d2 = dx * dx + dy * dy
-                if 0.01 < d2 < 2.5 * 2.5:
-                    water_kill.add(id(w))
-                    d = d2 ** 0.5
-                    nx, ny = (dx / d, dy / d)
-                    lava.vx -= nx * 0.03
-                    lava.vy -= ny * 0.03
-            if getattr(self, 'oil_system', None) and self.oil_system.particles:
-                oils = self._get_nearby_oil(lava.x, lava.y, radius=2)
-                if len(oils) > MAX_NEIGHBORS:
-                    oils = oils[:MAX_NEIGHBORS]
-                for o in oils:
-                    dx = o.x - lava.x
-                    dy = o.y - lava.y
-                    d2 = dx * dx + dy * dy
-                    if 0.01 < d2 <= 9.0:
-                        ignite = getattr(o, 'ignite', None)
-                        if ignite:
-                            ignite(220)
-        if sand_kill:
-            for p in self.sand_system.particles:
-                if id(p) in sand_kill:
-                    setattr(p, 'dead', True)
+                if 0.01 < d2 < 6.25:
+                    w.dead = True
+                    water_killed = True
+                    inv = 1.0 / sqrt(d2)
+                    lava.vx -= dx * inv * 0.03
+                    lava.vy -= dy * inv * 0.03
+        if sand_killed:
             self.sand_system.sweep_dead()
-        if water_kill:
-            for p in self.water_system.particles:
-                if id(p) in water_kill:
-                    setattr(p, 'dead', True)
+        if water_killed:
             self.water_system.sweep_dead()
 
-    def _get_nearby_sand(self, x: float, y: float, radius: int=2) -> list:
-        cell_x, cell_y = (int(x // self.sand_system.cell_size), int(y // self.sand_system.cell_size))
-        nearby = []
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in self.sand_system.grid:
-                    nearby.extend(self.sand_system.grid[cell])
+    def _oil_lift(self, max_neighbors: int):
+        for oil in self.oil_system.particles:
+            waters = self._get_nearby_water(oil.x, oil.y, radius=2)
+            if len(waters) > max_neighbors:
+                waters = waters[:max_neighbors]
+            for w in waters:
+                if w.y > oil.y + 0.5:
+                    oil.y -= 0.6
+                    oil.vy -= 0.25
+                    w.y += 0.3
+                    w.vy += 0.12
+
+    def _oil_lift_jit(self, max_neighbors: int):
+        np = _kernels.np
+        oils = self.oil_system.particles
+        waters, wcx, wcy = soa.grid_members(self.water_system)
+        if not waters:
+            return
+        ox, oy, _, ovy = _kernels.gather(oils)
+        wx, wy, _, wvy = _kernels.gather(waters)
+        o_hit = np.zeros(ox.shape[0], np.bool_)
+        w_hit = np.zeros(wx.shape[0], np.bool_)
+        _kernels.oil_lift(ox, oy, ovy, wcx, wcy, wx, wy, wvy, float(self.water_system.cell_size), 2, max_neighbors, o_hit, w_hit)
+        for particles, ys, vys, hit in ((oils, oy, ovy, o_hit), (waters, wy, wvy, w_hit)):
+            idx = np.flatnonzero(hit)
+            for i, y, vy in zip(idx.tolist(), ys[idx].tolist(), vys[idx].tolist()):
+                p = particles[i]
+                p.y = y
+                p.vy = vy
+
+    def _ignite_oil(self, max_neighbors: int):
+        for lava in self.lava_system.particles:
+            oils = self._get_nearby_oil(lava.x, lava.y, radius=2)
+            if len(oils) > max_neighbors:
+                oils = oils[:max_neighbors]
+            for o in oils:
+                dx = o.x - lava.x
+                dy = o.y - lava.y
+                d2 = dx * dx + dy * dy
+                if 0.01 < d2 <= 9.0:
+                    ignite = getattr(o, 'ignite', None)
+                    if ignite:
+                        ignite(220)
+
+    def _ignite_oil_soa(self, max_neighbors: int):
+        np = soa.np
+        lavas = self.lava_system.particles
+        oils, ocx, ocy = soa.grid_members(self.oil_system)
+        if not oils:
+            return
+        lx, ly = soa.positions(lavas)
+        ox, oy = soa.positions(oils)
+        li, oj = soa.neighbor_pairs(lx, ly, ocx, ocy, self.oil_system.cell_size, 2, max_neighbors)
+        dx = ox[oj] - lx[li]
+        dy = oy[oj] - ly[li]
+        d2 = dx * dx + dy * dy
+        # a repeat ignite(220) never changes a burning oil's timer, so each
+        # oil in reach of any lava is lit once
+        for j in np.unique(oj[(d2 > 0.01) & (d2 <= 9.0)]).tolist():
+            ignite = getattr(oils[j], 'ignite', None)
+            if ignite:
+                ignite(220)
+
+    def _cross_material_soa(self, max_neighbors: int):
+        # same passes as the loops above: the querying side walks its list at
+        # the current positions, the queried side is the dict grid's snapshot
+        np = soa.np
+        waters = self.water_system.particles
+        lavas = self.lava_system.particles
+        sand_cs = self.sand_system.cell_size
+        water_cs = self.water_system.cell_size
+        sands, scx, scy = soa.grid_members(self.sand_system) if self.sand_system.particles else ([], None, None)
+        if sands:
+            sx, sy, svx, svy = soa.gather(sands)
+        if sands and waters:
+            wx, wy, wvx, wvy = soa.gather(waters)
+            wi, sj = soa.push(wx, wy, wvx, wvy, scx, scy, sx, sy, svx, svy, sand_cs, 2, max_neighbors, 0.01, 6.25, -0.1, 0.15)
+            for j in np.unique(sj).tolist():
+                sands[j].wet = True
+            soa.write_velocities(sands, svx, svy, sj)
+            soa.write_velocities(waters, wvx, wvy, wi)
+        if not lavas:
+            return
+        lx, ly, lvx, lvy = soa.gather(lavas)
+        touched = []
+        sand_kill = water_kill = None
+        if sands:
+            li, sand_kill = soa.push(lx, ly, lvx, lvy, scx, scy, sx, sy, svx, svy, sand_cs, 2, max_neighbors, 0.01, 6.25, -0.05, 0.0)
+            touched.append(li)
+        pool, wcx, wcy = soa.grid_members(self.water_system) if waters else ([], None, None)
+        if pool:
+            gx, gy = soa.positions(pool)
+            li, water_kill = soa.push(lx, ly, lvx, lvy, wcx, wcy, gx, gy, None, None, water_cs, 2, max_neighbors, 0.01, 6.25, -0.03, 0.0)
+            touched.append(li)
+        if touched:
+            soa.write_velocities(lavas, lvx, lvy, np.concatenate(touched))
+        if sand_kill is not None and sand_kill.shape[0]:
+            for j in np.unique(sand_kill).tolist():
+                sands[j].dead = True
+            self.sand_system.sweep_dead()
+        if water_kill is not None and water_kill.shape[0]:
+            for j in np.unique(water_kill).tolist():
+                pool[j].dead = True
+            self.water_system.sweep_dead()
+
+    def _nearby(self, system, x: float, y: float, radius: int=2) -> list:
+        # cached per frame; the returned list is shared, callers must not mutate it
+        cs = system.cell_size
+        cell_x, cell_y = (int(x // cs), int(y // cs))
+        key = (id(system), cell_x, cell_y, radius)
+        nearby = self._neighbor_cache.get(key)
+        if nearby is not None:
+            return nearby
+        offsets = brush.square(radius)
+        get = system.grid.get
+        first = None
+        nearby = None
+        for dx, dy in offsets:
+            lst = get((cell_x + dx, cell_y + dy))
+            if lst:
+                if first is None:
+                    first = lst
+                    continue
+                if nearby is None:
+                    nearby = list(first)
+                nearby.extend(lst)
+        # a lone occupied cell is handed out as the grid's own list, no copy
+        if nearby is None:
+            nearby = first if first is not None else _NO_NEIGHBORS
+        self._neighbor_cache[key] = nearby
         return nearby
 
+    def _invalidate_neighbors(self):
+        self._neighbor_cache.clear()
+
+    def _get_nearby_sand(self, x: float, y: float, radius: int=2) -> list:
+        return self._nearby(self.sand_system, x, y, radius)
+
     def _get_nearby_water(self, x: float, y: float, radius: int=2) -> list:
-        cell_x, cell_y = (int(x // self.water_system.cell_size), int(y // self.water_system.cell_size))
-        nearby = []
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in self.water_system.grid:
-                    nearby.extend(self.water_system.grid[cell])
-        return nearby
+        return self._nearby(self.water_system, x, y, radius)
 
     def _get_nearby_blood(self, x: float, y: float, radius: int=2) -> list:
-        if not hasattr(self, 'blood_system'):
-            return []
-        cs = getattr(self.blood_system, 'cell_size', 3)
-        cell_x, cell_y = (int(x // cs), int(y // cs))
-        out = []
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cx = cell_x + dx
-                cy = cell_y + dy
-                for p in getattr(self.blood_system, 'particles', []):
-                    if int(p.x // cs) == cx and int(p.y // cs) == cy:
-                        out.append(p)
-        return out
+        return self._nearby(self.blood_system, x, y, radius)
 
     def _get_nearby_lava(self, x: float, y: float, radius: int=2) -> list:
-        cell_x, cell_y = (int(x // self.lava_system.cell_size), int(y // self.lava_system.cell_size))
-        nearby = []
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in self.lava_system.grid:
-                    nearby.extend(self.lava_system.grid[cell])
-        return nearby
+        return self._nearby(self.lava_system, x, y, radius)
 
     def _get_nearby_bluelava(self, x: float, y: float, radius: int=2) -> list:
-        if not hasattr(self, 'blue_lava_system'):
-            return []
-        cs = self.blue_lava_system.cell_size
-        cell_x, cell_y = (int(x // cs), int(y // cs))
-        nearby = []
-        grid = self.blue_lava_system.grid
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in grid:
-                    nearby.extend(grid[cell])
-        return nearby
+        return self._nearby(self.blue_lava_system, x, y, radius)
 
     def _get_nearby_ruby(self, x: float, y: float, radius: int=2) -> list:
-        if not hasattr(self, 'ruby_system'):
-            return []
-        cs = getattr(self.ruby_system, 'cell_size', 3)
-        cell_x, cell_y = (int(x // cs), int(y // cs))
-        nearby = []
-        grid = getattr(self.ruby_system, 'grid', {})
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in grid:
-                    nearby.extend(grid[cell])
-        return nearby
+        return self._nearby(self.ruby_system, x, y, radius)
 
     def _get_nearby_diamond(self, x: float, y: float, radius: int=2) -> list:
-        if not hasattr(self, 'diamond_system'):
-            return []
-        cs = getattr(self.diamond_system, 'cell_size', 3)
-        cell_x, cell_y = (int(x // cs), int(y // cs))
-        nearby = []
-        grid = getattr(self.diamond_system, 'grid', {})
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in grid:
-                    nearby.extend(grid[cell])
-        return nearby
+        return self._nearby(self.diamond_system, x, y, radius)
 
     def _get_nearby_gold(self, x: float, y: float, radius: int=2) -> list:
-        if not hasattr(self, 'gold_system'):
-            return []
-        cs = getattr(self.gold_system, 'cell_size', 3)
-        cell_x, cell_y = (int(x // cs), int(y // cs))
-        nearby = []
-        grid = getattr(self.gold_system, 'grid', {})
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in grid:
-                    nearby.extend(grid[cell])
-        return nearby
+        return self._nearby(self.gold_system, x, y, radius)
 
     def _get_nearby_toxic(self, x: float, y: float, radius: int=2) -> list:
-        cell_x, cell_y = (int(x // self.toxic_system.cell_size), int(y // self.toxic_system.cell_size))
-        nearby = []
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in self.toxic_system.grid:
-                    nearby.extend(self.toxic_system.grid[cell])
-        return nearby
+        return self._nearby(self.toxic_system, x, y, radius)
 
     def _get_nearby_oil(self, x: float, y: float, radius: int=2) -> list:
-        cell_x, cell_y = (int(x // self.oil_system.cell_size), int(y // self.oil_system.cell_size))
-        nearby = []
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in self.oil_system.grid:
-                    nearby.extend(self.oil_system.grid[cell])
-        return nearby
+        return self._nearby(self.oil_system, x, y, radius)
 
     def _get_nearby_milk(self, x: float, y: float, radius: int=2) -> list:
-        if not hasattr(self, 'milk_system'):
-            return []
-        cell_x, cell_y = (int(x // self.milk_system.cell_size), int(y // self.milk_system.cell_size))
-        nearby = []
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in self.milk_system.grid:
-                    nearby.extend(self.milk_system.grid[cell])
-        return nearby
+        return self._nearby(self.milk_system, x, y, radius)
 
     def _get_nearby_dirt(self, x: float, y: float, radius: int=2) -> list:
-        if not hasattr(self, 'dirt_system'):
-            return []
-        cell_x, cell_y = (int(x // self.dirt_system.cell_size), int(y // self.dirt_system.cell_size))
-        nearby = []
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                cell = (cell_x + dx, cell_y + dy)
-                if cell in self.dirt_system.grid:
-                    nearby.extend(self.dirt_system.grid[cell])
-        return nearby
+        return self._nearby(self.dirt_system, x, y, radius)
+
+    def _npc_candidates(self, x: float, y: float, max_dist: float):
+        grid = self._npc_grid
+        if max_dist * 2 > grid.cell_size:
+            return [(npc, i, p) for npc in self.npcs for i, p in enumerate(npc.particles)]
+        key = (self._frame_index, id(self.npcs), len(self.npcs))
+        if key != self._npc_grid_key:
+            grid.clear()
+            for npc in self.npcs:
+                for i, p in enumerate(npc.particles):
+                    grid.insert(p.pos.x, p.pos.y, (npc, i, p))
+            self._npc_grid_key = key
+        return grid.query(x, y)
+
+    def _npc_positions(self):
+        key = (self._frame_index, id(self.npcs), len(self.npcs))
+        if key != self._npc_pos_key:
+            refs = [(npc, i) for npc in self.npcs for i in range(len(npc.particles))]
+            pos = soa.np.empty((len(refs), 2), soa.np.float64)
+            for k, (npc, i) in enumerate(refs):
+                p = npc.particles[i].pos
+                pos[k, 0] = p.x
+                pos[k, 1] = p.y
+            self._npc_refs = refs
+            self._npc_pos = pos
+            self._npc_pos_key = key
+        return (self._npc_refs, self._npc_pos)
 
     def _find_nearest_npc(self, x: float, y: float, max_dist: float=40.0):
         if not getattr(self, 'npcs', None):
             return (None, None, None)
+        if soa.NUMPY_AVAILABLE and max_dist * 2 > self._npc_grid.cell_size:
+            # too wide for the grid to prune; one argmin over every NPC particle
+            refs, pos = self._npc_positions()
+            if not refs:
+                return (None, None, None)
+            d = pos - (float(x), float(y))
+            d2 = (d * d).sum(axis=1)
+            k = int(d2.argmin())
+            if d2[k] >= max_dist * max_dist:
+                return (None, None, None)
+            npc, i = refs[k]
+            return (npc, i, float(d2[k]) ** 0.5)
         best_npc = None
         best_idx = None
         best_d2 = max_dist * max_dist
-        for npc in self.npcs:
-            for i, p in enumerate(npc.particles):
-                dx = float(p.pos.x) - float(x)
-                dy = float(p.pos.y) - float(y)
-                d2 = dx * dx + dy * dy
-                if d2 < best_d2:
-                    best_d2 = d2
-                    best_npc = npc
-                    best_idx = i
+        x = float(x)
+        y = float(y)
+        for npc, i, p in self._npc_candidates(x, y, max_dist):
+            dx = float(p.pos.x) - x
+            dy = float(p.pos.y) - y
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best_d2 = d2
+                best_npc = npc
+                best_idx = i
         if best_npc is None:
             return (None, None, None)
         return (best_npc, best_idx, best_d2 ** 0.5)
@@ -1109,73 +1391,61 @@ class ParticleGame:
     def _npc_particle_coupling(self):
         if not getattr(self, 'npcs', None) or (not self.sand_system.particles and (not self.water_system.particles)):
             return
-        push_radius = 8.0
-        push_r2 = push_radius * push_radius
-        sand_push = 0.2
-        water_push = 0.25
+        push_r2 = 8.0 * 8.0
         npc_react = 0.04
         radius_cells = 2
         max_neighbors = 10
+        # (lookup, push) per material, sand before water; one of the two is
+        # usually empty and its lookups are skipped rather than run dry
+        lookups = []
+        if self.sand_system.particles:
+            lookups.append((self._get_nearby_sand, 0.2))
+        if self.water_system.particles:
+            lookups.append((self._get_nearby_water, 0.25))
         for npc in self.npcs:
             for p in npc.particles:
-                px, py = p.pos
-                sands = self._get_nearby_sand(px, py, radius=radius_cells)
-                if len(sands) > max_neighbors:
-                    sands = sands[:max_neighbors]
-                for s in sands:
-                    dx = s.x - px
-                    dy = s.y - py
-                    d2 = dx * dx + dy * dy
-                    if d2 > push_r2 or d2 <= 0.0001:
-                        continue
-                    d = d2 ** 0.5
-                    nx = dx / d
-                    ny = dy / d
-                    s.vx += nx * sand_push
-                    s.vy += ny * sand_push
-                    p.pos[0] -= nx * npc_react
-                    p.pos[1] -= ny * npc_react
-                waters = self._get_nearby_water(px, py, radius=radius_cells)
-                if len(waters) > max_neighbors:
-                    waters = waters[:max_neighbors]
-                for w in waters:
-                    dx = w.x - px
-                    dy = w.y - py
-                    d2 = dx * dx + dy * dy
-                    if d2 > push_r2 or d2 <= 0.0001:
-                        continue
-                    d = d2 ** 0.5
-                    nx = dx / d
-                    ny = dy / d
-                    w.vx += nx * water_push
-                    w.vy += ny * water_push
-                    p.pos[0] -= nx * npc_react
-                    p.pos[1] -= ny * npc_react
+                pos = p.pos
+                px, py = pos
+                for near, push in lookups:
+                    others = near(px, py, radius=radius_cells)
+                    if len(others) > max_neighbors:
+                        others = others[:max_neighbors]
+                    for o in others:
+                        dx = o.x - px
+                        dy = o.y - py
+                        d2 = dx * dx + dy * dy
+                        if d2 > push_r2 or d2 <= 0.0001:
+                            continue
+                        inv = 1.0 / sqrt(d2)
+                        nx = dx * inv
+                        ny = dy * inv
+                        o.vx += nx * push
+                        o.vy += ny * push
+                        pos[0] -= nx * npc_react
+                        pos[1] -= ny * npc_react
 
     def _apply_cursor_interaction(self):
-        mx, my = pygame.mouse.get_pos()
-        if self.ui_flask_rect.collidepoint(mx, my) or (getattr(self, 'ui_admin_rect', None) and self.ui_admin_rect.collidepoint(mx, my)) or (self.ui_show_spawn and self.ui_menu_rect.collidepoint(mx, my)) or (getattr(self, 'ui_show_admin', False) and getattr(self, 'ui_admin_menu_rect', None) and self.ui_admin_menu_rect.collidepoint(mx, my)):
+        mx, my = self._mouse_pos
+        if self.ui_flask_rect.collidepoint(mx, my) or (self.ui_admin_rect and self.ui_admin_rect.collidepoint(mx, my)) or (self.ui_show_spawn and self.ui_menu_rect.collidepoint(mx, my)) or (self.ui_show_admin and self.ui_admin_menu_rect and self.ui_admin_menu_rect.collidepoint(mx, my)):
             self._prev_mouse = (mx, my)
             return
         if self._prev_mouse is None:
             self._prev_mouse = (mx, my)
             return
-        if not self.ready or mx < self.sidebar_width:
+        if not self.ready or mx < self.sidebar_width or not (self.sand_system.particles or self.water_system.particles):
             self._prev_mouse = (mx, my)
             return
-        gvx = mx - self.sidebar_width
-        gvy = my
-        gx, gy = self.camera.view_to_world(gvx, gvy)
+        gx, gy = self._mouse_world
         pmx, pmy = self._prev_mouse
         dx = (mx - pmx) / max(self.camera.scale, 1e-06)
         dy = (my - pmy) / max(self.camera.scale, 1e-06)
         self._prev_mouse = (mx, my)
         moved = (dx * dx + dy * dy) ** 0.5
-        if moved < 0.1:
-            dx = 0.0
-            dy = 0.0
+        # a resting cursor still pulls on nearby particles, it just adds no drag
+        dragging = moved >= 0.1
         self.sand_system._rebuild_grid()
         self.water_system._rebuild_grid()
+        self._invalidate_neighbors()
         radius_cells = 2
         push_radius = 10
         move_strength_sand = 0.15
@@ -1192,8 +1462,9 @@ class ParticleGame:
                 ny = oy / d
                 s.vx += -nx * outward_strength
                 s.vy += -ny * outward_strength
-            s.vx += dx * move_strength_sand * 0.1
-            s.vy += dy * move_strength_sand * 0.1
+            if dragging:
+                s.vx += dx * move_strength_sand * 0.1
+                s.vy += dy * move_strength_sand * 0.1
         water_neighbors = self._get_nearby_water(gx, gy, radius=radius_cells)
         for w in water_neighbors:
             ox = w.x - gx
@@ -1205,8 +1476,9 @@ class ParticleGame:
                 ny = oy / d
                 w.vx += -nx * outward_strength
                 w.vy += -ny * outward_strength
-            w.vx += dx * move_strength_water * 0.1
-            w.vy += dy * move_strength_water * 0.1
+            if dragging:
+                w.vx += dx * move_strength_water * 0.1
+                w.vy += dy * move_strength_water * 0.1
 
     def _handle_npc_hazards(self):
         if not getattr(self, 'npcs', None):
@@ -1239,9 +1511,10 @@ class ParticleGame:
                             break
 
     def update(self):
+        self._invalidate_neighbors()
         try:
             if getattr(self, 'discord_rpc_enabled', True):
-                if getattr(self, 'show_main_menu', False):
+                if self.show_main_menu:
                     dg_discord.update_for_menu()
                 else:
                     pc = 0
@@ -1254,90 +1527,82 @@ class ParticleGame:
                     dg_discord.update_for_sandbox(pc)
         except Exception:
             pass
-        if getattr(self, 'show_main_menu', False):
+        if self.show_main_menu:
             if hasattr(self, 'menu'):
                 self.menu.update()
             self._frame_index += 1
-            if hasattr(self, 'clock'):
-                self.fps = int(self.clock.get_fps())
             return
-        if getattr(self, 'show_pause_menu', False):
+        if self.show_pause_menu:
             if hasattr(self, 'pause_menu'):
                 self.pause_menu.update()
             self._frame_index += 1
-            if hasattr(self, 'clock'):
-                self.fps = int(self.clock.get_fps())
             return
+        # the camera only moves in handle_events, so one transform serves the
+        # brush, the cursor push and the NPC drag
+        self._mouse_world = self.camera.view_to_world(self._mouse_pos[0] - self.sidebar_width, self._mouse_pos[1])
+        self._total_particles = sum([count() for count in self._particle_counters])
         self._draw_on_canvas()
         if not self.ready:
             return
         self._apply_cursor_interaction()
         if self.active_npc is not None and self.current_tool == 'npc' and self.is_drawing and (self.npc_drag_index is not None):
-            mx, my = pygame.mouse.get_pos()
+            mx, my = self._mouse_pos
             if mx >= self.sidebar_width:
-                vx = mx - self.sidebar_width
-                gx, gy = self.camera.view_to_world(vx, my)
+                gx, gy = self._mouse_world
                 try:
                     p = self.active_npc.particles[self.npc_drag_index]
-                    p.pos[0] = gx
-                    p.pos[1] = gy
-                    p.prev[0] = gx
-                    p.prev[1] = gy
+                    p.pos.update(gx, gy)
+                    p.prev.update(gx, gy)
                 except Exception:
                     pass
-        total = (self.sand_system.get_particle_count() + self.water_system.get_particle_count() +
-                 self.lava_system.get_particle_count() +
-                 (self.blue_lava_system.get_particle_count() if hasattr(self, 'blue_lava_system') else 0) +
-                 self.toxic_system.get_particle_count() + self.blood_system.get_particle_count())
         if self._frame_index - self._last_scale_apply >= 15:
+            total = sum([count() for count in self._load_counters])
             settings = recommend_settings(total, self._fps_avg or self.fps, self.target_fps, self.use_gpu)
-            s = settings['sand']
-            w = settings['water']
-            self.sand_system.neighbor_radius = s['neighbor_radius']
-            self.sand_system.max_neighbors = s['max_neighbors']
-            self.sand_system.skip_mod = s['skip_mod']
-            self.water_system.neighbor_radius = w['neighbor_radius']
-            self.water_system.max_neighbors = w['max_neighbors']
-            self.water_system.skip_mod = w['skip_mod']
-            self.lava_system.neighbor_radius = w['neighbor_radius']
-            self.lava_system.max_neighbors = w['max_neighbors']
-            self.lava_system.skip_mod = w['skip_mod']
-            self.toxic_system.neighbor_radius = w['neighbor_radius']
-            self.toxic_system.max_neighbors = w['max_neighbors']
-            self.toxic_system.skip_mod = w['skip_mod']
-            if hasattr(self, 'oil_system'):
+            if settings is not self._applied_settings:
+                self._applied_settings = settings
+                s = settings['sand']
+                w = settings['water']
+                self.sand_system.neighbor_radius = s['neighbor_radius']
+                self.sand_system.max_neighbors = s['max_neighbors']
+                self.sand_system.skip_mod = s['skip_mod']
+                self.water_system.neighbor_radius = w['neighbor_radius']
+                self.water_system.max_neighbors = w['max_neighbors']
+                self.water_system.skip_mod = w['skip_mod']
+                self.lava_system.neighbor_radius = w['neighbor_radius']
+                self.lava_system.max_neighbors = w['max_neighbors']
+                self.lava_system.skip_mod = w['skip_mod']
+                self.toxic_system.neighbor_radius = w['neighbor_radius']
+                self.toxic_system.max_neighbors = w['max_neighbors']
+                self.toxic_system.skip_mod = w['skip_mod']
                 self.oil_system.neighbor_radius = w['neighbor_radius']
                 self.oil_system.max_neighbors = w['max_neighbors']
                 self.oil_system.skip_mod = w['skip_mod']
             self._last_scale_apply = self._frame_index
-        self.sand_system.update(self._frame_index)
-        self.water_system.update(self._frame_index)
-        if hasattr(self, 'milk_system'):
+        self.sand_system.begin_update(self._frame_index)
+        self.water_system.begin_update(self._frame_index)
+        frame_index = self._frame_index
+        if self._update_pool is not None:
+            # each system only touches its own particles; the cross-material
+            # passes below still run single-threaded once all have finished
+            pool = self._update_pool
+            jobs = [pool.submit(self.milk_system.update)]
+            jobs.extend(pool.submit(system.update, frame_index) for system in self._frame_systems)
+            for job in jobs:
+                job.result()
+        else:
             self.milk_system.update()
-        if hasattr(self, 'oil_system'):
-            self.oil_system.update(self._frame_index)
-        self.lava_system.update(self._frame_index)
-        if hasattr(self, 'blue_lava_system'):
-            self.blue_lava_system.update(self._frame_index)
-        self.toxic_system.update(self._frame_index)
-        self.metal_system.update(self._frame_index)
-        if hasattr(self, 'ruby_system'):
-            self.ruby_system.update(self._frame_index)
-        if hasattr(self, 'diamond_system'):
-            self.diamond_system.update(self._frame_index)
-        if hasattr(self, 'gold_system'):
-            self.gold_system.update(self._frame_index)
-        if hasattr(self, 'blood_system'):
-            self.blood_system.update(self._frame_index)
-        if hasattr(self, 'dirt_system'):
-            self.dirt_system.update(self._frame_index)
+            for system in self._frame_systems:
+                system.update(frame_index)
         self.blocks_system.update(self._frame_index, npcs=self.npcs)
+        self.sand_system.finish_update()
+        self.water_system.finish_update()
                                                         
         if getattr(self, 'collision', None) is not None:
             try:
                 self.collision.apply(self._frame_index)
             except Exception:
                 pass
+        self._invalidate_neighbors()
         dt = 1.0 / max(self.target_fps, 1)
         if self.npcs:
             for npc in list(self.npcs):
@@ -1362,25 +1627,71 @@ class ParticleGame:
         self._handle_npc_hazards()
 
     def draw_sidebar(self):
+        if self.sidebar_width <= 0:
+            return
+        # the sidebar only changes with the tool, brush size or window size, so
+        # it is painted once into a cached surface/texture and copied after that
+        key = (self.current_tool, self.brush_size, self.sidebar_width, self.height, self.use_gpu)
         if not self.use_gpu:
-            pygame.draw.rect(self.screen, (40, 40, 40), (0, 0, self.sidebar_width, self.height))
-            for button_name, button_rect in self.buttons.items():
-                is_active = self.current_tool == button_name
-                color = (100, 150, 255) if is_active else (60, 60, 60)
-                pygame.draw.rect(self.screen, color, button_rect)
-                pygame.draw.rect(self.screen, (150, 150, 150), button_rect, 2)
-                text = self.button_font.render(button_name.upper(), True, (255, 255, 255))
-                text_rect = text.get_rect(center=button_rect.center)
-                self.screen.blit(text, text_rect)
-            size_y = 220
-            size_text = self.button_font.render(f'Size: {self.brush_size}', True, (200, 200, 200))
-            self.screen.blit(size_text, (10, size_y))
-            info_y = 250
-            info_lines = ['UP/DOWN: Size', 'ESC: Quit']
-            for i, line in enumerate(info_lines):
-                info_text = self.button_font.render(line, True, (150, 150, 150))
-                self.screen.blit(info_text, (10, info_y + i * 20))
+            surf = self._sidebar_surf
+            if surf is None or self._sidebar_key != key:
+                surf = self._sidebar_surf = pygame.Surface((self.sidebar_width, self.height)).convert()
+                self._paint_sidebar_cpu(surf)
+                self._sidebar_key = key
+            self.screen.blit(surf, (0, 0))
             return
+        tex = self._sidebar_tex
+        if tex is False:
+            # this renderer has no render targets; paint directly rather than
+            # retrying the allocation every frame
+            self._paint_sidebar_gpu()
+            return
+        if tex is None or self._sidebar_key != key or tex.renderer is not self.renderer:
+            try:
+                tex = Texture(self.renderer, (self.sidebar_width, self.height), target=True)
+                self.renderer.target = tex
+                try:
+                    self._paint_sidebar_gpu()
+                finally:
+                    self.renderer.target = None
+            except Exception:
+                self._sidebar_tex = False
+                self._paint_sidebar_gpu()
+                return
+            self._sidebar_tex = tex
+            self._sidebar_key = key
+        self.renderer.copy(tex, dstrect=self._frame_rects()[3])
+
+    def _frame_rects(self) -> tuple:
+        # (key, window, game area, sidebar): these only change on resize, so
+        # the rects handed to the renderer every frame are built once per size
+        key = (self.width, self.height, self.sidebar_width, self.game_width)
+        cached = self._frame_rect_cache
+        if cached is None or cached[0] != key:
+            R = sdl2rect.Rect
+            cached = self._frame_rect_cache = (key, R(0, 0, self.width, self.height), R(self.sidebar_width, 0, self.game_width, self.height), R(0, 0, self.sidebar_width, self.height))
+        return cached
+
+    def _paint_sidebar_cpu(self, surf: pygame.Surface):
+        pygame.draw.rect(surf, (40, 40, 40), (0, 0, self.sidebar_width, self.height))
+        for button_name, button_rect in self.buttons.items():
+            is_active = self.current_tool == button_name
+            color = (100, 150, 255) if is_active else (60, 60, 60)
+            pygame.draw.rect(surf, color, button_rect)
+            pygame.draw.rect(surf, (150, 150, 150), button_rect, 2)
+            text = self._get_text_surf(button_name.upper(), (255, 255, 255))
+            text_rect = text.get_rect(center=button_rect.center)
+            surf.blit(text, text_rect)
+        size_y = 220
+        size_text = self._get_text_surf(f'Size: {self.brush_size}', (200, 200, 200))
+        surf.blit(size_text, (10, size_y))
+        info_y = 250
+        info_lines = ['UP/DOWN: Size', 'ESC: Quit']
+        for i, line in enumerate(info_lines):
+            info_text = self._get_text_surf(line, (150, 150, 150))
+            surf.blit(info_text, (10, info_y + i * 20))
+
+    def _paint_sidebar_gpu(self):
         self.renderer.draw_color = (40, 40, 40, 255)
         self.renderer.fill_rect(sdl2rect.Rect(0, 0, self.sidebar_width, self.height))
         for button_name, button_rect in self.buttons.items():
@@ -1393,489 +1704,485 @@ class ParticleGame:
             self.renderer.draw_color = border
             self.renderer.draw_rect(rect)
             text = button_name.upper()
-            text_surf = self.button_font.render(text, True, (255, 255, 255))
-            text_tex = self._get_text_texture(text, (255, 255, 255))
+            text_tex, text_surf = self._get_text_entry(text, (255, 255, 255))
             tr = text_surf.get_rect(center=(button_rect.x + button_rect.w // 2, button_rect.y + button_rect.h // 2))
             self.renderer.copy(text_tex, dstrect=sdl2rect.Rect(tr.x, tr.y, tr.w, tr.h))
         size_label = f'Size: {self.brush_size}'
-        size_surf = self.button_font.render(size_label, True, (200, 200, 200))
-        size_tex = self._get_text_texture(size_label, (200, 200, 200))
+        size_tex, size_surf = self._get_text_entry(size_label, (200, 200, 200))
         self.renderer.copy(size_tex, dstrect=sdl2rect.Rect(10, 220, size_surf.get_width(), size_surf.get_height()))
         info_lines = ['UP/DOWN: Size', 'ESC: Pause']
         y = 250
         for line in info_lines:
-            info_surf = self.button_font.render(line, True, (150, 150, 150))
-            info_tex = self._get_text_texture(line, (150, 150, 150))
+            info_tex, info_surf = self._get_text_entry(line, (150, 150, 150))
             self.renderer.copy(info_tex, dstrect=sdl2rect.Rect(10, y, info_surf.get_width(), info_surf.get_height()))
             y += 20
 
     def draw(self):
-        if getattr(self, 'show_main_menu', False) or (not self.ready or not self.use_gpu):
+        if self.show_main_menu or (not self.ready or not self.use_gpu):
             self.screen.fill((20, 20, 20))
-            if getattr(self, 'show_main_menu', False):
+            if self.show_main_menu:
                 pygame.draw.rect(self.screen, (30, 30, 30), (self.sidebar_width, 0, self.game_width, self.height))
                 if self._game_surface is None or self._game_surface.get_size() != (self.game_width, self.height):
                     self._game_surface = pygame.Surface((self.game_width, self.height)).convert()
                 game_surface = self._game_surface
-                game_surface.fill((30, 30, 30))
                 if hasattr(self, 'grid_bg') and hasattr(self, 'menu'):
-                    self.grid_bg.draw_cpu(game_surface, self.menu.camera)
+                    self.grid_bg.draw_cpu(game_surface, self.menu.camera, fill=(30, 30, 30))
+                else:
+                    game_surface.fill((30, 30, 30))
                 self.screen.blit(game_surface, (self.sidebar_width, 0))
                 self.menu.draw_cpu(self.screen)
-                pygame.display.flip()
+                self._present(pygame.display.flip)
                 return
             if self.ready:
                 pygame.draw.rect(self.screen, (30, 30, 30), (self.sidebar_width, 0, self.game_width, self.height))
-                if self._game_surface is None or self._game_surface.get_size() != (self.game_width, self.height):
-                    self._game_surface = pygame.Surface((self.game_width, self.height)).convert()
-                game_surface = self._game_surface
-                game_surface.fill((20, 20, 20))
-                if getattr(self, 'show_grid', True) and hasattr(self, 'grid_bg') and hasattr(self, 'camera'):
-                    self.grid_bg.draw_cpu(game_surface, self.camera)
-                self.blocks_system.draw(game_surface)
-                self.metal_system.draw(game_surface)
-                if hasattr(self, 'gold_system'):
-                    self.gold_system.draw(game_surface)
-                if hasattr(self, 'ruby_system'):
-                    self.ruby_system.draw(game_surface)
-                if hasattr(self, 'diamond_system'):
-                    self.diamond_system.draw(game_surface)
-                if hasattr(self, 'dirt_system'):
-                    self.dirt_system.draw(game_surface)
-                self.sand_system.draw(game_surface)
-                self.water_system.draw(game_surface)
-                if hasattr(self, 'milk_system'):
-                    self.milk_system.draw(game_surface)
-                if hasattr(self, 'oil_system'):
-                    self.oil_system.draw(game_surface)
-                self.lava_system.draw(game_surface)
-                if hasattr(self, 'blue_lava_system'):
-                    self.blue_lava_system.draw(game_surface)
-                self.toxic_system.draw(game_surface)
-                self.blood_system.draw(game_surface)
-                                     
-                if getattr(self, 'npcs', None):
-                    for npc in self.npcs:
-                        try:
-                            npc.draw(game_surface)
-                        except Exception:
-                            pass
-                if getattr(self, 'camera', None) and (not self.camera.is_identity()):
+                # at scale 1 the visible window is the whole layer (the clamp
+                # pins the offsets to 0), so a pan alone needs no resample
+                zoomed = getattr(self, 'camera', None) and self.camera.is_scaled()
+                scaled = None
+                if zoomed:
                     vw = self.game_width
                     vh = self.height
                     src_w = max(1, int(vw / self.camera.scale))
                     src_h = max(1, int(vh / self.camera.scale))
                     src_x = max(0, min(int(self.camera.off_x), self.game_width - src_w))
                     src_y = max(0, min(int(self.camera.off_y), self.height - src_h))
-                    src_rect = pygame.Rect(src_x, src_y, src_w, src_h)
-                    sub = game_surface.subsurface(src_rect).copy()
-                    scaled = pygame.transform.smoothscale(sub, (vw, vh))
-                    self.screen.blit(scaled, (self.sidebar_width, 0))
-                else:
-                    self.screen.blit(game_surface, (self.sidebar_width, 0))
-                self._draw_overlays_cpu()
-                if getattr(self, 'show_pause_menu', False):
-                    dim = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                    dim.fill((0, 0, 0, 140))
-                    self.screen.blit(dim, (0, 0))
+                    zoom_key = ('cpu', self._scene_version, self.camera.scale, self.camera.off_x, self.camera.off_y, vw, vh, self.show_grid)
+                    if self._zoom_cache[0] == zoom_key:
+                        scaled = self._zoom_cache[1]
+                if scaled is None:
+                    if self._game_surface is None or self._game_surface.get_size() != (self.game_width, self.height):
+                        self._game_surface = pygame.Surface((self.game_width, self.height)).convert()
+                    game_surface = self._game_surface
+                    if self.show_grid:
+                        self.grid_bg.draw_cpu(game_surface, self.camera, fill=(20, 20, 20))
+                    else:
+                        game_surface.fill((20, 20, 20))
+                    self._draw_world(game_surface)
+
+                    if getattr(self, 'npcs', None):
+                        for npc in self.npcs:
+                            try:
+                                npc.draw(game_surface)
+                            except Exception:
+                                pass
+                    if zoomed:
+                        src_rect = pygame.Rect(src_x, src_y, src_w, src_h)
+                        sub = game_surface.subsurface(src_rect).copy()
+                        scaled = pygame.transform.smoothscale(sub, (vw, vh))
+                        self._zoom_cache = (zoom_key, scaled)
+                    else:
+                        scaled = game_surface
+                self.screen.blit(scaled, (self.sidebar_width, 0))
+                self._draw_overlays(False)
+                if self.show_pause_menu:
+                    self.screen.blit(_tinted((self.width, self.height), (0, 0, 0, 140)), (0, 0))
                     if hasattr(self, 'pause_menu'):
                         self.pause_menu.draw_cpu(self.screen)
                 # Draw compact status panels (FPS and Time speed) at bottom-left
                 self._draw_status_panels_cpu()
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = self._mouse_pos
                 if self.sidebar_width <= mouse_x < self.width:
                     color = (200, 100, 100) if self.current_tool == 'sand' else (100, 150, 255)
                     pygame.draw.circle(self.screen, color, (mouse_x, mouse_y), self.brush_size, 1)
-            pygame.display.flip()
+            self._present(pygame.display.flip)
             return
         self.renderer.draw_color = (20, 20, 20, 255)
         self.renderer.clear()
         self.renderer.draw_color = (30, 30, 30, 255)
-        self.renderer.fill_rect(sdl2rect.Rect(self.sidebar_width, 0, self.game_width, self.height))
-        if getattr(self, 'show_main_menu', False):
+        self.renderer.fill_rect(self._frame_rects()[2])
+        if self.show_main_menu:
             if hasattr(self, 'grid_bg') and hasattr(self, 'menu'):
                 self.grid_bg.draw_gpu(self.renderer, (self.sidebar_width, 0, self.game_width, self.height), self.menu.camera)
                 self.menu.draw_gpu(self.renderer)
-            self.renderer.present()
+            self._present(self.renderer.present)
             return
-            if getattr(self, 'show_grid', True) and hasattr(self, 'grid_bg') and hasattr(self, 'camera'):
+            if self.show_grid:
                 self.grid_bg.draw_gpu(self.renderer, (self.sidebar_width, 0, self.game_width, self.height), self.camera)
-        use_cpu_composite = getattr(self, 'camera', None) and (not self.camera.is_identity())
+        use_cpu_composite = getattr(self, 'camera', None) and self.camera.is_scaled()
         if use_cpu_composite:
-            cpu_layer = pygame.Surface((self.game_width, self.height), pygame.SRCALPHA)
-            cpu_layer.fill((20, 20, 20, 255))
-            if hasattr(self, 'grid_bg') and hasattr(self, 'camera'):
-                self.grid_bg.draw_cpu(cpu_layer, self.camera)
-            self.blocks_system.draw(cpu_layer)
-            self.metal_system.draw(cpu_layer)
-            if hasattr(self, 'gold_system'):
-                self.gold_system.draw(cpu_layer)
-            if hasattr(self, 'ruby_system'):
-                self.ruby_system.draw(cpu_layer)
-            if hasattr(self, 'diamond_system'):
-                self.diamond_system.draw(cpu_layer)
-            if hasattr(self, 'dirt_system'):
-                self.dirt_system.draw(cpu_layer)
-            self.sand_system.draw(cpu_layer)
-            self.water_system.draw(cpu_layer)
-            if hasattr(self, 'oil_system'):
-                self.oil_system.draw(cpu_layer)
-            self.lava_system.draw(cpu_layer)
-            if hasattr(self, 'blue_lava_system'):
-                self.blue_lava_system.draw(cpu_layer)
-            self.toxic_system.draw(cpu_layer)
-            self.blood_system.draw(cpu_layer)
-            if self.npc is not None:
-                self.npc.draw(cpu_layer)
             vw = self.game_width
             vh = self.height
             src_w = max(1, int(vw / self.camera.scale))
             src_h = max(1, int(vh / self.camera.scale))
             src_x = max(0, min(int(self.camera.off_x), self.game_width - src_w))
             src_y = max(0, min(int(self.camera.off_y), self.height - src_h))
-            src_rect = pygame.Rect(src_x, src_y, src_w, src_h)
-            sub = cpu_layer.subsurface(src_rect).copy()
-            scaled = pygame.transform.smoothscale(sub, (vw, vh))
-            tex = Texture.from_surface(self.renderer, scaled)
-            self.renderer.copy(tex, dstrect=sdl2rect.Rect(self.sidebar_width, 0, self.game_width, self.height))
-        else:
-            if hasattr(self, 'dirt_system'):
-                try:
-                    dirt_groups = self.dirt_system.get_point_groups()
-                    if hasattr(dirt_groups, 'items'):
-                        for color, pts in dirt_groups.items():
-                            if not pts:
-                                continue
-                            pts_offset = [(x + self.sidebar_width, y) for x, y in pts]
-                            self.renderer.draw_color = (color[0], color[1], color[2], 255)
-                            self.renderer.draw_points(pts_offset)
-                except Exception:
-                    pass
-            sand_groups = self.sand_system.get_point_groups()
-            for color, pts in sand_groups.items():
-                if not pts:
-                    continue
-                pts_offset = [(x + self.sidebar_width, y) for x, y in pts]
-                self.renderer.draw_color = (color[0], color[1], color[2], 255)
-                self.renderer.draw_points(pts_offset)
-            m_color, m_points = self.metal_system.get_point_groups()
-            if m_points:
-                m_pts_offset = [(x + self.sidebar_width, y) for x, y in m_points]
-                self.renderer.draw_color = (m_color[0], m_color[1], m_color[2], 255)
-                self.renderer.draw_points(m_pts_offset)
-            if hasattr(self, 'gold_system'):
-                try:
-                    g_color, g_points = self.gold_system.get_point_groups()
-                    if g_points:
-                        g_pts_offset = [(x + self.sidebar_width, y) for x, y in g_points]
-                        self.renderer.draw_color = (g_color[0], g_color[1], g_color[2], 255)
-                        self.renderer.draw_points(g_pts_offset)
-                except Exception:
-                    pass
-            if hasattr(self, 'ruby_system'):
-                try:
-                    r_color, r_points = self.ruby_system.get_point_groups()
-                    if r_points:
-                        r_pts_offset = [(x + self.sidebar_width, y) for x, y in r_points]
-                        self.renderer.draw_color = (r_color[0], r_color[1], r_color[2], 255)
-                        self.renderer.draw_points(r_pts_offset)
-                except Exception:
-                    pass
-            if hasattr(self, 'diamond_system'):
-                try:
-                    d_color, d_points = self.diamond_system.get_point_groups()
-                    if d_points:
-                        d_pts_offset = [(x + self.sidebar_width, y) for x, y in d_points]
-                        self.renderer.draw_color = (d_color[0], d_color[1], d_color[2], 255)
-                        self.renderer.draw_points(d_pts_offset)
-                except Exception:
-                    pass
-            if hasattr(self, 'ruby_system'):
-                try:
-                    r_color, r_points = self.ruby_system.get_point_groups()
-                    if r_points:
-                        r_pts_offset = [(x + self.sidebar_width, y) for x, y in r_points]
-                        self.renderer.draw_color = (r_color[0], r_color[1], r_color[2], 255)
-                        self.renderer.draw_points(r_pts_offset)
-                except Exception:
-                    pass
-            bl_color, bl_points = self.blocks_system.get_point_groups()
-            if bl_points:
-                bl_pts_offset = [(x + self.sidebar_width, y) for x, y in bl_points]
-                self.renderer.draw_color = (bl_color[0], bl_color[1], bl_color[2], 255)
-                self.renderer.draw_points(bl_pts_offset)
-            oil_groups = self.oil_system.get_point_groups() if hasattr(self, 'oil_system') else None
-            if oil_groups:
-                if hasattr(oil_groups, 'items'):
-                    for color, pts in oil_groups.items():
-                        if not pts:
-                            continue
-                        pts_offset = [(x + self.sidebar_width, y) for x, y in pts]
-                        self.renderer.draw_color = (color[0], color[1], color[2], 255)
-                        self.renderer.draw_points(pts_offset)
-                else:
-                    o_color, o_points = oil_groups
-                    if o_points:
-                        o_pts_offset = [(x + self.sidebar_width, y) for x, y in o_points]
-                        self.renderer.draw_color = (o_color[0], o_color[1], o_color[2], 255)
-                        self.renderer.draw_points(o_pts_offset)
-            w_color, w_points = self.water_system.get_point_groups()
-            if w_points:
-                w_pts_offset = [(x + self.sidebar_width, y) for x, y in w_points]
-                self.renderer.draw_color = (w_color[0], w_color[1], w_color[2], 255)
-                self.renderer.draw_points(w_pts_offset)
-            l_color, l_points = self.lava_system.get_point_groups()
-            if hasattr(self, 'blue_lava_system'):
-                bl_col, bl_pts = self.blue_lava_system.get_point_groups()
-                if bl_pts:
-                    bl_pts_offset = [(x + self.sidebar_width, y) for x, y in bl_pts]
-                    self.renderer.draw_color = (bl_col[0], bl_col[1], bl_col[2], 255)
-                    self.renderer.draw_points(bl_pts_offset)
-            if l_points:
-                l_pts_offset = [(x + self.sidebar_width, y) for x, y in l_points]
-                self.renderer.draw_color = (l_color[0], l_color[1], l_color[2], 255)
-                self.renderer.draw_points(l_pts_offset)
-            t_color, t_points = self.toxic_system.get_point_groups()
-            if t_points:
-                t_pts_offset = [(x + self.sidebar_width, y) for x, y in t_points]
-                self.renderer.draw_color = (t_color[0], t_color[1], t_color[2], 255)
-                self.renderer.draw_points(t_pts_offset)
-            b_color, b_points = self.blood_system.get_point_groups()
-            if b_points:
-                b_pts_offset = [(x + self.sidebar_width, y) for x, y in b_points]
-                self.renderer.draw_color = (b_color[0], b_color[1], b_color[2], 255)
-                self.renderer.draw_points(b_pts_offset)
-            if getattr(self, 'npcs', None):
-                cpu_layer = pygame.Surface((self.game_width, self.height), pygame.SRCALPHA)
+            # the grid under the particles follows the camera, so the key
+            # carries it alongside the scene version
+            zoom_key = ('gpu', self._scene_version, self.camera.scale, self.camera.off_x, self.camera.off_y, vw, vh, self.renderer)
+            tex = self._zoom_cache[1] if self._zoom_cache[0] == zoom_key else None
+            if tex is None:
+                cpu_layer = self._gpu_layer
+                if cpu_layer is None or cpu_layer.get_size() != (self.game_width, self.height):
+                    cpu_layer = pygame.Surface((self.game_width, self.height))
+                    self._gpu_layer = cpu_layer
+                self.grid_bg.draw_cpu(cpu_layer, self.camera, fill=(20, 20, 20))
+                self._draw_world(cpu_layer)
                 for npc in self.npcs:
                     try:
                         npc.draw(cpu_layer)
                     except Exception:
                         pass
-                npc_tex = Texture.from_surface(self.renderer, cpu_layer)
-                self.renderer.copy(npc_tex, dstrect=sdl2rect.Rect(self.sidebar_width, 0, self.game_width, self.height))
-        self._draw_overlays_gpu()
-        if getattr(self, 'show_pause_menu', False):
+                # upload the unscaled layer and let the renderer scale the
+                # visible window, instead of cropping and smoothscaling it
+                tex = self._upload_frame_texture(cpu_layer)
+                self._zoom_cache = (zoom_key, tex)
+            self.renderer.copy(tex, srcrect=sdl2rect.Rect(src_x, src_y, src_w, src_h), dstrect=self._frame_rects()[2])
+        else:
+            self._draw_particles_gpu()
+            if getattr(self, 'npcs', None):
+                self._draw_npcs_gpu()
+        self._draw_overlays(True)
+        if self.show_pause_menu:
             self.renderer.draw_color = (0, 0, 0, 140)
-            self.renderer.fill_rect(sdl2rect.Rect(0, 0, self.width, self.height))
+            self.renderer.fill_rect(self._frame_rects()[1])
             if hasattr(self, 'pause_menu'):
                 self.pause_menu.draw_gpu(self.renderer)
         # Draw compact status panels (FPS and Time speed) at bottom-left (GPU)
         self._draw_status_panels_gpu()
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self._mouse_pos
         if self.sidebar_width <= mouse_x < self.width:
             r = self.brush_size
             self.renderer.draw_color = (200, 100, 100, 255) if self.current_tool == 'sand' else (100, 150, 255, 255)
             outline = sdl2rect.Rect(mouse_x - r, mouse_y - r, r * 2, r * 2)
             self.renderer.draw_rect(outline)
-        self.renderer.present()
+        self._present(self.renderer.present)
 
-    def _ensure_ui_textures(self):
-        if not getattr(self, 'use_gpu', False):
-            return
-        if not hasattr(self, 'renderer'):
-            return
-        if self._ui_flask_tex is None and hasattr(self, 'ui_flask_surf'):
+    def _draw_world(self, surf: pygame.Surface):
+        # runs of systems that only plot point groups share one surface lock
+        pending = []
+        for system in self._draw_systems:
+            if getattr(system, 'plots_point_groups', False):
+                pending.append((self._point_layer(system), getattr(system, 'point_size', 1)))
+                continue
+            if pending:
+                raster.plot_layers(surf, pending)
+                pending = []
+            system.draw(surf)
+        if pending:
+            raster.plot_layers(surf, pending)
+
+    @staticmethod
+    def _point_layer(system):
+        # bulk systems hand raster index arrays gathered straight from their
+        # particles; small or numpy-less ones fall back to the tuple lists
+        arrays = getattr(system, 'get_point_arrays', None)
+        groups = arrays() if arrays is not None else None
+        return groups if groups is not None else system.get_point_groups()
+
+    def _step(self, steps: int):
+        for _ in range(steps):
+            self.update()
+            self._frame_index += 1
+        self._scene_version += 1
+
+    def _present(self, present):
+        steps = self._pending_steps
+        self._pending_steps = 0
+        job = self._sim_pool.submit(self._step, steps) if steps else None
+        present()
+        if job is not None:
+            job.result()
+
+    def _upload_frame_texture(self, surface: pygame.Surface):
+        size = surface.get_size()
+        tex = self._gpu_frame_tex
+        if tex is None or self._gpu_frame_tex_size != size:
             try:
-                self._ui_flask_tex = Texture.from_surface(self.renderer, self.ui_flask_surf)
+                tex = Texture(self.renderer, size, streaming=True)
             except Exception:
-                self._ui_flask_tex = None
-        if self._ui_water_tex is None and hasattr(self, 'ui_water_surf'):
+                # a static texture still takes update(), so it is kept too
+                tex = Texture.from_surface(self.renderer, surface)
+            self._gpu_frame_tex = tex
+            self._gpu_frame_tex_size = size
+        tex.update(surface)
+        return tex
+
+    def _draw_npcs_gpu(self):
+        # NPCs are drawn into a persistent layer and only the box around them
+        # is cleared, uploaded to the streaming texture and copied
+        size = (self.game_width, self.height)
+        dirty = None
+        for npc in self.npcs:
             try:
-                self._ui_water_tex = Texture.from_surface(self.renderer, self.ui_water_surf)
+                r = npc.bounds()
             except Exception:
-                self._ui_water_tex = None
-        if self._ui_sand_tex is None and hasattr(self, 'ui_sand_surf'):
+                continue
+            dirty = r if dirty is None else dirty.union(r)
+        if dirty is None:
+            return
+        dirty = dirty.clip(pygame.Rect((0, 0), size))
+        if not dirty.w or not dirty.h:
+            return
+        layer = self._npc_layer
+        if layer is None or layer.get_size() != size:
+            layer = self._npc_layer = pygame.Surface(size, pygame.SRCALPHA)
+            self._npc_tex = None
+        tex = self._npc_tex
+        if tex is None or tex.renderer is not self.renderer:
             try:
-                self._ui_sand_tex = Texture.from_surface(self.renderer, self.ui_sand_surf)
+                tex = Texture(self.renderer, size, streaming=True)
             except Exception:
-                self._ui_sand_tex = None
-        if self._ui_lava_tex is None and hasattr(self, 'ui_lava_surf'):
+                tex = Texture.from_surface(self.renderer, layer)
+            tex.blend_mode = 1
+            self._npc_tex = tex
+        layer.fill((0, 0, 0, 0), dirty)
+        layer.set_clip(dirty)
+        for npc in self.npcs:
             try:
-                self._ui_lava_tex = Texture.from_surface(self.renderer, self.ui_lava_surf)
+                npc.draw(layer)
             except Exception:
-                self._ui_lava_tex = None
-        if self._ui_npc_tex is None and hasattr(self, 'ui_npc_surf'):
+                pass
+        layer.set_clip(None)
+        tex.update(layer.subsurface(dirty), dirty)
+        self.renderer.copy(tex, srcrect=sdl2rect.Rect(dirty.x, dirty.y, dirty.w, dirty.h), dstrect=sdl2rect.Rect(dirty.x + self.sidebar_width, dirty.y, dirty.w, dirty.h))
+
+    def _draw_particles_framebuffer(self) -> bool:
+        size = (self.game_width, self.height)
+        layer = self._fb_layer
+        if layer is None or layer.get_size() != size:
+            layer = self._fb_layer = pygame.Surface(size)
+            self._fb_tex = None
+        tex = self._fb_tex
+        if tex is None or tex.renderer is not self.renderer:
             try:
-                self._ui_npc_tex = Texture.from_surface(self.renderer, self.ui_npc_surf)
+                tex = self._fb_tex = Texture(self.renderer, size, streaming=True)
             except Exception:
-                self._ui_npc_tex = None
-        if self._ui_toxic_tex is None and hasattr(self, 'ui_toxic_surf'):
+                return False
+        # opaque, so the game-area fill underneath is baked in; points stay
+        # one pixel like draw_points, whatever the CPU point size
+        layer.fill((30, 30, 30))
+        layers = []
+        for system in self._render_systems:
             try:
-                self._ui_toxic_tex = Texture.from_surface(self.renderer, self.ui_toxic_surf)
+                layers.append((self._point_layer(system), 1))
             except Exception:
-                self._ui_toxic_tex = None
-        if self._ui_oil_tex is None and hasattr(self, 'ui_oil_surf'):
+                continue
+        raster.plot_layers(layer, layers)
+        tex.update(layer)
+        self.renderer.copy(tex, dstrect=self._frame_rects()[2])
+        return True
+
+    def _draw_particles_gpu(self):
+        if raster.NUMPY_AVAILABLE and self._total_particles >= _FRAMEBUFFER_MIN and self._draw_particles_framebuffer():
+            return
+        # the sidebar offset goes into the viewport origin, so SDL shifts the
+        # points and the lists never need rebuilding; with no sidebar the game
+        # area is the whole target and the viewport is left alone, since each
+        # viewport change splits SDL's render batch
+        renderer = self.renderer
+        offset = self.sidebar_width > 0
+        if offset:
+            renderer.set_viewport(self._frame_rects()[2])
+        # renderer.draw_points hands each list to SDL as one point array, so
+        # no point list is allocated or copied per frame; systems are drawn in
+        # order, like the CPU path, so overlapping materials keep their z-order
+        for system in self._render_systems:
             try:
-                self._ui_oil_tex = Texture.from_surface(self.renderer, self.ui_oil_surf)
+                groups = system.get_point_groups()
             except Exception:
-                self._ui_oil_tex = None
-        if self._ui_blocks_tex is None and hasattr(self, 'ui_blocks_surf'):
+                continue
+            if not groups:
+                continue
+            for color, pts in (groups.items() if hasattr(groups, 'items') else (groups,)):
+                if pts:
+                    renderer.draw_color = (color[0], color[1], color[2], 255)
+                    renderer.draw_points(pts)
+        if offset:
+            renderer.set_viewport(None)
+
+    def _build_ui_textures(self):
+        if not self.use_gpu or not hasattr(self, 'renderer'):
+            return
+        self._ui_atlas = None
+        self._overlay_geom = None
+        self._sidebar_tex = None
+        self._ui_target = None
+        self._ui_icon(self._overlay_geometry()['buttons'][0][1])
+        # the blocks drag preview's translucent fill, stretched from one texel
+        tint = pygame.Surface((1, 1), pygame.SRCALPHA)
+        tint.fill((100, 150, 255, 50))
+        try:
+            self._drag_preview_tex = Texture.from_surface(self.renderer, tint)
+            self._drag_preview_tex.blend_mode = 1
+        except Exception:
+            self._drag_preview_tex = None
+
+    def _ui_icon(self, surf):
+        # the flask/admin buttons and every spawn tile sample one atlas
+        # texture, so the icon copies never switch textures; it is packed
+        # from the current layout's fitted icons and repacked after a relayout
+        if surf is None:
+            return None
+        atlas = self._ui_atlas
+        entry = atlas[2].get(id(surf)) if atlas is not None and atlas[0] is self.renderer else None
+        if entry is None or entry[0] is not surf:
+            surfs = []
+            seen = set()
+            geom = self._overlay_geometry()
+            for icon in [b[1] for b in geom['buttons']] + [t[3] for t in geom['tiles']]:
+                if icon is not None and id(icon) not in seen:
+                    seen.add(id(icon))
+                    surfs.append(icon)
+            if id(surf) not in seen:
+                surfs.append(surf)
+            sheet, rects = _pack_atlas(surfs)
             try:
-                self._ui_blocks_tex = Texture.from_surface(self.renderer, self.ui_blocks_surf)
+                tex = Texture.from_surface(self.renderer, sheet)
             except Exception:
-                self._ui_blocks_tex = None
+                tex = None
+            atlas = self._ui_atlas = (self.renderer, tex, {k: (icon, sdl2rect.Rect(*r)) for k, (icon, r) in rects.items()})
+            entry = atlas[2][id(surf)]
+        if atlas[1] is None:
+            return None
+        return (atlas[1], entry[1])
+
+    def _fit_icon(self, surf: pygame.Surface, box_w: int, box_h: int) -> pygame.Surface:
+        # smoothscale is the priciest call in the overlay; icons and their
+        # rects only change on relayout, so each fit is scaled once
+        key = (id(surf), box_w, box_h)
+        hit = self._icon_fit_cache.get(key)
+        if hit is not None and hit[0] is surf:
+            return hit[1]
+        iw, ih = surf.get_size()
+        scale = min(box_w / iw, box_h / ih)
+        img = pygame.transform.smoothscale(surf, (int(iw * scale), int(ih * scale)))
+        if len(self._icon_fit_cache) >= 256:
+            self._icon_fit_cache.clear()
+        self._icon_fit_cache[key] = (surf, img)
+        return img
+
+    def _overlay_state(self, mx: int, my: int) -> tuple:
+        probe = pygame.Rect(mx, my, 1, 1)
+        admin_btns = [r for r in (self.ui_admin_clear_rect, self.ui_admin_clear_npcs_rect, self.ui_admin_clear_blocks_rect) if r is not None]
+        return (self.width, self.height, tuple(self.ui_flask_rect), tuple(self.ui_admin_rect), self.ui_show_spawn, self.ui_show_admin, tuple(self.ui_menu_rect), tuple(self.ui_admin_menu_rect), self.ui_header_h, self.ui_spawn_search_text, self.current_tool, id(self.ui_tiles), len(self.ui_tiles), id(self.ui_flask_surf), self._hovered_tile(mx, my), probe.collidelist(admin_btns))
+
+    def _draw_overlays(self, gpu: bool):
+        # both backends share the state key, the repaint-on-change flow and
+        # the drag preview geometry; only the painting and compositing differ
+        refresh, show, preview, caret = self._overlay_ops[gpu]
+        mx, my = self._mouse_pos
+        refresh(self._overlay_state(mx, my), mx, my)
+        show()
+        # the caret sits outside the cached layer: its position is recorded
+        # when the query repaints, and blinking never invalidates the cache
+        if self.ui_show_spawn and self.ui_search_active and (time.time() * 2) % 2 < 1:
+            caret(*self._search_caret)
+        if self.current_tool == 'blocks' and self.blocks_drag_active and self.blocks_drag_start and self.blocks_drag_current:
+            x, y, w, h = self.camera.world_rect_to_view(*self.blocks_drag_start, *self.blocks_drag_current)
+            preview(x + self.sidebar_width, y, w, h)
+
+    def _refresh_overlays_cpu(self, key: tuple, mx: int, my: int):
+        # while the state holds still the recorded blit list is replayed as is
+        if key != self._overlay_key:
+            self._overlay_blits = self._paint_overlays_cpu(mx, my)
+            self._overlay_key = key
+
+    def _show_overlays_cpu(self):
+        self.screen.blits(self._overlay_blits, doreturn=False)
+
+    def _drag_preview_cpu(self, x: int, y: int, w: int, h: int):
+        # one screen-sized tint is kept and only the dragged area of it blitted
+        preview = self._drag_preview_surf
+        if preview is None or preview.get_size() != self.screen.get_size():
+            preview = self._drag_preview_surf = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            preview.fill((100, 150, 255, 50))
+        self.screen.blit(preview, (x, y), (0, 0, max(1, w), max(1, h)))
+        pygame.draw.rect(self.screen, (100, 160, 255), pygame.Rect(x, y, w, h), 1)
+
+    def _search_caret_cpu(self, x: int, y0: int, y1: int):
+        self.screen.blit(_tinted((1, y1 - y0 + 1), (200, 200, 200, 255)), (x, y0))
 
-    def _draw_overlays_cpu(self):
-        overlay = pygame.Surface(self.ui_flask_rect.size, pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        self.screen.blit(overlay, self.ui_flask_rect.topleft)
-        pygame.draw.rect(self.screen, (90, 90, 90), self.ui_flask_rect, 1)
+    def _paint_overlays_cpu(self, mx: int, my: int) -> list:
+        out = []
+        add = out.append
+        add((_tinted(self.ui_flask_rect.size, (0, 0, 0, 128)), self.ui_flask_rect.topleft))
+        add((_outline(self.ui_flask_rect.size, (90, 90, 90)), self.ui_flask_rect.topleft))
         pad = 6
         dest_w = max(1, self.ui_flask_rect.w - 2 * pad)
         dest_h = max(1, self.ui_flask_rect.h - 2 * pad)
         if self.ui_flask_surf:
-            iw, ih = self.ui_flask_surf.get_size()
-            scale = min(dest_w / iw, dest_h / ih)
-            scaled = pygame.transform.smoothscale(self.ui_flask_surf, (int(iw * scale), int(ih * scale)))
+            scaled = self._fit_icon(self.ui_flask_surf, dest_w, dest_h)
             dx = self.ui_flask_rect.x + (self.ui_flask_rect.w - scaled.get_width()) // 2
             dy = self.ui_flask_rect.y + (self.ui_flask_rect.h - scaled.get_height()) // 2
-            self.screen.blit(scaled, (dx, dy))
-        if hasattr(self, 'ui_admin_rect'):
-            overlay2 = pygame.Surface(self.ui_admin_rect.size, pygame.SRCALPHA)
-            overlay2.fill((0, 0, 0, 128))
-            self.screen.blit(overlay2, self.ui_admin_rect.topleft)
-            pygame.draw.rect(self.screen, (90, 90, 90), self.ui_admin_rect, 1)
-            if not hasattr(self, 'ui_admin_surf'):
-                self.ui_admin_surf = self._load_image('src/assets/admin.png')
-                if not self.ui_admin_surf:
-                    self.ui_admin_surf = pygame.Surface((32, 32), pygame.SRCALPHA)
-                    self.ui_admin_surf.fill((220, 220, 220, 255))
+            add((scaled, (dx, dy)))
+        if self.ui_admin_rect is not None:
+            add((_tinted(self.ui_admin_rect.size, (0, 0, 0, 128)), self.ui_admin_rect.topleft))
+            add((_outline(self.ui_admin_rect.size, (90, 90, 90)), self.ui_admin_rect.topleft))
             pad2 = 6
             dest_w2 = max(1, self.ui_admin_rect.w - 2 * pad2)
             dest_h2 = max(1, self.ui_admin_rect.h - 2 * pad2)
-            iw2, ih2 = self.ui_admin_surf.get_size()
-            scale2 = min(dest_w2 / iw2, dest_h2 / ih2)
-            scaled2 = pygame.transform.smoothscale(self.ui_admin_surf, (int(iw2 * scale2), int(ih2 * scale2)))
+            scaled2 = self._fit_icon(self.ui_admin_surf, dest_w2, dest_h2)
             dx2 = self.ui_admin_rect.x + (self.ui_admin_rect.w - scaled2.get_width()) // 2
             dy2 = self.ui_admin_rect.y + (self.ui_admin_rect.h - scaled2.get_height()) // 2
-            self.screen.blit(scaled2, (dx2, dy2))
+            add((scaled2, (dx2, dy2)))
         if self.ui_show_spawn:
             mw, mh = self.ui_menu_rect.size
-            header_h = getattr(self, 'ui_header_h', 36)
-            shadow = pygame.Surface((mw, mh), pygame.SRCALPHA)
-            pygame.draw.rect(shadow, (0, 0, 0, 100), pygame.Rect(0, 0, mw, mh), border_radius=10)
-            self.screen.blit(shadow, (self.ui_menu_rect.x + 3, self.ui_menu_rect.y + 4))
-            panel = pygame.Surface((mw, mh), pygame.SRCALPHA)
-            pygame.draw.rect(panel, (0, 0, 0, 180), pygame.Rect(0, 0, mw, mh), border_radius=10)
-            pygame.draw.rect(panel, (12, 12, 12, 210), pygame.Rect(0, 0, mw, header_h), border_radius=10)
-            pygame.draw.rect(panel, (100, 100, 100, 220), pygame.Rect(0, 0, mw, mh), width=1, border_radius=10)
-            pygame.draw.rect(panel, (255, 255, 255, 25), pygame.Rect(1, 1, mw - 2, mh - 2), width=1, border_radius=9)
-            self.screen.blit(panel, self.ui_menu_rect.topleft)
-            title_text = self.button_font.render('SPAWN', True, (220, 220, 220))
+            header_h = self.ui_header_h
+            add((_tinted((mw, mh), (0, 0, 0, 100), 10), (self.ui_menu_rect.x + 3, self.ui_menu_rect.y + 4)))
+            add((_menu_panel((mw, mh), header_h), self.ui_menu_rect.topleft))
+            title_text = self._get_text_surf('SPAWN', (220, 220, 220))
             ty = self.ui_menu_rect.y + (header_h - title_text.get_height()) // 2
-            self.screen.blit(title_text, (self.ui_menu_rect.x + 12, ty))
-            if hasattr(self, 'ui_search_rect'):
+            add((title_text, (self.ui_menu_rect.x + 12, ty)))
+            if self.ui_search_rect is not None:
                 sr = self.ui_search_rect
-                pygame.draw.rect(self.screen, (30, 30, 30), sr, border_radius=6)
-                pygame.draw.rect(self.screen, (70, 70, 70), sr, width=1, border_radius=6)
+                add((_tinted(sr.size, (30, 30, 30, 255), 6), sr.topleft))
+                add((_outline(sr.size, (70, 70, 70), 6), sr.topleft))
                 q = self.ui_spawn_search_text or ''
                 placeholder = 'Search'
                 show_text = q if q else placeholder
                 color = (220, 220, 220) if q else (150, 150, 150)
-                ts = self.button_font.render(show_text, True, color)
-                self.screen.blit(ts, (sr.x + 8, sr.y + (sr.h - ts.get_height()) // 2))
-                if self.ui_search_active:
-                    cx = sr.x + 8 + ts.get_width()
-                    cy0 = sr.y + 5
-                    cy1 = sr.y + sr.h - 5
-                    pygame.draw.line(self.screen, (200, 200, 200), (cx, cy0), (cx, cy1), 1)
-            mx, my = pygame.mouse.get_pos()
-            for tile in getattr(self, 'ui_tiles', []):
-                rect = self.ui_tile_rects.get(tile['key']) if hasattr(self, 'ui_tile_rects') else None
+                ts = self._get_text_surf(show_text, color)
+                add((ts, (sr.x + 8, sr.y + (sr.h - ts.get_height()) // 2)))
+                self._search_caret = (sr.x + 8 + ts.get_width(), sr.y + 5, sr.y + sr.h - 5)
+            hovered_key = self._hovered_tile(mx, my)
+            for tile in self.ui_tiles:
+                rect = self.ui_tile_rects.get(tile['key'])
                 if not rect:
                     continue
-                hovered = rect.collidepoint(mx, my)
-                tile_bg = pygame.Surface(rect.size, pygame.SRCALPHA)
+                hovered = tile['key'] == hovered_key
                 base_alpha = 215 if hovered else 190
                 if self.current_tool == tile['key']:
                     base_alpha = 230 if hovered else 210
-                pygame.draw.rect(tile_bg, (25, 25, 25, base_alpha), pygame.Rect(0, 0, rect.w, rect.h), border_radius=8)
-                self.screen.blit(tile_bg, rect.topleft)
+                add((_tinted(rect.size, (25, 25, 25, base_alpha), 8), rect.topleft))
                 surf = tile.get('surf')
                 if surf:
-                    iw, ih = surf.get_size()
                     pad = 8
-                    dw = max(1, rect.w - 2 * pad)
-                    dh = max(1, rect.h - 2 * pad)
-                    scale = min(dw / iw, dh / ih)
-                    img = pygame.transform.smoothscale(surf, (int(iw * scale), int(ih * scale)))
+                    img = self._fit_icon(surf, max(1, rect.w - 2 * pad), max(1, rect.h - 2 * pad))
                     dx = rect.x + (rect.w - img.get_width()) // 2
                     dy = rect.y + (rect.h - img.get_height()) // 2 - 6
-                    self.screen.blit(img, (dx, dy))
+                    add((img, (dx, dy)))
                 else:
-                    ph = pygame.Surface((rect.w - 16, rect.h - 24), pygame.SRCALPHA)
-                    ph.fill((*tile.get('color', (120, 120, 120)), 220))
+                    ph = _tinted((rect.w - 16, rect.h - 24), (*tile.get('color', (120, 120, 120)), 220))
                     px = rect.x + (rect.w - ph.get_width()) // 2
                     py = rect.y + (rect.h - ph.get_height()) // 2
-                    self.screen.blit(ph, (px, py))
-                label_surf = self.button_font.render(tile['label'], True, (210, 210, 210))
+                    add((ph, (px, py)))
+                label_surf = self._get_text_surf(tile['label'], (210, 210, 210))
                 lx = rect.x + (rect.w - label_surf.get_width()) // 2
                 ly = rect.bottom - label_surf.get_height() - 6
-                label_bg = pygame.Surface((label_surf.get_width() + 8, label_surf.get_height() + 4), pygame.SRCALPHA)
-                label_bg.fill((0, 0, 0, 90))
-                self.screen.blit(label_bg, (lx - 4, ly - 2))
-                self.screen.blit(label_surf, (lx, ly))
-        if getattr(self, 'ui_show_admin', False):
+                add((_tinted((label_surf.get_width() + 8, label_surf.get_height() + 4), (0, 0, 0, 90)), (lx - 4, ly - 2)))
+                add((label_surf, (lx, ly)))
+        if self.ui_show_admin:
             amw, amh = self.ui_admin_menu_rect.size
-            header_h = getattr(self, 'ui_header_h', 36)
-            shadow = pygame.Surface((amw, amh), pygame.SRCALPHA)
-            pygame.draw.rect(shadow, (0, 0, 0, 100), pygame.Rect(0, 0, amw, amh), border_radius=10)
-            self.screen.blit(shadow, (self.ui_admin_menu_rect.x + 3, self.ui_admin_menu_rect.y + 4))
-            panel = pygame.Surface((amw, amh), pygame.SRCALPHA)
-            pygame.draw.rect(panel, (0, 0, 0, 180), pygame.Rect(0, 0, amw, amh), border_radius=10)
-            pygame.draw.rect(panel, (12, 12, 12, 210), pygame.Rect(0, 0, amw, header_h), border_radius=10)
-            pygame.draw.rect(panel, (100, 100, 100, 220), pygame.Rect(0, 0, amw, amh), width=1, border_radius=10)
-            pygame.draw.rect(panel, (255, 255, 255, 25), pygame.Rect(1, 1, amw - 2, amh - 2), width=1, border_radius=9)
-            self.screen.blit(panel, self.ui_admin_menu_rect.topleft)
-            title_text = self.button_font.render('ADMIN', True, (220, 220, 220))
+            header_h = self.ui_header_h
+            add((_tinted((amw, amh), (0, 0, 0, 100), 10), (self.ui_admin_menu_rect.x + 3, self.ui_admin_menu_rect.y + 4)))
+            add((_menu_panel((amw, amh), header_h), self.ui_admin_menu_rect.topleft))
+            title_text = self._get_text_surf('ADMIN', (220, 220, 220))
             ty = self.ui_admin_menu_rect.y + (header_h - title_text.get_height()) // 2
-            self.screen.blit(title_text, (self.ui_admin_menu_rect.x + 12, ty))
+            add((title_text, (self.ui_admin_menu_rect.x + 12, ty)))
             btn_w, btn_h = (amw - 32, 40)
             btn_x = self.ui_admin_menu_rect.x + 16
-            btn_y1 = self.ui_admin_menu_rect.y + header_h + 20
-            self.ui_admin_clear_rect = pygame.Rect(btn_x, btn_y1, btn_w, btn_h)
-            hovered1 = self.ui_admin_clear_rect.collidepoint(pygame.mouse.get_pos())
-            pygame.draw.rect(self.screen, (30, 30, 30), self.ui_admin_clear_rect, border_radius=8)
-            if hovered1:
-                pygame.draw.rect(self.screen, (60, 60, 60), self.ui_admin_clear_rect, 0, border_radius=8)
-            label1 = self.button_font.render('CLEAR EVERYTHING', True, (220, 220, 220))
-            lrx1 = self.ui_admin_clear_rect.x + (self.ui_admin_clear_rect.w - label1.get_width()) // 2
-            lry1 = self.ui_admin_clear_rect.y + (self.ui_admin_clear_rect.h - label1.get_height()) // 2
-            self.screen.blit(label1, (lrx1, lry1))
-            btn_y2 = btn_y1 + btn_h + 12
-            self.ui_admin_clear_npcs_rect = pygame.Rect(btn_x, btn_y2, btn_w, btn_h)
-            hovered2 = self.ui_admin_clear_npcs_rect.collidepoint(pygame.mouse.get_pos())
-            pygame.draw.rect(self.screen, (30, 30, 30), self.ui_admin_clear_npcs_rect, border_radius=8)
-            if hovered2:
-                pygame.draw.rect(self.screen, (60, 60, 60), self.ui_admin_clear_npcs_rect, 0, border_radius=8)
-            label2 = self.button_font.render('CLEAR THE LIVING', True, (220, 220, 220))
-            lrx2 = self.ui_admin_clear_npcs_rect.x + (self.ui_admin_clear_npcs_rect.w - label2.get_width()) // 2
-            lry2 = self.ui_admin_clear_npcs_rect.y + (self.ui_admin_clear_npcs_rect.h - label2.get_height()) // 2
-            self.screen.blit(label2, (lrx2, lry2))
-            btn_y3 = btn_y2 + btn_h + 12
-            self.ui_admin_clear_blocks_rect = pygame.Rect(btn_x, btn_y3, btn_w, btn_h)
-            hovered3 = self.ui_admin_clear_blocks_rect.collidepoint(pygame.mouse.get_pos())
-            pygame.draw.rect(self.screen, (30, 30, 30), self.ui_admin_clear_blocks_rect, border_radius=8)
-            if hovered3:
-                pygame.draw.rect(self.screen, (60, 60, 60), self.ui_admin_clear_blocks_rect, 0, border_radius=8)
-            label3 = self.button_font.render('CLEAR ALL BLOCKS', True, (220, 220, 220))
-            lrx3 = self.ui_admin_clear_blocks_rect.x + (self.ui_admin_clear_blocks_rect.w - label3.get_width()) // 2
-            lry3 = self.ui_admin_clear_blocks_rect.y + (self.ui_admin_clear_blocks_rect.h - label3.get_height()) // 2
-            self.screen.blit(label3, (lrx3, lry3))
-        if self.current_tool == 'blocks' and self.blocks_drag_active and self.blocks_drag_start and self.blocks_drag_current:
-            sx, sy = self.blocks_drag_start
-            cx, cy = self.blocks_drag_current
-            v1x, v1y = self.camera.world_to_view(sx, sy)
-            v2x, v2y = self.camera.world_to_view(cx, cy)
-            x = self.sidebar_width + min(v1x, v2x)
-            y = min(v1y, v2y)
-            w = abs(v2x - v1x)
-            h = abs(v2y - v1y)
-            preview = pygame.Surface((max(1, w), max(1, h)), pygame.SRCALPHA)
-            preview.fill((100, 150, 255, 50))
-            self.screen.blit(preview, (x, y))
-            pygame.draw.rect(self.screen, (100, 160, 255), pygame.Rect(x, y, w, h), 1)
+            btn_y = self.ui_admin_menu_rect.y + header_h + 20
+            buttons = []
+            for label in ('CLEAR EVERYTHING', 'CLEAR THE LIVING', 'CLEAR ALL BLOCKS'):
+                rect = pygame.Rect(btn_x, btn_y, btn_w, btn_h)
+                buttons.append(rect)
+                fill = (60, 60, 60, 255) if rect.collidepoint(mx, my) else (30, 30, 30, 255)
+                add((_tinted(rect.size, fill, 8), rect.topleft))
+                text = self._get_text_surf(label, (220, 220, 220))
+                add((text, (rect.x + (rect.w - text.get_width()) // 2, rect.y + (rect.h - text.get_height()) // 2)))
+                btn_y += btn_h + 12
+            self.ui_admin_clear_rect, self.ui_admin_clear_npcs_rect, self.ui_admin_clear_blocks_rect = buttons
+        return out
 
     def _format_time_label(self) -> str:
         try:
@@ -1889,290 +2196,273 @@ class ParticleGame:
 
     def _draw_status_panels_cpu(self):
         # Only show in sandbox (not in main or pause menus)
-        if getattr(self, 'show_main_menu', False) or getattr(self, 'show_pause_menu', False):
+        if self.show_main_menu or self.show_pause_menu:
             return
         padding = 10
         gap = 8
         # Labels and sizes
-        fps_label = f"{int(self.fps)} FPS"
+        fps_label = self._fps_label
         time_label = self._format_time_label()
-        fps_surf = self.hud_font.render(fps_label, True, (230, 230, 230))
-        time_surf = self.hud_font.render(time_label, True, (230, 230, 230))
+        glyphs = self._hud_glyphs
+        fps_tw, fps_th = glyphs.measure(fps_label)
+        time_tw, time_th = glyphs.measure(time_label)
         panel_h = max(28, self.hud_font.get_height() + 10)
-        fps_w = fps_surf.get_width() + 16
-        time_w = time_surf.get_width() + 16
+        fps_w = fps_tw + 16
+        time_w = time_tw + 16
         y = padding
         # Place at top-right: FPS on the far right, Time to its left
         fps_x = self.width - padding - fps_w
         time_x = fps_x - gap - time_w
         # Time Panel
         time_rect = pygame.Rect(time_x, y, time_w, panel_h)
-        time_bg = pygame.Surface((time_rect.w, time_rect.h), pygame.SRCALPHA)
-        time_bg.fill((0, 0, 0, 180))
-        self.screen.blit(time_bg, time_rect.topleft)
+        self.screen.blit(_tinted(time_rect.size, (0, 0, 0, 180)), time_rect.topleft)
         pygame.draw.rect(self.screen, (90, 90, 90), time_rect, 1)
-        tx = time_rect.x + (time_rect.w - time_surf.get_width()) // 2
-        ty = time_rect.y + (time_rect.h - time_surf.get_height()) // 2
-        self.screen.blit(time_surf, (tx, ty))
+        tx = time_rect.x + (time_rect.w - time_tw) // 2
+        ty = time_rect.y + (time_rect.h - time_th) // 2
+        glyphs.blit(self.screen, time_label, (tx, ty))
         # FPS Panel
         fps_rect = pygame.Rect(fps_x, y, fps_w, panel_h)
-        fps_bg = pygame.Surface((fps_rect.w, fps_rect.h), pygame.SRCALPHA)
-        fps_bg.fill((0, 0, 0, 180))
-        self.screen.blit(fps_bg, fps_rect.topleft)
+        self.screen.blit(_tinted(fps_rect.size, (0, 0, 0, 180)), fps_rect.topleft)
         pygame.draw.rect(self.screen, (90, 90, 90), fps_rect, 1)
-        fx = fps_rect.x + (fps_rect.w - fps_surf.get_width()) // 2
-        fy = fps_rect.y + (fps_rect.h - fps_surf.get_height()) // 2
-        self.screen.blit(fps_surf, (fx, fy))
-
-    def _draw_overlays_gpu(self):
-        self._ensure_ui_textures()
-        self.renderer.draw_color = (0, 0, 0, 128)
-        self.renderer.fill_rect(sdl2rect.Rect(self.ui_flask_rect.x, self.ui_flask_rect.y, self.ui_flask_rect.w, self.ui_flask_rect.h))
-        self.renderer.draw_color = (90, 90, 90, 255)
-        self.renderer.draw_rect(sdl2rect.Rect(self.ui_flask_rect.x, self.ui_flask_rect.y, self.ui_flask_rect.w, self.ui_flask_rect.h))
-        iw, ih = (0, 0)
-        if self.ui_flask_surf:
-            iw, ih = self.ui_flask_surf.get_size()
-        pad = 6
-        dest_w = max(1, self.ui_flask_rect.w - 2 * pad)
-        dest_h = max(1, self.ui_flask_rect.h - 2 * pad)
-        scale = min(dest_w / (iw or 1), dest_h / (ih or 1))
-        w = int((iw or 1) * scale)
-        h = int((ih or 1) * scale)
-        dx = self.ui_flask_rect.x + (self.ui_flask_rect.w - w) // 2
-        dy = self.ui_flask_rect.y + (self.ui_flask_rect.h - h) // 2
-        if self._ui_flask_tex:
-            self.renderer.copy(self._ui_flask_tex, dstrect=sdl2rect.Rect(dx, dy, w, h))
-        else:
+        fx = fps_rect.x + (fps_rect.w - fps_tw) // 2
+        fy = fps_rect.y + (fps_rect.h - fps_th) // 2
+        glyphs.blit(self.screen, fps_label, (fx, fy))
+
+    def _fill_rects(self, color: Tup[int, int, int, int], rects) -> None:
+        # SDL merges consecutive fills that share a draw colour into one draw
+        # call, so callers bucket their rects by colour before handing them in
+        renderer = self.renderer
+        renderer.draw_color = color
+        for x, y, w, h in rects:
+            renderer.fill_rect(sdl2rect.Rect(x, y, w, h))
+
+    def _batch_copy(self, items) -> None:
+        # items are ((texture, srcrect), dstrect) pairs; copies are issued
+        # grouped by texture so SDL's batcher sees unbroken runs of one texture
+        renderer = self.renderer
+        items = [item for item in items if item[0]]
+        items.sort(key=lambda item: id(item[0][0]))
+        for (tex, src), dst in items:
+            renderer.copy(tex, srcrect=src, dstrect=dst)
+
+    def _overlay_geometry(self) -> Dict[str, object]:
+        # everything the GPU overlay places depends only on the layout, so it
+        # is worked out once per relayout instead of every frame
+        geom = self._overlay_geom
+        if geom is not None:
+            return geom
+        R = sdl2rect.Rect
+        header_h = self.ui_header_h
+        buttons = []
+        # icons go into the atlas already fitted to their box, the same
+        # smoothscaled surfaces the CPU overlay blits, so every copy is 1:1
+        for r, icon in ((self.ui_flask_rect, self.ui_flask_surf), (self.ui_admin_rect, self.ui_admin_surf)):
+            if icon:
+                icon = self._fit_icon(icon, max(1, r.w - 12), max(1, r.h - 12))
+            w, h = icon.get_size() if icon else (0, 0)
+            buttons.append((R(r.x, r.y, r.w, r.h), icon, R(r.x + (r.w - w) // 2, r.y + (r.h - h) // 2, w, h)))
+
+        measure = self._ui_glyphs.measure
+
+        def panel(rect, title):
+            th = measure(title)[1]
+            return (R(rect.x + 3, rect.y + 4, rect.w, rect.h), R(rect.x, rect.y, rect.w, rect.h), R(rect.x, rect.y, rect.w, header_h), (rect.x + 12, rect.y + (header_h - th) // 2))
+        tiles = []
+        by_key = {tile['key']: tile for tile in self.ui_tiles}
+        for key, rect in self.ui_tile_rects.items():
+            tile = by_key.get(key)
+            if tile is None:
+                continue
+            surf = tile.get('surf')
+            if surf is not None:
+                surf = self._fit_icon(surf, max(1, rect.w - 16), max(1, rect.h - 16))
+                w, h = surf.get_size()
+                body = R(rect.x + (rect.w - w) // 2, rect.y + (rect.h - h) // 2, w, h)
+            else:
+                c = tile.get('color', (120, 120, 120))
+                body = ((c[0], c[1], c[2], 220), (rect.x + 8, rect.y + 8, max(0, rect.w - 16), max(0, rect.h - 16)))
+            lw, lh = measure(tile['label'])
+            lx = rect.x + (rect.w - lw) // 2
+            ly = rect.bottom - lh - 6
+            tiles.append((key, tile['label'], (rect.x, rect.y, rect.w, rect.h), surf, body, (lx - 4, ly - 2, lw + 8, lh + 4), (lx, ly)))
+        amr = self.ui_admin_menu_rect
+        btn_w, btn_h = (amr.w - 32, 40)
+        admin_buttons = []
+        btn_y = amr.y + header_h + 20
+        for lbl in ('CLEAR EVERYTHING', 'CLEAR THE LIVING', 'CLEAR ALL BLOCKS'):
+            rect = pygame.Rect(amr.x + 16, btn_y, btn_w, btn_h)
+            lw, lh = measure(lbl)
+            admin_buttons.append((rect, lbl, (rect.x + (btn_w - lw) // 2, rect.y + (btn_h - lh) // 2)))
+            btn_y += btn_h + 12
+        geom = self._overlay_geom = {'buttons': buttons, 'spawn': panel(self.ui_menu_rect, 'SPAWN'), 'admin': panel(amr, 'ADMIN'), 'tiles': tiles, 'admin_buttons': admin_buttons}
+        return geom
+
+    def _draw_overlay_panel(self, rects, title: str):
+        shadow, body, header, title_pos = rects
+        renderer = self.renderer
+        renderer.draw_color = (0, 0, 0, 100)
+        renderer.fill_rect(shadow)
+        renderer.draw_color = (0, 0, 0, 180)
+        renderer.fill_rect(body)
+        renderer.draw_color = (12, 12, 12, 210)
+        renderer.fill_rect(header)
+        renderer.draw_color = (100, 100, 100, 255)
+        renderer.draw_rect(body)
+        self._ui_glyphs.copy(renderer, title, title_pos, (220, 220, 220))
+
+    def _refresh_overlays_gpu(self, key: tuple, mx: int, my: int):
+        # the panels are painted into a window-sized target only when their
+        # state changes; other frames cost one copy of it
+        renderer = self.renderer
+        tex = self._ui_target
+        size = (self.width, self.height)
+        if tex is not False and (tex is None or tex.renderer is not renderer or self._ui_target_size != size):
+            # blending into the cleared target leaves premultiplied colour in
+            # it, so it must go on screen with a premultiplied blend or every
+            # translucent pixel gets its alpha applied twice; without custom
+            # blend modes the panels are painted straight to the screen
             try:
-                tmp_tex = Texture.from_surface(self.renderer, self.ui_flask_surf)
-                self.renderer.copy(tmp_tex, dstrect=sdl2rect.Rect(dx, dy, w, h))
+                premultiplied = (_BLENDFACTOR_ONE, _BLENDFACTOR_ONE_MINUS_SRC_ALPHA, _BLENDOPERATION_ADD)
+                mode = compose_custom_blend_mode(premultiplied, premultiplied)
+                tex = Texture(renderer, size, target=True)
+                tex.blend_mode = mode
             except Exception:
-                pass
-        if hasattr(self, 'ui_admin_rect'):
-            self.renderer.draw_color = (0, 0, 0, 128)
-            self.renderer.fill_rect(sdl2rect.Rect(self.ui_admin_rect.x, self.ui_admin_rect.y, self.ui_admin_rect.w, self.ui_admin_rect.h))
-            self.renderer.draw_color = (90, 90, 90, 255)
-            self.renderer.draw_rect(sdl2rect.Rect(self.ui_admin_rect.x, self.ui_admin_rect.y, self.ui_admin_rect.w, self.ui_admin_rect.h))
-            if self._ui_admin_tex is None:
-                try:
-                    if not hasattr(self, 'ui_admin_surf'):
-                        self.ui_admin_surf = self._load_image('src/assets/admin.png')
-                    if self.ui_admin_surf:
-                        self._ui_admin_tex = Texture.from_surface(self.renderer, self.ui_admin_surf)
-                except Exception:
-                    self._ui_admin_tex = None
-            iw2, ih2 = (0, 0)
-            if hasattr(self, 'ui_admin_surf') and self.ui_admin_surf:
-                iw2, ih2 = self.ui_admin_surf.get_size()
-            pad2 = 6
-            dest_w2 = max(1, self.ui_admin_rect.w - 2 * pad2)
-            dest_h2 = max(1, self.ui_admin_rect.h - 2 * pad2)
-            scale2 = min(dest_w2 / (iw2 or 1), dest_h2 / (ih2 or 1))
-            w2 = int((iw2 or 1) * scale2)
-            h2 = int((ih2 or 1) * scale2)
-            dx2 = self.ui_admin_rect.x + (self.ui_admin_rect.w - w2) // 2
-            dy2 = self.ui_admin_rect.y + (self.ui_admin_rect.h - h2) // 2
-            if self._ui_admin_tex:
-                self.renderer.copy(self._ui_admin_tex, dstrect=sdl2rect.Rect(dx2, dy2, w2, h2))
-            elif hasattr(self, 'ui_admin_surf') and self.ui_admin_surf:
-                try:
-                    tmp2 = Texture.from_surface(self.renderer, self.ui_admin_surf)
-                    self.renderer.copy(tmp2, dstrect=sdl2rect.Rect(dx2, dy2, w2, h2))
-                except Exception:
-                    pass
+                tex = False
+            self._ui_target = tex
+            self._ui_target_size = size
+            self._ui_target_key = None
+        if tex is False or key == self._ui_target_key:
+            return
+        renderer.target = tex
+        mode = renderer.draw_blend_mode
+        try:
+            renderer.draw_color = (0, 0, 0, 0)
+            renderer.clear()
+            renderer.draw_blend_mode = 1
+            self._paint_overlays_gpu()
+        finally:
+            renderer.draw_blend_mode = mode
+            renderer.target = None
+        self._ui_target_key = key
+
+    def _show_overlays_gpu(self):
+        if self._ui_target is False:
+            self._paint_overlays_gpu()
+        else:
+            self.renderer.copy(self._ui_target, dstrect=self._frame_rects()[1])
+
+    def _search_caret_gpu(self, x: int, y0: int, y1: int):
+        self.renderer.draw_color = (200, 200, 200, 255)
+        self.renderer.draw_line((x, y0), (x, y1))
+
+    def _drag_preview_gpu(self, x: int, y: int, w: int, h: int):
+        if self._drag_preview_tex is not None:
+            self.renderer.copy(self._drag_preview_tex, dstrect=sdl2rect.Rect(x, y, max(1, w), max(1, h)))
+        self.renderer.draw_color = (100, 160, 255, 255)
+        self.renderer.draw_rect(sdl2rect.Rect(x, y, w, h))
+
+    def _paint_overlays_gpu(self):
+        geom = self._overlay_geometry()
+        renderer = self.renderer
+        fill = renderer.fill_rect
+        outline = renderer.draw_rect
+        fill_rects = self._fill_rects
+        glyphs = self._ui_glyphs
+        buttons = geom['buttons']
+        renderer.draw_color = (0, 0, 0, 128)
+        for r, _, _ in buttons:
+            fill(r)
+        renderer.draw_color = (90, 90, 90, 255)
+        for r, _, _ in buttons:
+            outline(r)
+        self._batch_copy([(self._ui_icon(icon), dst) for _, icon, dst in buttons])
         if self.ui_show_spawn:
-            header_h = getattr(self, 'ui_header_h', 36)
-            self.renderer.draw_color = (0, 0, 0, 100)
-            self.renderer.fill_rect(sdl2rect.Rect(self.ui_menu_rect.x + 3, self.ui_menu_rect.y + 4, self.ui_menu_rect.w, self.ui_menu_rect.h))
-            self.renderer.draw_color = (0, 0, 0, 180)
-            self.renderer.fill_rect(sdl2rect.Rect(self.ui_menu_rect.x, self.ui_menu_rect.y, self.ui_menu_rect.w, self.ui_menu_rect.h))
-            self.renderer.draw_color = (12, 12, 12, 210)
-            self.renderer.fill_rect(sdl2rect.Rect(self.ui_menu_rect.x, self.ui_menu_rect.y, self.ui_menu_rect.w, header_h))
-            self.renderer.draw_color = (100, 100, 100, 255)
-            self.renderer.draw_rect(sdl2rect.Rect(self.ui_menu_rect.x, self.ui_menu_rect.y, self.ui_menu_rect.w, self.ui_menu_rect.h))
-            title = 'SPAWN'
-            title_tex = self._get_text_texture(title, (220, 220, 220))
-            title_surf = self.button_font.render(title, True, (220, 220, 220))
-            ty = self.ui_menu_rect.y + (header_h - title_surf.get_height()) // 2
-            self.renderer.copy(title_tex, dstrect=sdl2rect.Rect(self.ui_menu_rect.x + 12, ty, title_surf.get_width(), title_surf.get_height()))
-            if hasattr(self, 'ui_search_rect'):
+            self._draw_overlay_panel(geom['spawn'], 'SPAWN')
+            if self.ui_search_rect is not None:
                 sr = self.ui_search_rect
-                self.renderer.draw_color = (30, 30, 30, 255)
-                self.renderer.fill_rect(sdl2rect.Rect(sr.x, sr.y, sr.w, sr.h))
-                self.renderer.draw_color = (70, 70, 70, 255)
-                self.renderer.draw_rect(sdl2rect.Rect(sr.x, sr.y, sr.w, sr.h))
+                Rect = sdl2rect.Rect
+                box = Rect(sr.x, sr.y, sr.w, sr.h)
+                renderer.draw_color = (30, 30, 30, 255)
+                fill(box)
+                renderer.draw_color = (70, 70, 70, 255)
+                outline(box)
                 q = self.ui_spawn_search_text or ''
                 placeholder = 'Search'
                 show_text = q if q else placeholder
                 color = (220, 220, 220) if q else (150, 150, 150)
-                ts = self.button_font.render(show_text, True, color)
-                tex = self._get_text_texture(show_text, color)
                 tx = sr.x + 8
-                ty2 = sr.y + (sr.h - ts.get_height()) // 2
-                self.renderer.copy(tex, dstrect=sdl2rect.Rect(tx, ty2, ts.get_width(), ts.get_height()))
-                if self.ui_search_active:
-                    cx = tx + ts.get_width()
-                    self.renderer.draw_color = (200, 200, 200, 255)
-                    self.renderer.draw_line((cx, sr.y + 5), (cx, sr.y + sr.h - 5))
-            mx, my = pygame.mouse.get_pos()
-            for tile in getattr(self, 'ui_tiles', []):
-                rect = self.ui_tile_rects.get(tile['key']) if hasattr(self, 'ui_tile_rects') else None
-                if not rect:
-                    continue
-                hovered = rect.collidepoint(mx, my)
+                if glyphs.covers(show_text):
+                    tw, th = glyphs.measure(show_text)
+                    glyphs.copy(renderer, show_text, (tx, sr.y + (sr.h - th) // 2), color)
+                else:
+                    tex, tw, th = self._search_text_texture(show_text, color, sr.w - 16)
+                    renderer.copy(tex, srcrect=Rect(0, 0, tw, th), dstrect=Rect(tx, sr.y + (sr.h - th) // 2, tw, th))
+                self._search_caret = (tx + tw, sr.y + 5, sr.y + sr.h - 5)
+            # tiles never overlap, so each layer (background, icon or swatch,
+            # label shadow, label) is drawn for every tile before the next one
+            # and the fills collapse into a few colour buckets
+            hovered_key = self._hovered_tile(*self._mouse_pos)
+            current_tool = self.current_tool
+            tiles = geom['tiles']
+            backs: Dict[int, list] = {}
+            for key, _, rect, _, _, _, _ in tiles:
+                hovered = key == hovered_key
                 alpha = 215 if hovered else 185
-                if self.current_tool == tile['key']:
+                if current_tool == key:
                     alpha = 230 if hovered else 205
-                self.renderer.draw_color = (25, 25, 25, alpha)
-                self.renderer.fill_rect(sdl2rect.Rect(rect.x, rect.y, rect.w, rect.h))
-                surf = tile.get('surf')
-                if surf is not None:
-                    iw, ih = surf.get_size()
-                    pad = 8
-                    dest_w = max(1, rect.w - 2 * pad)
-                    dest_h = max(1, rect.h - 2 * pad)
-                    scale = min(dest_w / (iw or 1), dest_h / (ih or 1))
-                    w = int((iw or 1) * scale)
-                    h = int((ih or 1) * scale)
-                    dx = rect.x + (rect.w - w) // 2
-                    dy = rect.y + (rect.h - h) // 2
-                    tex = None
-                    if tile['key'] == 'water':
-                        tex = self._ui_water_tex
-                    elif tile['key'] == 'sand':
-                        tex = self._ui_sand_tex
-                    elif tile['key'] == 'oil':
-                        tex = self._ui_oil_tex
-                    elif tile['key'] == 'lava':
-                        tex = self._ui_lava_tex
-                    elif tile['key'] == 'npc':
-                        tex = self._ui_npc_tex
-                    elif tile['key'] == 'toxic':
-                        tex = self._ui_toxic_tex
-                    elif tile['key'] == 'blocks':
-                        tex = self._ui_blocks_tex
-                    if tex:
-                        self.renderer.copy(tex, dstrect=sdl2rect.Rect(dx, dy, w, h))
-                    else:
-                        try:
-                            tmp_tex = Texture.from_surface(self.renderer, surf)
-                            self.renderer.copy(tmp_tex, dstrect=sdl2rect.Rect(dx, dy, w, h))
-                        except Exception:
-                            pass
-                else:
-                    self.renderer.draw_color = (tile.get('color', (120, 120, 120))[0], tile.get('color', (120, 120, 120))[1], tile.get('color', (120, 120, 120))[2], 220)
-                    inset = 8
-                    self.renderer.fill_rect(sdl2rect.Rect(rect.x + inset, rect.y + inset, max(0, rect.w - 2 * inset), max(0, rect.h - 2 * inset)))
-                lbl = tile['label']
-                label_surf = self.button_font.render(lbl, True, (210, 210, 210))
-                label_tex = self._get_text_texture(lbl, (210, 210, 210))
-                lx = rect.x + (rect.w - label_surf.get_width()) // 2
-                ly = rect.bottom - label_surf.get_height() - 6
-                self.renderer.draw_color = (0, 0, 0, 90)
-                self.renderer.fill_rect(sdl2rect.Rect(lx - 4, ly - 2, label_surf.get_width() + 8, label_surf.get_height() + 4))
-                self.renderer.copy(label_tex, dstrect=sdl2rect.Rect(lx, ly, label_surf.get_width(), label_surf.get_height()))
-        if getattr(self, 'ui_show_admin', False) and hasattr(self, 'ui_admin_menu_rect'):
-            header_h = getattr(self, 'ui_header_h', 36)
-            self.renderer.draw_color = (0, 0, 0, 100)
-            self.renderer.fill_rect(sdl2rect.Rect(self.ui_admin_menu_rect.x + 3, self.ui_admin_menu_rect.y + 4, self.ui_admin_menu_rect.w, self.ui_admin_menu_rect.h))
-            self.renderer.draw_color = (0, 0, 0, 180)
-            self.renderer.fill_rect(sdl2rect.Rect(self.ui_admin_menu_rect.x, self.ui_admin_menu_rect.y, self.ui_admin_menu_rect.w, self.ui_admin_menu_rect.h))
-            self.renderer.draw_color = (12, 12, 12, 210)
-            self.renderer.fill_rect(sdl2rect.Rect(self.ui_admin_menu_rect.x, self.ui_admin_menu_rect.y, self.ui_admin_menu_rect.w, header_h))
-            self.renderer.draw_color = (100, 100, 100, 255)
-            self.renderer.draw_rect(sdl2rect.Rect(self.ui_admin_menu_rect.x, self.ui_admin_menu_rect.y, self.ui_admin_menu_rect.w, self.ui_admin_menu_rect.h))
-            title = 'ADMIN'
-            title_tex = self._get_text_texture(title, (220, 220, 220))
-            title_surf = self.button_font.render(title, True, (220, 220, 220))
-            ty = self.ui_admin_menu_rect.y + (header_h - title_surf.get_height()) // 2
-            self.renderer.copy(title_tex, dstrect=sdl2rect.Rect(self.ui_admin_menu_rect.x + 12, ty, title_surf.get_width(), title_surf.get_height()))
-            btn_w, btn_h = (self.ui_admin_menu_rect.w - 32, 40)
-            btn_x = self.ui_admin_menu_rect.x + 16
-            btn_y1 = self.ui_admin_menu_rect.y + header_h + 20
-            self.ui_admin_clear_rect = pygame.Rect(btn_x, btn_y1, btn_w, btn_h)
-            self.renderer.draw_color = (30, 30, 30, 255)
-            self.renderer.fill_rect(sdl2rect.Rect(btn_x, btn_y1, btn_w, btn_h))
-            lbl1 = 'CLEAR EVERYTHING'
-            lbl1_surf = self.button_font.render(lbl1, True, (220, 220, 220))
-            lbl1_tex = self._get_text_texture(lbl1, (220, 220, 220))
-            lrx1 = btn_x + (btn_w - lbl1_surf.get_width()) // 2
-            lry1 = btn_y1 + (btn_h - lbl1_surf.get_height()) // 2
-            self.renderer.copy(lbl1_tex, dstrect=sdl2rect.Rect(lrx1, lry1, lbl1_surf.get_width(), lbl1_surf.get_height()))
-            btn_y2 = btn_y1 + btn_h + 12
-            self.ui_admin_clear_npcs_rect = pygame.Rect(btn_x, btn_y2, btn_w, btn_h)
-            self.renderer.draw_color = (30, 30, 30, 255)
-            self.renderer.fill_rect(sdl2rect.Rect(btn_x, btn_y2, btn_w, btn_h))
-            lbl2 = 'CLEAR THE LIVING'
-            lbl2_surf = self.button_font.render(lbl2, True, (220, 220, 220))
-            lbl2_tex = self._get_text_texture(lbl2, (220, 220, 220))
-            lrx2 = btn_x + (btn_w - lbl2_surf.get_width()) // 2
-            lry2 = btn_y2 + (btn_h - lbl2_surf.get_height()) // 2
-            self.renderer.copy(lbl2_tex, dstrect=sdl2rect.Rect(lrx2, lry2, lbl2_surf.get_width(), lbl2_surf.get_height()))
-            btn_y3 = btn_y2 + btn_h + 12
-            self.ui_admin_clear_blocks_rect = pygame.Rect(btn_x, btn_y3, btn_w, btn_h)
-            self.renderer.draw_color = (30, 30, 30, 255)
-            self.renderer.fill_rect(sdl2rect.Rect(btn_x, btn_y3, btn_w, btn_h))
-            lbl3 = 'CLEAR ALL BLOCKS'
-            lbl3_surf = self.button_font.render(lbl3, True, (220, 220, 220))
-            lbl3_tex = self._get_text_texture(lbl3, (220, 220, 220))
-            lrx3 = btn_x + (btn_w - lbl3_surf.get_width()) // 2
-            lry3 = btn_y3 + (btn_h - lbl3_surf.get_height()) // 2
-            self.renderer.copy(lbl3_tex, dstrect=sdl2rect.Rect(lrx3, lry3, lbl3_surf.get_width(), lbl3_surf.get_height()))
-        if self.current_tool == 'blocks' and self.blocks_drag_active and self.blocks_drag_start and self.blocks_drag_current:
-            sx, sy = self.blocks_drag_start
-            cx, cy = self.blocks_drag_current
-            v1x, v1y = self.camera.world_to_view(sx, sy)
-            v2x, v2y = self.camera.world_to_view(cx, cy)
-            x = self.sidebar_width + min(v1x, v2x)
-            y = min(v1y, v2y)
-            w = abs(v2x - v1x)
-            h = abs(v2y - v1y)
-            self.renderer.draw_color = (100, 160, 255, 255)
-            self.renderer.draw_rect(sdl2rect.Rect(x, y, w, h))
+                backs.setdefault(alpha, []).append(rect)
+            for alpha, rects in backs.items():
+                fill_rects((25, 25, 25, alpha), rects)
+            self._batch_copy([(self._ui_icon(surf), body) for _, _, _, surf, body, _, _ in tiles if surf is not None])
+            for _, _, _, surf, body, _, _ in tiles:
+                if surf is None:
+                    fill_rects(body[0], (body[1],))
+            fill_rects((0, 0, 0, 90), [t[5] for t in tiles])
+            for _, label, _, _, _, _, pos in tiles:
+                glyphs.copy(renderer, label, pos, (210, 210, 210))
+        if self.ui_show_admin and self.ui_admin_menu_rect is not None:
+            self._draw_overlay_panel(geom['admin'], 'ADMIN')
+            admin_buttons = geom['admin_buttons']
+            self.ui_admin_clear_rect, self.ui_admin_clear_npcs_rect, self.ui_admin_clear_blocks_rect = [b[0] for b in admin_buttons]
+            fill_rects((30, 30, 30, 255), [b[0] for b in admin_buttons])
+            for _, lbl, pos in admin_buttons:
+                glyphs.copy(renderer, lbl, pos, (220, 220, 220))
 
     def _draw_status_panels_gpu(self):
         # Only show in sandbox (not in main or pause menus)
-        if getattr(self, 'show_main_menu', False) or getattr(self, 'show_pause_menu', False):
+        if self.show_main_menu or self.show_pause_menu:
             return
         padding = 10
         gap = 8
         y = padding
         # Labels and sizes
-        fps_label = f"{int(self.fps)} FPS"
+        fps_label = self._fps_label
         time_label = self._format_time_label()
-        fps_surf = self.hud_font.render(fps_label, True, (230, 230, 230))
-        time_surf = self.hud_font.render(time_label, True, (230, 230, 230))
+        glyphs = self._hud_glyphs
+        fps_tw, fps_th = glyphs.measure(fps_label)
+        time_tw, time_th = glyphs.measure(time_label)
         panel_h = max(28, self.hud_font.get_height() + 10)
-        fps_w = fps_surf.get_width() + 16
-        time_w = time_surf.get_width() + 16
+        fps_w = fps_tw + 16
+        time_w = time_tw + 16
         # Place at top-right: FPS on the far right, Time to its left
         fps_x = self.width - padding - fps_w
         time_x = fps_x - gap - time_w
+        hud_key = (time_x, time_w, fps_x, fps_w, panel_h)
+        rects = self._hud_rects
+        if rects is None or rects[0] != hud_key:
+            rects = self._hud_rects = (hud_key, sdl2rect.Rect(time_x, y, time_w, panel_h), sdl2rect.Rect(fps_x, y, fps_w, panel_h))
         # Time Panel
         self.renderer.draw_color = (0, 0, 0, 180)
-        self.renderer.fill_rect(sdl2rect.Rect(time_x, y, time_w, panel_h))
+        self.renderer.fill_rect(rects[1])
         self.renderer.draw_color = (90, 90, 90, 255)
-        self.renderer.draw_rect(sdl2rect.Rect(time_x, y, time_w, panel_h))
-        try:
-            time_tex = Texture.from_surface(self.renderer, time_surf)
-            txx = time_x + (time_w - time_surf.get_width()) // 2
-            txy = y + (panel_h - time_surf.get_height()) // 2
-            self.renderer.copy(time_tex, dstrect=sdl2rect.Rect(txx, txy, time_surf.get_width(), time_surf.get_height()))
-        except Exception:
-            pass
+        self.renderer.draw_rect(rects[1])
+        glyphs.copy(self.renderer, time_label, (time_x + (time_w - time_tw) // 2, y + (panel_h - time_th) // 2))
         # FPS Panel
         self.renderer.draw_color = (0, 0, 0, 180)
-        self.renderer.fill_rect(sdl2rect.Rect(fps_x, y, fps_w, panel_h))
+        self.renderer.fill_rect(rects[2])
         self.renderer.draw_color = (90, 90, 90, 255)
-        self.renderer.draw_rect(sdl2rect.Rect(fps_x, y, fps_w, panel_h))
-        try:
-            fps_tex = Texture.from_surface(self.renderer, fps_surf)
-            fx = fps_x + (fps_w - fps_surf.get_width()) // 2
-            fy = y + (panel_h - fps_surf.get_height()) // 2
-            self.renderer.copy(fps_tex, dstrect=sdl2rect.Rect(fx, fy, fps_surf.get_width(), fps_surf.get_height()))
-        except Exception:
-            pass
+        self.renderer.draw_rect(rects[2])
+        glyphs.copy(self.renderer, fps_label, (fps_x + (fps_w - fps_tw) // 2, y + (panel_h - fps_th) // 2))
 
     def run(self):
         running = True
@@ -2201,12 +2491,18 @@ class ParticleGame:
                     except Exception:
                         pass
                     self.renderer = Renderer(self.window, vsync=True)
-                    self._text_cache = {}
+                    self._text_cache = OrderedDict()
+                    self._build_ui_textures()
                 elif not pygame.display.get_init():
                     pygame.display.init()
                     self.screen = pygame.display.set_mode((self.width, self.height), pygame.SCALED | pygame.DOUBLEBUF)
                     pygame.display.set_caption('Dustground')
                 self.ready = True
+            if self._window_hidden:
+                # nothing would be presented, so the frame is neither stepped
+                # nor drawn and the loop idles until the window comes back
+                time.sleep(1 / 15)
+                continue
             # Decide how many simulation steps to run this frame based on speed control
             try:
                 steps = int(self.speed.steps_for_frame())
@@ -2215,17 +2511,22 @@ class ParticleGame:
             if steps <= 0:
                 # Paused or slowed below 1 step this frame: render without advancing simulation
                 self.draw()
+            elif self._sim_pool is not None:
+                self._pending_steps = steps
+                self.draw()
             else:
-                for _ in range(steps):
-                    self.update()
-                    self._frame_index += 1
+                self._step(steps)
                 self.draw()
             self.clock.tick(self.target_fps)
-            self.fps = int(self.clock.get_fps())
+            self.fps = self.clock.get_fps()
             if self._fps_avg <= 0:
-                self._fps_avg = float(self.fps)
+                self._fps_avg = self.fps
             else:
                 self._fps_avg = self._fps_avg * 0.9 + self.fps * 0.1
+            self._fps_frames += 1
+            if self._fps_frames >= _FPS_LABEL_EVERY:
+                self._fps_frames = 0
+                self._fps_label = f"{int(self._fps_avg)} FPS"
 
 def main():
     game = ParticleGame()
@@ -0,0 +1,51 @@
+"""Ahead-of-time compile the collision kernels for release builds.
+
+Run ``python build_kernels.py`` with numba installed; it writes
+``src/dustground_kernels`` (.so/.pyd) which ``src._kernels`` picks up in
+preference to JIT compiling, so players don't need numba or pay the
+first-call compile.
+
+This uses ``numba.pycc``, which numba has deprecated and will remove; the
+build is pinned to numba 0.68.0 (``pip install numba==0.68.0``). Without a
+built module the game JIT-compiles the same kernels when numba is
+installed, or runs the plain Python loops when it is not.
+"""
+import os
+import sys
+
+try:
+    from numba import njit
+    from numba.pycc import CC
+    import numpy
+except ImportError as exc:
+    sys.exit(f'build_kernels: {exc}; needs numpy and numba 0.68.0 (numba.pycc). '
+             'The game still runs without the built module.')
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from src import _kernels
+
+COLLIDE_SIG = 'void(f8[:], f8[:], f8[:], f8[:], f8, i8, i8, f8)'
+CROSS_SIG = 'void(f8[:], f8[:], f8[:], f8[:], i8[:], i8[:], f8[:], f8[:], f8[:], f8[:], f8, i8, i8, f8, f8, f8, f8, b1[:], b1[:])'
+LIFT_SIG = 'void(f8[:], f8[:], f8[:], i8[:], i8[:], f8[:], f8[:], f8[:], f8, i8, i8, b1[:], b1[:])'
+
+
+def main():
+    # the exported kernels resolve these module globals at compile time
+    _kernels.np = numpy
+    _kernels._key_index = njit(_kernels._py_key_index)
+    _kernels._cell_index = njit(_kernels._py_cell_index)
+    _kernels._tile_order = njit(_kernels._py_tile_order)
+    cc = CC('dustground_kernels')
+    cc.output_dir = os.path.join(ROOT, 'src')
+    cc.verbose = True
+    cc.export('sand_collide', COLLIDE_SIG)(_kernels._py_sand_collide)
+    cc.export('water_collide', COLLIDE_SIG)(_kernels._py_water_collide)
+    cc.export('cross_push', CROSS_SIG)(_kernels._py_cross_push)
+    cc.export('oil_lift', LIFT_SIG)(_kernels._py_oil_lift)
+    cc.compile()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import importlib.util
+import math
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+# numba/numpy are only imported (and the kernels compiled) on first use, so
+# importing this module stays free for the startup path. Release builds ship
+# an AOT-compiled module (see build_kernels.py) that needs numpy but not numba.
+_AOT_MODULE = 'src.dustground_kernels'
+_AOT_NAMES = ('sand_collide', 'water_collide', 'cross_push', 'oil_lift')
+
+def _has_module(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except Exception:
+        return False
+
+NUMBA_AVAILABLE = _has_module('numpy') and (_has_module('numba') or _has_module(_AOT_MODULE))
+np = None
+_JIT_NAMES = ('_key_index', '_cell_index', '_tile_order', 'sand_collide', 'water_collide', 'cross_push', 'oil_lift')
+_load_lock = threading.Lock()
+_loaded = False
+
+def _load() -> bool:
+    global np, _loaded, NUMBA_AVAILABLE
+    if _loaded:
+        return NUMBA_AVAILABLE
+    with _load_lock:
+        if _loaded:
+            return NUMBA_AVAILABLE
+        try:
+            import numpy
+            np = numpy
+            g = globals()
+            try:
+                # all or nothing: a missing, stale or ABI-mismatched build
+                # leaves no half-bound names behind for the JIT to mix with
+                aot = importlib.import_module(_AOT_MODULE)
+                kernels = {name: getattr(aot, name) for name in _AOT_NAMES}
+            except Exception:
+                from numba import njit
+                kernels = {name: njit(cache=True, nogil=True)(g['_py_' + name.lstrip('_')]) for name in _JIT_NAMES}
+            g.update(kernels)
+        except Exception:
+            NUMBA_AVAILABLE = False
+        _loaded = True
+    return NUMBA_AVAILABLE
+
+def __getattr__(name: str):
+    if name in _JIT_NAMES and NUMBA_AVAILABLE and _load() and name in globals():
+        return globals()[name]
+    raise AttributeError(name)
+
+# below this many particles the gather/scatter costs more than the kernel saves
+MIN_BATCH = 256
+# water particles are visited tile by tile so each tile's neighbours stay
+# cache-hot; it only kicks velocities, so the visiting order can't change the
+# result. Sand moves positions in place and keeps list order, like sand.py.
+TILE = 64
+
+
+def _py_cell_index(xs, ys, cell_size):
+    n = xs.shape[0]
+    cxs = np.empty(n, np.int64)
+    cys = np.empty(n, np.int64)
+    for i in range(n):
+        cxs[i] = int(math.floor(xs[i] / cell_size))
+        cys[i] = int(math.floor(ys[i] / cell_size))
+    return _key_index(cxs, cys)
+
+
+def _py_key_index(cxs, cys):
+    # sorted cell keys and the stable order that produced them, so each
+    # cell's particles keep their list order
+    min_x = cxs.min()
+    min_y = cys.min()
+    span = cxs.max() - min_x + 1
+    rows = cys.max() - min_y + 1
+    keys = (cys - min_y) * span + (cxs - min_x)
+    order = np.argsort(keys, kind='mergesort')
+    return keys[order], order, min_x, min_y, span, rows
+
+
+def _py_tile_order(xs, ys, tile):
+    n = xs.shape[0]
+    px = np.empty(n, np.int64)
+    py = np.empty(n, np.int64)
+    for i in range(n):
+        px[i] = int(math.floor(xs[i]))
+        py[i] = int(math.floor(ys[i]))
+    px -= px.min()
+    py -= py.min()
+    tspan = px.max() // tile + 1
+    keys = ((py // tile) * tspan + px // tile) * (tile * tile) + (py % tile) * tile + px % tile
+    return np.argsort(keys, kind='mergesort')
+
+
+def _py_sand_collide(xs, ys, vxs, vys, cell_size, radius, max_neighbors, kick):
+    n = xs.shape[0]
+    if n == 0:
+        return
+    skeys, order, min_x, min_y, span, rows = _cell_index(xs, ys, cell_size)
+    for i in range(n):
+        pcx = int(math.floor(xs[i] / cell_size)) - min_x
+        pcy = int(math.floor(ys[i] / cell_size)) - min_y
+        checked = 0
+        done = False
+        for dx in range(-radius, radius + 1):
+            if done:
+                break
+            ccx = pcx + dx
+            if ccx < 0 or ccx >= span:
+                continue
+            for dy in range(-radius, radius + 1):
+                if done:
+                    break
+                ccy = pcy + dy
+                if ccy < 0 or ccy >= rows:
+                    continue
+                key = ccy * span + ccx
+                lo = np.searchsorted(skeys, key, 'left')
+                hi = np.searchsorted(skeys, key, 'right')
+                for k in range(lo, hi):
+                    j = order[k]
+                    if j == i:
+                        continue
+                    ddx = xs[j] - xs[i]
+                    ddy = ys[j] - ys[i]
+                    dist = math.sqrt(ddx * ddx + ddy * ddy)
+                    if dist < 2:
+                        if dist == 0:
+                            dist = 0.1
+                        nx = ddx / dist
+                        ny = ddy / dist
+                        overlap = 2 - dist
+                        xs[i] -= nx * overlap * 0.5
+                        ys[i] -= ny * overlap * 0.5
+                        xs[j] += nx * overlap * 0.5
+                        ys[j] += ny * overlap * 0.5
+                        vxs[i] -= nx * kick
+                        vys[i] -= ny * kick
+                        checked += 1
+                        if checked >= max_neighbors:
+                            done = True
+                            break
+
+
+def _py_water_collide(xs, ys, vxs, vys, cell_size, radius, max_neighbors, separation):
+    n = xs.shape[0]
+    if n == 0:
+        return
+    skeys, order, min_x, min_y, span, rows = _cell_index(xs, ys, cell_size)
+    visit = _tile_order(xs, ys, TILE)
+    for v in range(n):
+        i = visit[v]
+        pcx = int(math.floor(xs[i] / cell_size)) - min_x
+        pcy = int(math.floor(ys[i] / cell_size)) - min_y
+        checked = 0
+        done = False
+        for dx in range(-radius, radius + 1):
+            if done:
+                break
+            ccx = pcx + dx
+            if ccx < 0 or ccx >= span:
+                continue
+            for dy in range(-radius, radius + 1):
+                if done:
+                    break
+                ccy = pcy + dy
+                if ccy < 0 or ccy >= rows:
+                    continue
+                key = ccy * span + ccx
+                lo = np.searchsorted(skeys, key, 'left')
+                hi = np.searchsorted(skeys, key, 'right')
+                for k in range(lo, hi):
+                    j = order[k]
+                    if j == i:
+                        continue
+                    ddx = xs[j] - xs[i]
+                    ddy = ys[j] - ys[i]
+                    dist = math.sqrt(ddx * ddx + ddy * ddy)
+                    if 0.1 < dist < 2.5:
+                        nx = ddx / dist
+                        ny = ddy / dist
+                        vxs[i] -= nx * separation
+                        vys[i] -= ny * separation
+                        vxs[j] += nx * separation
+                        vys[j] += ny * separation
+                        checked += 1
+                        if checked >= max_neighbors:
+                            done = True
+                            break
+
+
+def _py_cross_push(ax, ay, avx, avy, bcx, bcy, bx, by, bvx, bvy, cell_size, radius, max_neighbors, min_d2, max_d2, a_kick, b_kick, a_hit, b_hit):
+    # same candidate order and cap as the dict-grid lookups in app.py; the b
+    # cells come from the grid (soa.grid_members), not from bx/by
+    na = ax.shape[0]
+    if na == 0 or bx.shape[0] == 0:
+        return
+    skeys, order, min_x, min_y, span, rows = _key_index(bcx, bcy)
+    for i in range(na):
+        pcx = int(ax[i] // cell_size) - min_x
+        pcy = int(ay[i] // cell_size) - min_y
+        seen = 0
+        for dx in range(-radius, radius + 1):
+            if seen >= max_neighbors:
+                break
+            ccx = pcx + dx
+            if ccx < 0 or ccx >= span:
+                continue
+            for dy in range(-radius, radius + 1):
+                if seen >= max_neighbors:
+                    break
+                ccy = pcy + dy
+                if ccy < 0 or ccy >= rows:
+                    continue
+                key = ccy * span + ccx
+                lo = np.searchsorted(skeys, key, 'left')
+                hi = np.searchsorted(skeys, key, 'right')
+                for k in range(lo, hi):
+                    if seen >= max_neighbors:
+                        break
+                    seen += 1
+                    j = order[k]
+                    ddx = bx[j] - ax[i]
+                    ddy = by[j] - ay[i]
+                    d2 = ddx * ddx + ddy * ddy
+                    if min_d2 < d2 < max_d2:
+                        inv = 1.0 / math.sqrt(d2)
+                        nx = ddx * inv
+                        ny = ddy * inv
+                        if a_kick != 0.0:
+                            avx[i] += nx * a_kick
+                            avy[i] += ny * a_kick
+                        if b_kick != 0.0:
+                            bvx[j] += nx * b_kick
+                            bvy[j] += ny * b_kick
+                        a_hit[i] = True
+                        b_hit[j] = True
+
+
+def _py_oil_lift(ox, oy, ovy, wcx, wcy, wx, wy, wvy, cell_size, radius, max_neighbors, o_hit, w_hit):
+    # oil floats over water it sits on; positions move as the loop goes, so
+    # oils are visited in list order exactly like the per-particle version,
+    # and the water cells are the grid's (soa.grid_members), not wx/wy's
+    no = ox.shape[0]
+    if no == 0 or wx.shape[0] == 0:
+        return
+    skeys, order, min_x, min_y, span, rows = _key_index(wcx, wcy)
+    for i in range(no):
+        pcx = int(ox[i] // cell_size) - min_x
+        pcy = int(oy[i] // cell_size) - min_y
+        seen = 0
+        for dx in range(-radius, radius + 1):
+            if seen >= max_neighbors:
+                break
+            ccx = pcx + dx
+            if ccx < 0 or ccx >= span:
+                continue
+            for dy in range(-radius, radius + 1):
+                if seen >= max_neighbors:
+                    break
+                ccy = pcy + dy
+                if ccy < 0 or ccy >= rows:
+                    continue
+                key = ccy * span + ccx
+                lo = np.searchsorted(skeys, key, 'left')
+                hi = np.searchsorted(skeys, key, 'right')
+                for k in range(lo, hi):
+                    if seen >= max_neighbors:
+                        break
+                    seen += 1
+                    j = order[k]
+                    if wy[j] > oy[i] + 0.5:
+                        oy[i] -= 0.6
+                        ovy[i] -= 0.25
+                        wy[j] += 0.3
+                        wvy[j] += 0.12
+                        o_hit[i] = True
+                        w_hit[j] = True
+
+
+def gather(particles: List) -> tuple:
+    _load()
+    n = len(particles)
+    xs = np.fromiter((p.x for p in particles), np.float64, n)
+    ys = np.fromiter((p.y for p in particles), np.float64, n)
+    vxs = np.fromiter((p.vx for p in particles), np.float64, n)
+    vys = np.fromiter((p.vy for p in particles), np.float64, n)
+    return (xs, ys, vxs, vys)
+
+
+def scatter(particles: List, xs, ys, vxs, vys) -> None:
+    for p, x, y, vx, vy in zip(particles, xs.tolist(), ys.tolist(), vxs.tolist(), vys.tolist()):
+        p.x = x
+        p.y = y
+        p.vx = vx
+        p.vy = vy
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def submit(fn, *args) -> Future:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='physics')
+    return _executor.submit(fn, *args)
+
+
+def warmup() -> None:
+    if not NUMBA_AVAILABLE or not _load():
+        return
+    try:
+        one = np.zeros(1, np.float64)
+        sand_collide(one.copy(), one.copy(), one.copy(), one.copy(), 3, 1, 1, 0.1)
+        water_collide(one.copy(), one.copy(), one.copy(), one.copy(), 3, 1, 1, 0.3)
+        cell = np.zeros(1, np.int64)
+        hit = np.zeros(1, np.bool_)
+        cross_push(one, one, one.copy(), one.copy(), cell, cell, one, one, one.copy(), one.copy(), 3.0, 2, 12, 0.01, 6.25, -0.1, 0.15, hit, hit.copy())
+        oil_lift(one, one.copy(), one.copy(), cell, cell, one, one.copy(), one.copy(), 3.0, 2, 12, hit.copy(), hit.copy())
+    except Exception:
+        pass
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Tuple
+from typing import Optional, Tuple
 try:
     from pygame._sdl2 import rect as sdl2rect
 except Exception:
@@ -14,6 +14,10 @@ class GridBackground:
         self.major_color = major_color
         self.target_px = max(8, int(target_px))
         self.major_every = max(2, int(major_every))
+        self._cached_surf = None
+        self._cached_key = None
+        self._lines_key = None
+        self._lines = ([], [])
 
     def _iter_lines(self, view_w: int, view_h: int, off_x: float, off_y: float, scale: float):
         s = max(1e-06, float(scale))
@@ -38,25 +42,48 @@ class GridBackground:
                     yield (vy, idx % self.major_every == 0)
         return (vert_gen(), hori_gen())
 
-    def draw_cpu(self, surface: pygame.Surface, camera) -> None:
-        view_w, view_h = surface.get_size()
+    def _key(self, view_w: int, view_h: int, camera) -> tuple:
         s = max(1e-06, float(camera.scale))
-        off_x = float(camera.off_x)
-        off_y = float(camera.off_y)
-        vgen, hgen = self._iter_lines(view_w, view_h, off_x, off_y, s)
-        for x, is_major in vgen:
+        period = max(4.0, self.target_px / s) * self.major_every
+        return (view_w, view_h, s, float(camera.off_x) % period, float(camera.off_y) % period)
+
+    def _get_lines(self, view_w: int, view_h: int, key: tuple):
+        if key != self._lines_key:
+            _, _, s, off_x, off_y = key
+            vgen, hgen = self._iter_lines(view_w, view_h, off_x, off_y, s)
+            self._lines = (list(vgen), list(hgen))
+            self._lines_key = key
+        return self._lines
+
+    def _draw_lines(self, surface: pygame.Surface, view_w: int, view_h: int, key: tuple) -> None:
+        vlines, hlines = self._get_lines(view_w, view_h, key)
+        for x, is_major in vlines:
             color = self.major_color if is_major else self.minor_color
             pygame.draw.line(surface, color, (x, 0), (x, view_h))
-        for y, is_major in hgen:
+        for y, is_major in hlines:
             color = self.major_color if is_major else self.minor_color
             pygame.draw.line(surface, color, (0, y), (view_w, y))
 
+    def draw_cpu(self, surface: pygame.Surface, camera, fill: Optional[Tuple[int, int, int]]=None) -> None:
+        view_w, view_h = surface.get_size()
+        key = self._key(view_w, view_h, camera)
+        if fill is None:
+            self._draw_lines(surface, view_w, view_h, key)
+            return
+        full_key = (key, tuple(fill))
+        cached = self._cached_surf
+        if full_key != self._cached_key or cached is None:
+            if cached is None or cached.get_size() != (view_w, view_h):
+                cached = surface.copy()
+            cached.fill(fill)
+            self._draw_lines(cached, view_w, view_h, key)
+            self._cached_surf = cached
+            self._cached_key = full_key
+        surface.blit(cached, (0, 0))
+
     def draw_gpu(self, renderer, game_rect: Tuple[int, int, int, int], camera) -> None:
         gx, gy, gw, gh = game_rect
-        s = max(1e-06, float(camera.scale))
-        off_x = float(camera.off_x)
-        off_y = float(camera.off_y)
-        vgen, hgen = self._iter_lines(gw, gh, off_x, off_y, s)
+        vgen, hgen = self._get_lines(gw, gh, self._key(gw, gh, camera))
         for x, is_major in vgen:
             color = self.major_color if is_major else self.minor_color
             renderer.draw_color = (*color, 255)
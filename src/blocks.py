@@ -1,5 +1,6 @@
 import pygame
 from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+from src import obstacle
 
 if TYPE_CHECKING:
     from src.npc import NPC
@@ -31,6 +32,7 @@ class BlocksSystem:
         self.bounce = 0.1
         self.friction = 0.02
         self._cells: set[Tuple[int, int]] = set()
+        self._obstacle_grid = None
         self._is_solid_external = None
         self.color = (180, 180, 190)
 
@@ -40,6 +42,11 @@ class BlocksSystem:
     def is_solid(self, x: int, y: int) -> bool:
         return (int(x), int(y)) in self._cells
 
+    def set_obstacle_grid(self, grid):
+        self._obstacle_grid = grid
+        if grid is not None:
+            grid.set_layer(obstacle.BLOCKS, self._cells)
+
     def add_block_rect(self, x0: int, y0: int, x1: int, y1: int):
         x_min = max(0, min(x0, x1))
         y_min = max(0, min(y0, y1))
@@ -52,7 +59,9 @@ class BlocksSystem:
 
     def clear(self):
         self.blocks.clear()
-        self._cells.clear()
+        if self._obstacle_grid is not None:
+            self._obstacle_grid.set_layer(obstacle.BLOCKS, ())
+        self._cells = set()
 
     def _rebuild_occupancy(self):
         cells = set()
@@ -65,6 +74,8 @@ class BlocksSystem:
                 for xx in range(bx, bx + bw):
                     cells.add((xx, yy))
         self._cells = cells
+        if self._obstacle_grid is not None:
+            self._obstacle_grid.set_layer(obstacle.BLOCKS, cells)
 
     def _collide_bounds(self, b: Block):
         if b.y + b.h >= self.height:
@@ -1,7 +1,8 @@
 import random
 import math
 import pygame
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+from src import brush, raster
 
 class BloodParticle:
     __slots__ = (
@@ -70,13 +71,13 @@ class BloodSystem:
             vy = max(vy, 0.5)
             self.add_particle(x + random.uniform(-1, 1), y + random.uniform(-1, 1), vx, vy)
 
+    def add_particles(self, points):
+        w = self.width
+        h = self.height
+        self.particles.extend([BloodParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
     def add_particle_cluster(self, cx: int, cy: int, brush_size: int):
-        r = max(1, int(brush_size))
-        for _ in range(r * r):
-            ox = random.uniform(-r, r)
-            oy = random.uniform(-r, r)
-            if ox * ox + oy * oy <= r * r:
-                self.add_particle(cx + ox, cy + oy)
+        self.add_particles(brush.scatter(cx, cy, brush_size))
 
     def _rebuild_grid(self):
         self.grid.clear()
@@ -200,9 +201,12 @@ class BloodSystem:
         self.particles = [p for p in self.particles if not p.dead and -10 <= p.x < self.width + 10 and -10 <= p.y < self.height + 10]
 
     def draw(self, surf: pygame.Surface):
+        groups: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
+        w = self.width
+        h = self.height
         for p in self.particles:
             x, y = (int(p.x), int(p.y))
-            if 0 <= x < self.width and 0 <= y < self.height:
+            if 0 <= x < w and 0 <= y < h:
                 if p.dead:
                     continue
                 if p.mutant:
@@ -215,7 +219,8 @@ class BloodSystem:
                     col = self.clotted_color
                 else:
                     col = self.color
-                surf.set_at((x, y), col)
+                groups.setdefault(col, []).append((x, y))
+        raster.plot_groups(surf, groups)
 
     def get_point_groups(self) -> Tuple[Tuple[int, int, int], List[Tuple[int, int]]]:
         col = self.color
@@ -1,5 +1,7 @@
 import random
 import pygame
+from src import brush
+from src.sweep import live
 
 class BlueLavaParticle:
     __slots__ = ("x", "y", "vx", "vy", "age", "dead")
@@ -48,13 +50,13 @@ class BlueLavaSystem:
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(BlueLavaParticle(x, y))
 
+    def add_particles(self, points):
+        w = self.width
+        h = self.height
+        self.particles.extend([BlueLavaParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
     def add_particle_cluster(self, x: int, y: int, brush_size: int):
-        r = max(1, int(brush_size))
-        for _ in range(r * r):
-            ox = random.uniform(-r, r)
-            oy = random.uniform(-r, r)
-            if ox * ox + oy * oy <= r * r:
-                self.add_particle(x + ox, y + oy)
+        self.add_particles(brush.scatter(x, y, brush_size))
 
     def clear(self):
         self.particles.clear()
@@ -66,7 +68,7 @@ class BlueLavaSystem:
     def sweep_dead(self):
         if not self.particles:
             return
-        self.particles = [p for p in self.particles if not getattr(p, "dead", False)]
+        self.particles = live(self.particles)
 
     def _rebuild_grid(self):
         self.grid.clear()
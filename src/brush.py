@@ -0,0 +1,38 @@
+import random
+from functools import lru_cache
+from typing import List, Tuple
+
+
+@lru_cache(maxsize=64)
+def disk(radius: int) -> Tuple[Tuple[int, int], ...]:
+    """Integer (dx, dy) offsets inside a brush of this radius, dx-major."""
+    rr = radius * radius
+    return tuple((dx, dy) for dx in range(-radius, radius + 1) for dy in range(-radius, radius + 1) if dx * dx + dy * dy <= rr)
+
+
+@lru_cache(maxsize=64)
+def square(radius: int) -> Tuple[Tuple[int, int], ...]:
+    """Every (dx, dy) in the (2r+1)^2 neighbourhood, dx-major like the nested loops."""
+    return tuple((dx, dy) for dx in range(-radius, radius + 1) for dy in range(-radius, radius + 1))
+
+
+def fill(cx: float, cy: float, radius: int) -> List[Tuple[float, float]]:
+    return [(cx + dx, cy + dy) for dx, dy in disk(radius)]
+
+
+def scatter(cx: float, cy: float, radius: int) -> List[Tuple[float, float]]:
+    """r*r uniform draws over the brush square, keeping those inside the disk.
+
+    Draws come from ``random`` in the same order the per-system loops used, so
+    seeded runs place the same particles.
+    """
+    r = max(1, int(radius))
+    rr = r * r
+    uniform = random.uniform
+    points = []
+    for _ in range(rr):
+        ox = uniform(-r, r)
+        oy = uniform(-r, r)
+        if ox * ox + oy * oy <= rr:
+            points.append((cx + ox, cy + oy))
+    return points
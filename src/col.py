@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.brush import square
 
 
 @dataclass
@@ -54,20 +56,25 @@ class CollisionManager:
 		self.blocks = blocks_system
 
                            
-	def _neighbors_from(self, sp: SystemProps, x: float, y: float, radius_cells: int) -> List[Any]:
-		out: List[Any] = []
+	def _neighbors_from(self, sp: SystemProps, x: float, y: float, radius_cells: int, cache: Optional[Dict[Tuple[int, int], List[Any]]] = None) -> List[Any]:
 		grid = sp.grid()
 		if not grid:
-			return out
+			return []
 		cs = max(1, sp.cell_size())
 		cx = int(x // cs)
 		cy = int(y // cs)
-		for dx in range(-radius_cells, radius_cells + 1):
-			for dy in range(-radius_cells, radius_cells + 1):
-				cell = (cx + dx, cy + dy)
-				lst = grid.get(cell)
-				if lst:
-					out.extend(lst)
+		if cache is not None:
+			out = cache.get((cx, cy))
+			if out is not None:
+				return out
+		out: List[Any] = []
+		get = grid.get
+		for dx, dy in square(radius_cells):
+			lst = get((cx + dx, cy + dy))
+			if lst:
+				out.extend(lst)
+		if cache is not None:
+			cache[(cx, cy)] = out
 		return out
 
 	def _resolve_pair(self, A: SystemProps, B: SystemProps):
@@ -105,6 +112,9 @@ class CollisionManager:
 
                                                  
 		rad_cells = max(1, int(math.ceil(thresh / max(1, B.cell_size()))))
+		# B's grid is fixed for the whole pass, so A particles sharing a cell
+		# share one gathered list (read-only below)
+		neighbor_cache: Dict[Tuple[int, int], List[Any]] = {}
 
 		for p in plistA:
 			if getattr(p, 'dead', False):
@@ -112,7 +122,7 @@ class CollisionManager:
 			px = getattr(p, 'x', None); py = getattr(p, 'y', None)
 			if px is None or py is None:
 				continue
-			neigh = self._neighbors_from(B, px, py, rad_cells)
+			neigh = self._neighbors_from(B, px, py, rad_cells, neighbor_cache)
 			checked = 0
 			for q in neigh:
 				if p is q or getattr(q, 'dead', False):
@@ -2,6 +2,8 @@ import math
 import random
 import pygame
 from typing import List, Tuple, Dict
+from src import brush
+from src.sweep import live
 
 
 class DiamondParticle:
@@ -65,13 +67,13 @@ class DiamondSystem:
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(DiamondParticle(x, y))
 
+    def add_particles(self, points):
+        w = self.width
+        h = self.height
+        self.particles.extend([DiamondParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
     def add_particle_cluster(self, cx: int, cy: int, brush_size: int):
-        r = max(1, int(brush_size))
-        for _ in range(r * r):
-            ox = random.uniform(-r, r)
-            oy = random.uniform(-r, r)
-            if ox * ox + oy * oy <= r * r:
-                self.add_particle(cx + ox, cy + oy)
+        self.add_particles(brush.scatter(cx, cy, brush_size))
 
     def clear(self):
         self.particles.clear()
@@ -123,7 +125,7 @@ class DiamondSystem:
                         break
 
     def sweep_dead(self):
-        self.particles = [p for p in self.particles if not getattr(p, 'dead', False)]
+        self.particles = live(self.particles)
 
     def update(self, frame_index: int = 0):
         for p in self.particles:
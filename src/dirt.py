@@ -2,9 +2,11 @@ import math
 import random
 import pygame
 from typing import List, Tuple, Dict
+from src import brush, raster
+from src.sweep import live
 
 class DirtParticle:
-	__slots__ = ('x', 'y', 'vx', 'vy', 'is_mud', 'contaminated', 'age')
+	__slots__ = ('x', 'y', 'vx', 'vy', 'is_mud', 'contaminated', 'age', 'dead')
 
 	def __init__(self, x: float, y: float):
 		self.x = float(x)
@@ -14,8 +16,10 @@ class DirtParticle:
 		self.is_mud = False
 		self.contaminated = False
 		self.age = 0
+		self.dead = False
 
 class DirtSystem:
+	plots_point_groups = True
 
 	def __init__(self, width: int, height: int):
 		self.width = width
@@ -42,15 +46,13 @@ class DirtSystem:
 		if 0 <= x < self.width and 0 <= y < self.height:
 			self.particles.append(DirtParticle(x, y))
 
+	def add_particles(self, points):
+		w = self.width
+		h = self.height
+		self.particles.extend([DirtParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
 	def add_particle_cluster(self, cx: int, cy: int, brush_size: int=5):
-		r = max(1, int(brush_size))
-		for dx in range(-r, r + 1):
-			for dy in range(-r, r + 1):
-				if dx * dx + dy * dy <= r * r:
-					x = cx + dx
-					y = cy + dy
-					if 0 <= x < self.width and 0 <= y < self.height:
-						self.add_particle(x, y)
+		self.add_particles(brush.fill(cx, cy, max(1, int(brush_size))))
 
 	def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
 		return (int(x // self.cell_size), int(y // self.cell_size))
@@ -130,16 +132,7 @@ class DirtSystem:
 		self.particles = [p for p in self.particles if -10 <= p.x < self.width + 10 and -10 <= p.y < self.height + 10]
 
 	def draw(self, surface: pygame.Surface):
-		for p in self.particles:
-			x, y = int(p.x), int(p.y)
-			if 0 <= x < self.width and 0 <= y < self.height:
-				if p.is_mud:
-					col = (110, 85, 60)
-				elif p.contaminated:
-					col = (100, 90, 60)
-				else:
-					col = (130, 100, 70)
-				surface.set_at((x, y), col)
+		raster.plot_groups(surface, self.get_point_groups())
 
 	def get_point_groups(self) -> Dict[Tuple[int, int, int], List[Tuple[int, int]]]:
 		groups: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
@@ -159,7 +152,7 @@ class DirtSystem:
 		return len(self.particles)
 
 	def sweep_dead(self):
-		self.particles = [p for p in self.particles if not getattr(p, 'dead', False)]
+		self.particles = live(self.particles)
 
 	def get_particles_at(self, x: float, y: float, radius: float=5) -> List[DirtParticle]:
 		out: List[DirtParticle] = []
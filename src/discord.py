@@ -1,10 +1,19 @@
 from __future__ import annotations
 import time
 from typing import Optional
-try:
-    from pypresence import Presence
-except Exception:
-    Presence = None
+Presence = None
+_presence_checked = False
+
+def _presence_cls():
+    global Presence, _presence_checked
+    if not _presence_checked:
+        _presence_checked = True
+        try:
+            from pypresence import Presence as _Presence
+            Presence = _Presence
+        except Exception:
+            Presence = None
+    return Presence
 DISCORD_CLIENT_ID = '1433222673508470925'
 
 class _DiscordRPC:
@@ -20,7 +29,7 @@ class _DiscordRPC:
     def init(self, client_id: Optional[str]=None) -> None:
         if self.enabled:
             return
-        if Presence is None:
+        if _presence_cls() is None:
             return
         cid = client_id or DISCORD_CLIENT_ID
         self.client_id = cid
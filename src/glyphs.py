@@ -0,0 +1,98 @@
+from __future__ import annotations
+from typing import Dict, Optional, Tuple
+import pygame
+try:
+    from pygame._sdl2.video import Texture
+    from pygame._sdl2 import rect as sdl2rect
+except Exception:
+    Texture = None
+    sdl2rect = None
+
+class GlyphAtlas:
+    # each character is rendered once into a strip; strings are stamped glyph by
+    # glyph, so per-frame labels (FPS, time scale) never touch font.render
+
+    def __init__(self, font: pygame.font.Font, chars: str, color: Tuple[int, int, int]) -> None:
+        chars = ''.join(dict.fromkeys(chars))
+        glyphs = [font.render(ch, True, color) for ch in chars]
+        self.height = max([g.get_height() for g in glyphs] or [font.get_height()])
+        width = sum(g.get_width() for g in glyphs)
+        self.surface = pygame.Surface((max(1, width), max(1, self.height)), pygame.SRCALPHA)
+        self.rects: Dict[str, pygame.Rect] = {}
+        x = 0
+        for ch, g in zip(chars, glyphs):
+            self.surface.blit(g, (x, 0))
+            self.rects[ch] = pygame.Rect(x, 0, g.get_width(), self.height)
+            x += g.get_width()
+        self._texture = None
+        self._renderer = None
+        self._src_rects: Dict[str, object] = {}
+        # (src, dst) rect pairs per placed string; the HUD redraws the same
+        # few strings at the same spots, so the rects are built once
+        self._placed: Dict[tuple, tuple] = {}
+        # HUD fields cycle through a handful of strings, so each one is laid
+        # out once: (char, x offset) per glyph plus the total width
+        self._runs: Dict[str, Tuple[tuple, int]] = {}
+
+    def _layout(self, text: str) -> Tuple[tuple, int]:
+        run = self._runs.get(text)
+        if run is None:
+            rects = self.rects
+            glyphs = []
+            x = 0
+            for ch in text:
+                r = rects.get(ch)
+                if r is not None:
+                    glyphs.append((ch, x))
+                    x += r.w
+            if len(self._runs) >= 128:
+                self._runs.clear()
+            run = self._runs[text] = (tuple(glyphs), x)
+        return run
+
+    def covers(self, text: str) -> bool:
+        rects = self.rects
+        return all(ch in rects for ch in text)
+
+    def measure(self, text: str) -> Tuple[int, int]:
+        return (self._layout(text)[1], self.height)
+
+    def blit(self, dest: pygame.Surface, text: str, pos: Tuple[int, int]) -> None:
+        rects = self.rects
+        src = self.surface
+        x, y = pos
+        for ch, dx in self._layout(text)[0]:
+            dest.blit(src, (x + dx, y), rects[ch])
+
+    def texture(self, renderer) -> Optional['Texture']:
+        if Texture is None:
+            return None
+        if self._renderer is not renderer:
+            # a failed upload is remembered per renderer, not retried per frame
+            self._renderer = renderer
+            self._placed.clear()
+            try:
+                self._texture = Texture.from_surface(renderer, self.surface)
+                self._src_rects = {ch: sdl2rect.Rect(r.x, r.y, r.w, r.h) for ch, r in self.rects.items()}
+            except Exception:
+                self._texture = None
+        return self._texture
+
+    def copy(self, renderer, text: str, pos: Tuple[int, int], color: Optional[Tuple[int, int, int]]=None) -> None:
+        tex = self.texture(renderer)
+        if tex is None:
+            return
+        if color is not None:
+            # an atlas rendered in white is tinted per string by colour mod
+            tex.color = color
+        key = (text, pos)
+        placed = self._placed.get(key)
+        if placed is None:
+            srcs = self._src_rects
+            x, y = pos
+            h = self.height
+            if len(self._placed) >= 256:
+                self._placed.clear()
+            placed = self._placed[key] = tuple((srcs[ch], sdl2rect.Rect(x + dx, y, srcs[ch].w, h)) for ch, dx in self._layout(text)[0])
+        for src, dst in placed:
+            renderer.copy(tex, srcrect=src, dstrect=dst)
@@ -1,16 +1,19 @@
-import random
 import pygame
+from src import brush, raster
+from src.sweep import live
 
 class LavaParticle:
-    __slots__ = ('x', 'y', 'vx', 'vy')
+    __slots__ = ('x', 'y', 'vx', 'vy', 'dead')
 
     def __init__(self, x: float, y: float):
         self.x = float(x)
         self.y = float(y)
         self.vx = 0.0
         self.vy = 0.0
+        self.dead = False
 
 class LavaSystem:
+    plots_point_groups = True
 
     def __init__(self, width: int, height: int):
         self.width = width
@@ -25,21 +28,25 @@ class LavaSystem:
         self.grid: dict[tuple[int, int], list[LavaParticle]] = {}
         self.color = (255, 110, 20)
         self._is_solid = None
+        self._obstacle_grid = None
 
     def set_obstacle_query(self, fn):
         self._is_solid = fn
 
+    def set_obstacle_grid(self, grid):
+        self._obstacle_grid = grid
+
     def add_particle(self, x: float, y: float):
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(LavaParticle(x, y))
 
+    def add_particles(self, points):
+        w = self.width
+        h = self.height
+        self.particles.extend([LavaParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
     def add_particle_cluster(self, x: int, y: int, brush_size: int):
-        r = max(1, int(brush_size))
-        for _ in range(r * r):
-            ox = random.uniform(-r, r)
-            oy = random.uniform(-r, r)
-            if ox * ox + oy * oy <= r * r:
-                self.add_particle(x + ox, y + oy)
+        self.add_particles(brush.scatter(x, y, brush_size))
 
     def clear(self):
         self.particles.clear()
@@ -51,7 +58,7 @@ class LavaSystem:
     def sweep_dead(self):
         if not self.particles:
             return
-        self.particles = [p for p in self.particles if not getattr(p, 'dead', False)]
+        self.particles = live(self.particles)
 
     def _rebuild_grid(self):
         self.grid.clear()
@@ -103,6 +110,12 @@ class LavaSystem:
                     q.vy -= dvy
 
     def update(self, frame_index: int):
+        is_solid = self._is_solid
+        grid = self._obstacle_grid
+        if grid is not None:
+            cells = grid.data
+            gw = grid.width
+            gh = grid.height
         for p in self.particles:
             p.vy += self.gravity
             damp_x = max(0.0, 1.0 - self.viscosity * 1.25)
@@ -111,7 +124,13 @@ class LavaSystem:
             p.vy *= damp_y
             p.x += p.vx
             p.y += p.vy
-            if self._is_solid and self._is_solid(int(p.x), int(p.y)):
+            if grid is not None:
+                xi = int(p.x)
+                yi = int(p.y)
+                hit = 0 <= xi < gw and 0 <= yi < gh and cells[yi * gw + xi]
+            else:
+                hit = is_solid and is_solid(int(p.x), int(p.y))
+            if hit:
                 p.x -= p.vx
                 p.y -= p.vy
                 p.vx *= -0.15
@@ -132,11 +151,7 @@ class LavaSystem:
         self._handle_collisions(frame_index)
 
     def draw(self, surf: pygame.Surface):
-        col = self.color
-        for p in self.particles:
-            x, y = (int(p.x), int(p.y))
-            if 0 <= x < self.width and 0 <= y < self.height:
-                surf.set_at((x, y), col)
+        raster.plot_groups(surf, self.get_point_groups())
 
     def get_point_groups(self):
         points = [(int(p.x), int(p.y)) for p in self.particles]
@@ -5,6 +5,7 @@ import math
 import time
 import pygame
 from src.pluginman.pluginmenu import PluginMenuPanel
+from src.shapes import draw_rounded
 try:
     from pygame._sdl2.video import Texture
     from pygame._sdl2 import rect as sdl2rect
@@ -45,6 +46,7 @@ class MainMenu:
         self.accent_fill = (55, 70, 95)
         self.accent_outline = (100, 130, 170)
         self._text_cache = {}
+        self._text_renderer = None
         self.about_lines: List[str] = ['Dust Grounds (0.2) by Studio Carousel', 'barrier', 'Lead Developer: qrunk', 'barrier', 'Secondary Developer 1: SoupUnit', 'barrier', 'Secondary Developer 2: nehiyawe', 'barrier', 'Special Thanks to:', 'People Playground and Studio Minus for the art style inspiration.']
         self.settings_tabs = [
             {
@@ -455,7 +457,7 @@ class MainMenu:
             tabs_x = left_margin
             items_x = left_margin + tabs_w + gap
             desc_x = width - desc_w - left_margin
-            pygame.draw.rect(screen, (32, 32, 32), (tabs_x - 8, 100, tabs_w + 16, height - 160), border_radius=6)
+            draw_rounded(screen, (32, 32, 32), (tabs_x - 8, 100, tabs_w + 16, height - 160), 6)
             ty = 120
             total_tabs = len(self.settings_tabs) + (1 if self.options_has_back_tab else 0)
             self._opt_hit['tabs'] = []
@@ -465,13 +467,13 @@ class MainMenu:
                 is_sel = self.opt_active_pane == 'tabs' and idx == self.opt_tab_idx
                 row_rect = pygame.Rect(tabs_x, ty - 6, tabs_w, spacing)
                 if idx == self.opt_tab_idx:
-                    pygame.draw.rect(screen, (40, 40, 40), row_rect, border_radius=4)
+                    draw_rounded(screen, (40, 40, 40), row_rect, 4)
                 color = self.accent if is_sel else (220, 220, 220) if idx == self.opt_tab_idx else (180, 180, 180)
                 surf = self.item_font.render(name, True, color)
                 screen.blit(surf, (tabs_x + 10, ty))
                 self._opt_hit['tabs'].append((row_rect.copy(), idx))
                 ty += spacing
-            pygame.draw.rect(screen, (30, 30, 30), (items_x - 8, 100, max(0, desc_x - items_x) - 20, height - 160), border_radius=6)
+            draw_rounded(screen, (30, 30, 30), (items_x - 8, 100, max(0, desc_x - items_x) - 20, height - 160), 6)
             if self.options_has_back_tab and self.opt_tab_idx == len(self.settings_tabs):
                 self._opt_hit['items'] = {}
             else:
@@ -482,7 +484,7 @@ class MainMenu:
                 for i, item in enumerate(items):
                     sel_item = self.opt_active_pane == 'items' and i == self.opt_item_idx
                     row_rect = pygame.Rect(items_x, iy - 6, desc_x - items_x - 24, row_h)
-                    pygame.draw.rect(screen, (36, 36, 36), row_rect, border_radius=4)
+                    draw_rounded(screen, (36, 36, 36), row_rect, 4)
                     label = item.get('label', item.get('key', ''))
                     lab_col = (230, 230, 230)
                     lab_surf = self.item_font.render(label, True, lab_col)
@@ -494,7 +496,7 @@ class MainMenu:
                         enabled = bool(item.get('value', False))
                         pill_w, pill_h = (120, lab_surf.get_height() + 4)
                         pill_rect = pygame.Rect(ctrl_x, iy - 2, pill_w, pill_h)
-                        pygame.draw.rect(screen, (25, 25, 25), pill_rect, border_radius=12)
+                        draw_rounded(screen, (25, 25, 25), pill_rect, 12)
                         txt = 'Enabled' if enabled else 'Disabled'
                         col = self.accent if enabled else (170, 170, 170)
                         val_surf = self.item_font.render(txt, True, col)
@@ -508,9 +510,9 @@ class MainMenu:
                         for j, ch in enumerate(choices):
                             w = max(84, self.item_font.size(ch)[0] + 18)
                             rect = pygame.Rect(bx, iy - 2, w, lab_surf.get_height() + 4)
-                            pygame.draw.rect(screen, (22, 22, 22), rect, border_radius=8)
+                            draw_rounded(screen, (22, 22, 22), rect, 8)
                             if j == ci:
-                                pygame.draw.rect(screen, self.accent_fill, rect, border_radius=8)
+                                draw_rounded(screen, self.accent_fill, rect, 8)
                             ch_surf = self.item_font.render(ch, True, (220, 220, 220) if j == ci else (170, 170, 170))
                             screen.blit(ch_surf, (rect.x + (w - ch_surf.get_width()) // 2, rect.y + 2))
                             bx += w + 8
@@ -522,17 +524,17 @@ class MainMenu:
                         v = int(item.get('value', vmin))
                         tr_w = 340
                         tr_rect = pygame.Rect(ctrl_x, iy + lab_surf.get_height() // 2, tr_w, 8)
-                        pygame.draw.rect(screen, (20, 20, 20), tr_rect, border_radius=4)
-                        pygame.draw.rect(screen, (80, 80, 80), tr_rect.inflate(-2, -2), border_radius=4)
+                        draw_rounded(screen, (20, 20, 20), tr_rect, 4)
+                        draw_rounded(screen, (80, 80, 80), tr_rect.inflate(-2, -2), 4)
                         t = 0 if vmax == vmin else (v - vmin) / (vmax - vmin)
                         hx = tr_rect.x + int(t * tr_rect.w)
                         h_rect = pygame.Rect(hx - 6, tr_rect.y - 6, 12, 20)
-                        pygame.draw.rect(screen, (230, 230, 230), h_rect, border_radius=3)
+                        draw_rounded(screen, (230, 230, 230), h_rect, 3)
                         val_surf = self.item_font.render(str(v), True, (200, 200, 200))
                         screen.blit(val_surf, (h_rect.centerx - val_surf.get_width() // 2, h_rect.bottom + 2))
                         hit_info['slider_track'] = tr_rect.copy()
                     if sel_item:
-                        pygame.draw.rect(screen, self.accent_outline, row_rect, width=2, border_radius=4)
+                        draw_rounded(screen, self.accent_outline, row_rect, 4, 2)
                     self._opt_hit['items'][self.opt_tab_idx, i] = hit_info
                     iy += row_h
             if self._hover_tooltip:
@@ -583,17 +585,24 @@ class MainMenu:
                 uy = y + surf.get_height() + 6
                 pygame.draw.rect(screen, (200, 200, 200), (ux, uy, under_w, under_h))
 
-    def _get_text_tex(self, renderer, text: str, color: Tuple[int, int, int]):
-        key = (text, color)
+    def _get_text_tex(self, renderer, text: str, color: Tuple[int, int, int], font: Optional[pygame.font.Font]=None):
+        # labels are rendered and uploaded once per renderer; a changing value
+        # such as a slider readout only adds an entry when it changes
         if Texture is None:
             raise RuntimeError('SDL2 Texture is unavailable')
-        if key in self._text_cache:
-            surf = self.item_font.render(text, True, color)
-            return (self._text_cache[key], surf)
-        surf = self.item_font.render(text, True, color)
-        tex = Texture.from_surface(renderer, surf)
-        self._text_cache[key] = tex
-        return (tex, surf)
+        if font is None:
+            font = self.item_font
+        if self._text_renderer is not renderer:
+            self._text_cache.clear()
+            self._text_renderer = renderer
+        key = (id(font), text, color)
+        entry = self._text_cache.get(key)
+        if entry is None:
+            if len(self._text_cache) >= 256:
+                self._text_cache.clear()
+            surf = font.render(text, True, color)
+            entry = self._text_cache[key] = (Texture.from_surface(renderer, surf), surf)
+        return entry
 
     def draw_gpu(self, renderer, left_margin: int=64) -> None:
         if self.state == 'plugins':
@@ -616,15 +625,13 @@ class MainMenu:
                     y += spacing
                     continue
                 if i == 0:
-                    surf = self.title_font.render(text, True, (230, 230, 230))
+                    tex, surf = self._get_text_tex(renderer, text, (230, 230, 230), self.title_font)
                 else:
-                    surf = self.item_font.render(text, True, (210, 210, 210))
-                tex = Texture.from_surface(renderer, surf)
+                    tex, surf = self._get_text_tex(renderer, text, (210, 210, 210))
                 renderer.copy(tex, dstrect=sdl2rect.Rect(left_margin, y, surf.get_width(), surf.get_height()))
                 y += spacing
             pulse = self._pulse()
-            back_surf = self.item_font.render(self.back_label, True, (235, 235, 235))
-            back_tex = Texture.from_surface(renderer, back_surf)
+            back_tex, back_surf = self._get_text_tex(renderer, self.back_label, (235, 235, 235))
             bx = left_margin
             by = y + 10
             renderer.copy(back_tex, dstrect=sdl2rect.Rect(bx, by, back_surf.get_width(), back_surf.get_height()))
@@ -638,8 +645,7 @@ class MainMenu:
         if self.state == 'options':
             if Texture is None or sdl2rect is None:
                 return
-            title_surf = self.title_font.render('settings', True, (230, 230, 230))
-            title_tex = Texture.from_surface(renderer, title_surf)
+            title_tex, title_surf = self._get_text_tex(renderer, 'settings', (230, 230, 230), self.title_font)
             renderer.copy(title_tex, dstrect=sdl2rect.Rect(left_margin, 36, title_surf.get_width(), title_surf.get_height()))
             spacing = self.item_font.get_height() + 12
             try:
@@ -668,8 +674,7 @@ class MainMenu:
                     renderer.draw_color = (40, 40, 40, 255)
                     renderer.fill_rect(row_rect)
                 color = self.accent if is_sel else (220, 220, 220) if idx == self.opt_tab_idx else (180, 180, 180)
-                surf = self.item_font.render(name, True, color)
-                tex = Texture.from_surface(renderer, surf)
+                tex, surf = self._get_text_tex(renderer, name, color)
                 renderer.copy(tex, dstrect=sdl2rect.Rect(tabs_x + 10, ty, surf.get_width(), surf.get_height()))
                 self._opt_hit['tabs'].append((pygame.Rect(tabs_x, ty - 6, tabs_w, spacing), idx))
                 ty += spacing
@@ -686,8 +691,7 @@ class MainMenu:
                     renderer.draw_color = (36, 36, 36, 255)
                     renderer.fill_rect(row_rect)
                     label = item.get('label', item.get('key', ''))
-                    lab_surf = self.item_font.render(label, True, (230, 230, 230))
-                    lab_tex = Texture.from_surface(renderer, lab_surf)
+                    lab_tex, lab_surf = self._get_text_tex(renderer, label, (230, 230, 230))
                     renderer.copy(lab_tex, dstrect=sdl2rect.Rect(items_x + 12, iy, lab_surf.get_width(), lab_surf.get_height()))
                     hit_info = {'key': item.get('key'), 'label_rect': pygame.Rect(items_x + 12, iy, lab_surf.get_width(), lab_surf.get_height())}
                     ctrl_x = items_x + 360
@@ -699,8 +703,7 @@ class MainMenu:
                         renderer.fill_rect(sdl2rect.Rect(ctrl_x, iy - 2, pill_w, pill_h))
                         txt = 'Enabled' if enabled else 'Disabled'
                         col = self.accent if enabled else (170, 170, 170)
-                        v_surf = self.item_font.render(txt, True, col)
-                        v_tex = Texture.from_surface(renderer, v_surf)
+                        v_tex, v_surf = self._get_text_tex(renderer, txt, col)
                         renderer.copy(v_tex, dstrect=sdl2rect.Rect(ctrl_x + (pill_w - v_surf.get_width()) // 2, iy - 2 + 2, v_surf.get_width(), v_surf.get_height()))
                         hit_info['toggle_rect'] = pygame.Rect(ctrl_x, iy - 2, pill_w, pill_h)
                     elif item.get('type') == 'choice':
@@ -716,8 +719,7 @@ class MainMenu:
                             if j == ci:
                                 renderer.draw_color = (self.accent_fill[0], self.accent_fill[1], self.accent_fill[2], 255)
                                 renderer.fill_rect(rect)
-                            ch_surf = self.item_font.render(ch, True, (220, 220, 220) if j == ci else (170, 170, 170))
-                            ch_tex = Texture.from_surface(renderer, ch_surf)
+                            ch_tex, ch_surf = self._get_text_tex(renderer, ch, (220, 220, 220) if j == ci else (170, 170, 170))
                             renderer.copy(ch_tex, dstrect=sdl2rect.Rect(rect.x + (w - ch_surf.get_width()) // 2, rect.y + 2, ch_surf.get_width(), ch_surf.get_height()))
                             bx += w + 8
                             choice_rects.append(pygame.Rect(rect.x, rect.y, rect.w, rect.h))
@@ -738,8 +740,7 @@ class MainMenu:
                         h_rect = sdl2rect.Rect(hx - 6, tr_rect.y - 6, 12, 20)
                         renderer.draw_color = (230, 230, 230, 255)
                         renderer.fill_rect(h_rect)
-                        v_surf = self.item_font.render(str(v), True, (200, 200, 200))
-                        v_tex = Texture.from_surface(renderer, v_surf)
+                        v_tex, v_surf = self._get_text_tex(renderer, str(v), (200, 200, 200))
                         renderer.copy(v_tex, dstrect=sdl2rect.Rect(h_rect.x + (h_rect.w - v_surf.get_width()) // 2, h_rect.y + h_rect.h + 2, v_surf.get_width(), v_surf.get_height()))
                         hit_info['slider_track'] = pygame.Rect(tr_rect.x, tr_rect.y, tr_rect.w, tr_rect.h)
                     if sel_item:
@@ -774,17 +775,15 @@ class MainMenu:
                     renderer.draw_rect(sdl2rect.Rect(bx, by, tw + pad * 2, th + pad * 2))
                     yy = by + pad
                     for l in lines:
-                        s = self.item_font.render(l, True, (220, 220, 220))
-                        t = Texture.from_surface(renderer, s)
+                        t, s = self._get_text_tex(renderer, l, (220, 220, 220))
                         renderer.copy(t, dstrect=sdl2rect.Rect(bx + pad, yy, s.get_width(), s.get_height()))
                         yy += self.item_font.get_height() + 4
                 except Exception:
                     pass
             return
         title = 'Dustground'
-        title_surf = self.title_font.render(title, True, (220, 220, 220))
         if Texture is not None and sdl2rect is not None:
-            title_tex = Texture.from_surface(renderer, title_surf)
+            title_tex, title_surf = self._get_text_tex(renderer, title, (220, 220, 220), self.title_font)
             renderer.copy(title_tex, dstrect=sdl2rect.Rect(left_margin, 40, title_surf.get_width(), title_surf.get_height()))
         spacing = self.item_font.get_height() + 12
         try:
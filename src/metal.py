@@ -1,6 +1,8 @@
 import math
 import pygame
 from typing import List, Tuple, Dict
+from src import raster, soa
+from src import obstacle
 
 class MetalParticle:
 
@@ -29,6 +31,7 @@ class MetalParticle:
             self.vy = 12
 
 class MetalSystem:
+    plots_point_groups = True
 
     def __init__(self, width: int, height: int):
         self.width = width
@@ -42,6 +45,7 @@ class MetalSystem:
         self.max_neighbors: int = 16
         self.skip_mod: int = 1
         self._cells: set[Tuple[int, int]] = set()
+        self._obstacle_grid = None
         self.color = (140, 140, 150)
 
     def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
@@ -118,10 +122,17 @@ class MetalSystem:
             if 0 <= x < w and 0 <= y < h:
                 cells.add((x, y))
         self._cells = cells
+        if self._obstacle_grid is not None:
+            self._obstacle_grid.set_layer(obstacle.METAL, cells)
 
     def is_solid(self, x: int, y: int) -> bool:
         return (int(x), int(y)) in self._cells
 
+    def set_obstacle_grid(self, grid):
+        self._obstacle_grid = grid
+        if grid is not None:
+            grid.set_layer(obstacle.METAL, self._cells)
+
     def add_particle(self, x: float, y: float):
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(MetalParticle(x, y))
@@ -143,23 +154,22 @@ class MetalSystem:
     def clear(self):
         self.particles.clear()
         self.grid.clear()
-        self._cells.clear()
+        if self._obstacle_grid is not None:
+            self._obstacle_grid.set_layer(obstacle.METAL, ())
+        self._cells = set()
 
     def update(self, frame_index: int=0):
+        gravity = self.gravity
+        friction = self.friction
         for p in self.particles:
-            p.update(self.gravity, self.friction)
+            p.update(gravity, friction)
         self._handle_collisions(frame_index)
         self._handle_boundaries()
         self._rebuild_occupancy()
         self.particles = [p for p in self.particles if -10 <= p.x < self.width + 10 and -10 <= p.y < self.height + 10]
 
     def draw(self, surf: pygame.Surface):
-        col = self.color
-        w = self.width
-        h = self.height
-        for p in self.particles:
-            if 0 <= p.x < w and 0 <= p.y < h:
-                surf.set_at((int(p.x), int(p.y)), col)
+        raster.plot_groups(surf, self.get_point_groups())
 
     def get_point_groups(self) -> Tuple[Tuple[int, int, int], List[Tuple[int, int]]]:
         pts: List[Tuple[int, int]] = []
@@ -172,5 +182,12 @@ class MetalSystem:
                 pts.append((x, y))
         return (self.color, pts)
 
+    def get_point_arrays(self):
+        ps = self.particles
+        if not soa.NUMPY_AVAILABLE or len(ps) < soa.MIN_BATCH:
+            return None
+        xs, ys, keep = soa.pixels(ps, self.width, self.height, truncate_first=True)
+        return (self.color, (xs[keep], ys[keep]))
+
     def get_particle_count(self) -> int:
         return len(self.particles)
@@ -1,5 +1,7 @@
 import random
 import pygame
+from src import raster
+from src.sweep import live
 
 class MilkParticle:
     __slots__ = ("x","y","vx","vy","temp","age","spoiled","cheese","toxic","dead")
@@ -33,6 +35,10 @@ class MilkSystem:
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(MilkParticle(x, y))
 
+    def add_particle_batch(self, x:int, y:int, count:int):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.particles.extend([MilkParticle(x, y) for _ in range(count)])
+
     def set_obstacle_query(self, q):
         self._is_obstacle = q
 
@@ -52,7 +58,7 @@ class MilkSystem:
         return len(self.particles)
 
     def sweep_dead(self):
-        self.particles = [p for p in self.particles if not p.dead]
+        self.particles = live(self.particles)
 
     def is_solid(self, x:int, y:int) -> bool:
         return False
@@ -133,7 +139,7 @@ class MilkSystem:
         self._rebuild_grid()
 
     def draw(self, surf: pygame.Surface):
-        col = (240, 240, 245)
+        groups = {}
         for p in self.particles:
             if p.dead:
                 continue
@@ -145,7 +151,8 @@ class MilkSystem:
                 col = (250, 245, 200)
             else:
                 col = (240, 240, 245)
-            surf.fill(col, (p.x, p.y, 1, 1))
+            groups.setdefault(col, []).append((int(p.x), int(p.y)))
+        raster.plot_groups(surf, groups)
 
     def clear(self):
         self.particles.clear()
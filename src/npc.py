@@ -328,6 +328,14 @@ class NPC:
         eye.center = (head_rect.centerx + hs // 5, head_rect.centery - hs // 8)
         pygame.draw.rect(surf, (90, 90, 100), eye)
 
+    def bounds(self) -> pygame.Rect:
+        xs = [p.pos.x for p in self.particles]
+        ys = [p.pos.y for p in self.particles]
+        pad = int(max(self.size, self.head_size)) + 2
+        x0 = int(min(xs)) - pad
+        y0 = int(min(ys)) - pad
+        return pygame.Rect(x0, y0, int(max(xs)) + pad + 1 - x0, int(max(ys)) + pad + 1 - y0)
+
     def _nudge_particle_from_solid(self, particle: Particle, solid_query: Callable[[int, int], bool],
                                    bounds: tuple[int, int] | None) -> None:
         """Minimal translation to push a particle out of any solid tile it overlaps."""
@@ -0,0 +1,48 @@
+from typing import Dict, Iterable, Set, Tuple
+
+METAL = 1
+BLOCKS = 2
+
+class ObstacleGrid:
+
+    def __init__(self, width: int, height: int):
+        self.width = int(width)
+        self.height = int(height)
+        self.data = bytearray(self.width * self.height)
+        self._layers: Dict[int, Set[Tuple[int, int]]] = {}
+
+    def set_layer(self, bit: int, cells: Iterable[Tuple[int, int]]):
+        data = self.data
+        w = self.width
+        h = self.height
+        keep = 0xFF & ~bit
+        for x, y in self._layers.get(bit, ()):
+            if 0 <= x < w and 0 <= y < h:
+                data[y * w + x] &= keep
+        if not isinstance(cells, set):
+            cells = set(cells)
+        for x, y in cells:
+            if 0 <= x < w and 0 <= y < h:
+                data[y * w + x] |= bit
+        self._layers[bit] = cells
+
+    def is_solid(self, x: int, y: int) -> bool:
+        x = int(x)
+        y = int(y)
+        w = self.width
+        if 0 <= x < w and 0 <= y < self.height:
+            return self.data[y * w + x] != 0
+        return False
+
+    def resize(self, width: int, height: int):
+        self.width = int(width)
+        self.height = int(height)
+        self.data = bytearray(self.width * self.height)
+        layers = self._layers
+        self._layers = {}
+        for bit, cells in layers.items():
+            self.set_layer(bit, cells)
+
+    def clear(self):
+        self.data = bytearray(self.width * self.height)
+        self._layers.clear()
@@ -1,6 +1,8 @@
 import math
 import pygame
 from typing import List, Tuple, Dict, Optional
+from src import brush, raster, soa
+from src.sweep import live
 
 class OilParticle:
 
@@ -11,6 +13,7 @@ class OilParticle:
         self.vy = 0.0
         self.burning: bool = False
         self.burn_timer: int = 0
+        self.dead = False
 
     def ignite(self, duration: int=240):
         if not self.burning:
@@ -40,6 +43,7 @@ class OilParticle:
             self.vx = -4.0
 
 class OilSystem:
+    plots_point_groups = True
 
     def __init__(self, width: int, height: int):
         self.width = width
@@ -63,14 +67,13 @@ class OilSystem:
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(OilParticle(x, y))
 
+    def add_particles(self, points):
+        w = self.width
+        h = self.height
+        self.particles.extend([OilParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
     def add_particle_cluster(self, center_x: int, center_y: int, radius: int=5):
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                if dx * dx + dy * dy <= radius * radius:
-                    x = center_x + dx
-                    y = center_y + dy
-                    if 0 <= x < self.width and 0 <= y < self.height:
-                        self.add_particle(x, y)
+        self.add_particles(brush.fill(center_x, center_y, radius))
 
     def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
         return (int(x // self.cell_size), int(y // self.cell_size))
@@ -171,11 +174,7 @@ class OilSystem:
         self.particles = [p for p in self.particles if not p.burning or p.burn_timer > 0]
 
     def draw(self, surface: pygame.Surface):
-        w, h = (self.width, self.height)
-        for p in self.particles:
-            if 0 <= p.x < w and 0 <= p.y < h:
-                col = self.color_burning if p.burning else self.color_normal
-                surface.set_at((int(p.x), int(p.y)), col)
+        raster.plot_groups(surface, self.get_point_groups())
 
     def get_point_groups(self) -> Dict[Tuple[int, int, int], List[Tuple[int, int]]]:
         groups: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {self.color_normal: [], self.color_burning: []}
@@ -190,13 +189,25 @@ class OilSystem:
                     groups[self.color_normal].append((x, y))
         return {c: pts for c, pts in groups.items() if pts}
 
+    def get_point_arrays(self):
+        ps = self.particles
+        if not soa.NUMPY_AVAILABLE or len(ps) < soa.MIN_BATCH:
+            return None
+        xs, ys, keep = soa.pixels(ps, self.width, self.height, truncate_first=True)
+        burning = soa.flags(ps, 'burning')
+        groups = {}
+        for color, mask in ((self.color_normal, keep & ~burning), (self.color_burning, keep & burning)):
+            if mask.any():
+                groups[color] = (xs[mask], ys[mask])
+        return groups
+
     def get_particle_count(self) -> int:
         return len(self.particles)
 
     def sweep_dead(self):
         if not self.particles:
             return
-        self.particles = [p for p in self.particles if not getattr(p, 'dead', False)]
+        self.particles = live(self.particles)
 
     def clear(self):
         self.particles.clear()
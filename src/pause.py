@@ -40,6 +40,7 @@ class PauseMenu:
         self.accent_fill = (55, 70, 95)
         self.accent_outline = (100, 130, 170)
         self._text_cache = {}
+        self._text_renderer = None
         self.plugin_panel = PluginMenuPanel()
         self.back_label = 'Back'
 
@@ -135,17 +136,22 @@ class PauseMenu:
                 uy = y + surf.get_height() + 6
                 pygame.draw.rect(screen, self.accent, (ux, uy, under_w, under_h))
 
-    def _get_text_tex(self, renderer, text: str, color: Tuple[int, int, int]):
-        key = (text, color)
+    def _get_text_tex(self, renderer, text: str, color: Tuple[int, int, int], font: Optional[pygame.font.Font]=None):
         if Texture is None:
             raise RuntimeError('SDL2 Texture is unavailable')
-        if key in self._text_cache:
-            surf = self.item_font.render(text, True, color)
-            return (self._text_cache[key], surf)
-        surf = self.item_font.render(text, True, color)
-        tex = Texture.from_surface(renderer, surf)
-        self._text_cache[key] = tex
-        return (tex, surf)
+        if font is None:
+            font = self.item_font
+        if self._text_renderer is not renderer:
+            self._text_cache.clear()
+            self._text_renderer = renderer
+        key = (id(font), text, color)
+        entry = self._text_cache.get(key)
+        if entry is None:
+            if len(self._text_cache) >= 256:
+                self._text_cache.clear()
+            surf = font.render(text, True, color)
+            entry = self._text_cache[key] = (Texture.from_surface(renderer, surf), surf)
+        return entry
 
     def draw_gpu(self, renderer, left_margin: int=64) -> None:
         try:
@@ -157,9 +163,8 @@ class PauseMenu:
             self.plugin_panel.draw_gpu(renderer)
             return
         title = 'paused'
-        title_surf = self.title_font.render(title, True, (220, 220, 220))
-        title_tex = Texture.from_surface(renderer, title_surf) if Texture is not None else None
-        if title_tex is not None and sdl2rect is not None:
+        if Texture is not None and sdl2rect is not None:
+            title_tex, title_surf = self._get_text_tex(renderer, title, (220, 220, 220), self.title_font)
             renderer.copy(title_tex, dstrect=sdl2rect.Rect(left_margin, 40, title_surf.get_width(), title_surf.get_height()))
         spacing = self.item_font.get_height() + 12
         items_h = len(self.options) * spacing
@@ -168,16 +173,15 @@ class PauseMenu:
         for idx, text in enumerate(self.options):
             is_sel = idx == self.selected
             color = (235, 235, 235) if is_sel else (200, 200, 200)
-            surf = self.item_font.render(text, True, color)
-            tex = Texture.from_surface(renderer, surf) if Texture is not None else None
-            x = left_margin
-            y = start_y + idx * spacing
-            if tex is not None and sdl2rect is not None:
+            if Texture is not None and sdl2rect is not None:
+                tex, surf = self._get_text_tex(renderer, text, color)
+                x = left_margin
+                y = start_y + idx * spacing
                 renderer.copy(tex, dstrect=sdl2rect.Rect(x, y, surf.get_width(), surf.get_height()))
-            if is_sel and sdl2rect is not None:
-                under_w = int(surf.get_width() * pulse)
-                under_h = 3
-                ux = x
-                uy = y + surf.get_height() + 6
-                renderer.draw_color = (self.accent[0], self.accent[1], self.accent[2], 255)
-                renderer.fill_rect(sdl2rect.Rect(ux, uy, under_w, under_h))
+                if is_sel:
+                    under_w = int(surf.get_width() * pulse)
+                    under_h = 3
+                    ux = x
+                    uy = y + surf.get_height() + 6
+                    renderer.draw_color = (self.accent[0], self.accent[1], self.accent[2], 255)
+                    renderer.fill_rect(sdl2rect.Rect(ux, uy, under_w, under_h))
@@ -14,6 +14,7 @@ except Exception:
     sdl2rect = None
 from .pluginmain import get_service
 from .pluginmodel import PluginInfo
+from src.shapes import draw_rounded
 
 @dataclass
 class _Layout:
@@ -36,6 +37,7 @@ class PluginMenuPanel:
         self.scroll = 0
         self.accent = (160, 180, 210)
         self._text_cache = {}
+        self._text_renderer = None
         self.back_label = 'Back'
         self._back_rect = None
         self._hover_back = False
@@ -159,8 +161,8 @@ class PluginMenuPanel:
         plugins = self._plugins()
         title_surf = self.title_font.render('plugins', True, (230, 230, 230))
         screen.blit(title_surf, (layout.left_margin, 36))
-        pygame.draw.rect(screen, (32, 32, 32), (layout.list_x - 8, layout.list_y - 8, layout.list_w + 16, layout.list_h + 16), border_radius=6)
-        pygame.draw.rect(screen, (30, 30, 30), (layout.detail_x - 8, layout.list_y - 8, layout.detail_w + 16, layout.list_h + 16), border_radius=6)
+        draw_rounded(screen, (32, 32, 32), (layout.list_x - 8, layout.list_y - 8, layout.list_w + 16, layout.list_h + 16), 6)
+        draw_rounded(screen, (30, 30, 30), (layout.detail_x - 8, layout.list_y - 8, layout.detail_w + 16, layout.list_h + 16), 6)
         row_h = layout.row_h
         y0 = layout.list_y - self.scroll
         for i, p in enumerate(plugins):
@@ -181,16 +183,16 @@ class PluginMenuPanel:
         if sel:
             y = layout.list_y
             btn = pygame.Rect(layout.detail_x, y, 120, 36)
-            pygame.draw.rect(screen, (60, 60, 60), btn, border_radius=4)
+            draw_rounded(screen, (60, 60, 60), btn, 4)
             btxt = 'Disable' if sel.enabled else 'Enable'
             bsurf = self.small_font.render(btxt, True, (230, 230, 230))
             screen.blit(bsurf, (btn.x + 12, btn.y + 8))
             btn2 = pygame.Rect(layout.detail_x + 130, y, 180, 36)
-            pygame.draw.rect(screen, (60, 60, 60), btn2, border_radius=4)
+            draw_rounded(screen, (60, 60, 60), btn2, 4)
             b2 = self.small_font.render('Open Mods Folder', True, (230, 230, 230))
             screen.blit(b2, (btn2.x + 12, btn2.y + 8))
             btn3 = pygame.Rect(layout.detail_x + 320, y, 160, 36)
-            pygame.draw.rect(screen, (60, 60, 60), btn3, border_radius=4)
+            draw_rounded(screen, (60, 60, 60), btn3, 4)
             b3 = self.small_font.render('Reload Browser', True, (230, 230, 230))
             screen.blit(b3, (btn3.x + 12, btn3.y + 8))
             y += 52
@@ -229,6 +231,23 @@ class PluginMenuPanel:
         pygame.draw.rect(screen, self.accent, (ux, uy, under_w, under_h))
         self._back_rect = rect
 
+    def _get_text_tex(self, renderer, text: str, color: Tuple[int, int, int], font: Optional[pygame.font.Font]=None):
+        if Texture is None:
+            raise RuntimeError('SDL2 Texture is unavailable')
+        if font is None:
+            font = self.item_font
+        if self._text_renderer is not renderer:
+            self._text_cache.clear()
+            self._text_renderer = renderer
+        key = (id(font), text, color)
+        entry = self._text_cache.get(key)
+        if entry is None:
+            if len(self._text_cache) >= 256:
+                self._text_cache.clear()
+            surf = font.render(text, True, color)
+            entry = self._text_cache[key] = (Texture.from_surface(renderer, surf), surf)
+        return entry
+
     def draw_gpu(self, renderer, left_margin: int=64) -> None:
         if Texture is None or sdl2rect is None:
             return
@@ -237,8 +256,7 @@ class PluginMenuPanel:
         except Exception:
             out_w, out_h = (1200, 800)
         layout = self._compute_layout((out_w, out_h))
-        title_surf = self.title_font.render('plugins', True, (230, 230, 230))
-        title_tex = Texture.from_surface(renderer, title_surf)
+        title_tex, title_surf = self._get_text_tex(renderer, 'plugins', (230, 230, 230), self.title_font)
         renderer.copy(title_tex, dstrect=sdl2rect.Rect(layout.left_margin, 36, title_surf.get_width(), title_surf.get_height()))
         renderer.draw_color = (32, 32, 32, 255)
         renderer.fill_rect(sdl2rect.Rect(layout.list_x - 8, layout.list_y - 8, layout.list_w + 16, layout.list_h + 16))
@@ -256,39 +274,32 @@ class PluginMenuPanel:
             is_sel = i == self.selected_index
             color = (235, 235, 235) if is_sel else (200, 200, 200)
             name = f'{p.name}'
-            surf = self.item_font.render(name, True, color)
-            tex = Texture.from_surface(renderer, surf)
+            tex, surf = self._get_text_tex(renderer, name, color)
             renderer.copy(tex, dstrect=sdl2rect.Rect(layout.list_x + 10, ry + 6, surf.get_width(), surf.get_height()))
             badge = 'ACTIVE' if p.enabled else 'INACTIVE'
             bcolor = (100, 220, 100) if p.enabled else (160, 160, 160)
-            bs = self.small_font.render(badge, True, bcolor)
-            btex = Texture.from_surface(renderer, bs)
+            btex, bs = self._get_text_tex(renderer, badge, bcolor, self.small_font)
             renderer.copy(btex, dstrect=sdl2rect.Rect(layout.list_x + layout.list_w - 120, ry + 8, bs.get_width(), bs.get_height()))
         sel = self._selected(plugins)
         if sel:
             y = layout.list_y
             renderer.draw_color = (60, 60, 60, 255)
             renderer.fill_rect(sdl2rect.Rect(layout.detail_x, y, 120, 36))
-            bt = self.small_font.render('Disable' if sel.enabled else 'Enable', True, (230, 230, 230))
-            bttex = Texture.from_surface(renderer, bt)
+            bttex, bt = self._get_text_tex(renderer, 'Disable' if sel.enabled else 'Enable', (230, 230, 230), self.small_font)
             renderer.copy(bttex, dstrect=sdl2rect.Rect(layout.detail_x + 12, y + 8, bt.get_width(), bt.get_height()))
             renderer.draw_color = (60, 60, 60, 255)
             renderer.fill_rect(sdl2rect.Rect(layout.detail_x + 130, y, 180, 36))
-            b2 = self.small_font.render('Open Mods Folder', True, (230, 230, 230))
-            b2t = Texture.from_surface(renderer, b2)
+            b2t, b2 = self._get_text_tex(renderer, 'Open Mods Folder', (230, 230, 230), self.small_font)
             renderer.copy(b2t, dstrect=sdl2rect.Rect(layout.detail_x + 142, y + 8, b2.get_width(), b2.get_height()))
             renderer.draw_color = (60, 60, 60, 255)
             renderer.fill_rect(sdl2rect.Rect(layout.detail_x + 320, y, 160, 36))
-            b3 = self.small_font.render('Reload Browser', True, (230, 230, 230))
-            b3t = Texture.from_surface(renderer, b3)
+            b3t, b3 = self._get_text_tex(renderer, 'Reload Browser', (230, 230, 230), self.small_font)
             renderer.copy(b3t, dstrect=sdl2rect.Rect(layout.detail_x + 332, y + 8, b3.get_width(), b3.get_height()))
             y += 52
-            name_surf = self.item_font.render(f'{sel.name} v{sel.version}', True, (235, 235, 235))
-            name_tex = Texture.from_surface(renderer, name_surf)
+            name_tex, name_surf = self._get_text_tex(renderer, f'{sel.name} v{sel.version}', (235, 235, 235))
             renderer.copy(name_tex, dstrect=sdl2rect.Rect(layout.detail_x, y, name_surf.get_width(), name_surf.get_height()))
             y += name_surf.get_height() + 6
-            auth_surf = self.small_font.render(f'by {sel.author}', True, (180, 180, 180))
-            auth_tex = Texture.from_surface(renderer, auth_surf)
+            auth_tex, auth_surf = self._get_text_tex(renderer, f'by {sel.author}', (180, 180, 180), self.small_font)
             renderer.copy(auth_tex, dstrect=sdl2rect.Rect(layout.detail_x, y, auth_surf.get_width(), auth_surf.get_height()))
             y += auth_surf.get_height() + 12
             desc = sel.description or 'No description provided.'
@@ -300,15 +311,13 @@ class PluginMenuPanel:
                     line = (line + ' ' + words.pop(0)).strip()
                 if not line:
                     line = words.pop(0)
-                ds = self.small_font.render(line, True, (200, 200, 200))
-                dtex = Texture.from_surface(renderer, ds)
+                dtex, ds = self._get_text_tex(renderer, line, (200, 200, 200), self.small_font)
                 renderer.copy(dtex, dstrect=sdl2rect.Rect(layout.detail_x, y, ds.get_width(), ds.get_height()))
                 y += ds.get_height() + 4
                 line = ''
-        label_surf = self.item_font.render(self.back_label, True, (235, 235, 235))
+        tex, label_surf = self._get_text_tex(renderer, self.back_label, (235, 235, 235))
         bx = layout.left_margin
         by = out_h - (label_surf.get_height() + 28)
-        tex = Texture.from_surface(renderer, label_surf)
         renderer.copy(tex, dstrect=sdl2rect.Rect(bx, by, label_surf.get_width(), label_surf.get_height()))
         renderer.draw_color = (self.accent[0], self.accent[1], self.accent[2], 255)
         renderer.fill_rect(sdl2rect.Rect(bx, by + label_surf.get_height() + 6, label_surf.get_width(), 3))
@@ -0,0 +1,101 @@
+import pygame
+from typing import Dict, List, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# below this many points a set_at loop is cheaper than locking the surface
+MIN_BATCH = 64
+
+# A system with a truthy ``plots_point_groups`` promises that its draw() paints
+# nothing but get_point_groups(), each point as a ``point_size`` square (default
+# 1; 2 is the 2x2 block of draw.circle(..., 1)). The game then skips draw() and
+# plots runs of such systems itself via plot_layers.
+
+Color = Tuple[int, int, int]
+PointGroups = Union[Tuple[Color, List[Tuple[int, int]]], Dict[Color, List[Tuple[int, int]]]]
+
+def plot_points(surf: pygame.Surface, color: Color, pts: Sequence[Tuple[int, int]]):
+    if not pts:
+        return
+    if NUMPY_AVAILABLE and len(pts) >= MIN_BATCH:
+        try:
+            arr = np.asarray(pts, dtype=np.intp).reshape(-1, 2)
+            w, h = surf.get_size()
+            xs = arr[:, 0]
+            ys = arr[:, 1]
+            inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+            pix = pygame.surfarray.pixels2d(surf)
+            try:
+                pix[xs[inside], ys[inside]] = surf.map_rgb(color)
+            finally:
+                del pix
+            return
+        except Exception:
+            pass
+    # reactions can leave particles at float coordinates, which set_at rejects
+    set_at = surf.set_at
+    for x, y in pts:
+        set_at((int(x), int(y)), color)
+
+def plot_groups(surf: pygame.Surface, groups: PointGroups):
+    if not groups:
+        return
+    if hasattr(groups, 'items'):
+        for color, pts in groups.items():
+            plot_points(surf, color, pts)
+    else:
+        color, pts = groups
+        plot_points(surf, color, pts)
+
+def plot_layers(surf: pygame.Surface, layers: Sequence[Tuple[PointGroups, int]]):
+    # several systems' (groups, point size) in draw order under a single surface
+    # lock; a size-2 point covers the same 2x2 block as draw.circle(..., 1)
+    if not NUMPY_AVAILABLE:
+        for groups, size in layers:
+            if size > 1:
+                _plot_squares(surf, groups, size)
+            else:
+                plot_groups(surf, groups)
+        return
+    flat = []
+    for groups, size in layers:
+        if not groups:
+            continue
+        if hasattr(groups, 'items'):
+            flat.extend((color, pts, size) for color, pts in groups.items())
+        else:
+            flat.append((groups[0], groups[1], size))
+    flat = [entry for entry in flat if len(entry[1])]
+    if not flat:
+        return
+    w, h = surf.get_size()
+    pix = pygame.surfarray.pixels2d(surf)
+    try:
+        for color, pts, size in flat:
+            if type(pts) is tuple:
+                # a system's get_point_arrays: (xs, ys) index arrays
+                xs, ys = pts
+            else:
+                arr = np.asarray(pts, dtype=np.intp).reshape(-1, 2)
+                xs = arr[:, 0]
+                ys = arr[:, 1]
+            if size > 1:
+                offs = np.arange(1 - size, 1)
+                xs = (xs[:, None, None] + offs[None, None, :]).repeat(size, 1).ravel()
+                ys = (ys[:, None, None] + offs[None, :, None]).repeat(size, 2).ravel()
+            inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+            pix[xs[inside], ys[inside]] = surf.map_rgb(color)
+    finally:
+        del pix
+
+def _plot_squares(surf: pygame.Surface, groups: PointGroups, size: int):
+    items = groups.items() if hasattr(groups, 'items') else [groups]
+    fill = surf.fill
+    for color, pts in items:
+        for x, y in pts:
+            fill(color, (x + 1 - size, y + 1 - size, size, size))
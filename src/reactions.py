@@ -35,6 +35,12 @@ def _limit(lst, n):
     return lst if len(lst) <= n else lst[:n]
 
 
+def _occupied(system, getter):
+    # an empty grid can't be anyone's neighbour, so its getter is dropped and
+    # every pass gated on it is skipped outright
+    return getter if getter is not None and getattr(system, 'grid', None) else None
+
+
 def apply(game: Any) -> None:
 
     sand = getattr(game, 'sand_system', None)
@@ -99,6 +105,9 @@ def apply(game: Any) -> None:
             blood._rebuild_grid()
         except Exception:
             pass
+    invalidate = getattr(game, '_invalidate_neighbors', None)
+    if invalidate:
+        invalidate()
 
     get_sand = getattr(game, '_get_nearby_sand', None)
     get_water = getattr(game, '_get_nearby_water', None)
@@ -111,17 +120,28 @@ def apply(game: Any) -> None:
     get_ruby = getattr(game, '_get_nearby_ruby', None)
     get_bluelava = getattr(game, '_get_nearby_bluelava', None)
     get_diamond = getattr(game, '_get_nearby_diamond', None)
+    get_sand = _occupied(sand, get_sand)
+    get_water = _occupied(water, get_water)
+    get_lava = _occupied(lava, get_lava)
+    get_toxic = _occupied(toxic, get_toxic)
+    get_oil = _occupied(oil, get_oil)
+    get_dirt = _occupied(dirt, get_dirt)
+    get_milk = _occupied(milk, get_milk)
+    get_blood = _occupied(blood, get_blood)
+    get_ruby = _occupied(ruby, get_ruby)
+    get_bluelava = _occupied(blue_lava, get_bluelava)
+    get_diamond = _occupied(diamond, get_diamond)
 
     MAX_N = 12
 
-    sand_to_kill = set()
-    water_to_kill = set()
-    lava_to_kill = set()
-    toxic_to_kill = set()
+    sand_to_kill = []
+    water_to_kill = []
+    lava_to_kill = []
+    toxic_to_kill = []
     extinguish_oil = []
-    dirt_to_kill = set()
-    milk_to_kill = set()
-    blood_to_kill = set()
+    dirt_to_kill = []
+    milk_to_kill = []
+    blood_to_kill = []
 
                                
     for lp in list(lava.particles):
@@ -134,9 +154,9 @@ def apply(game: Any) -> None:
                         metal.add_particle(w.x, w.y)
                     except Exception:
                         pass
-                    water_to_kill.add(id(w))
+                    water_to_kill.append(w)
                 if len(waters) >= 3:
-                    lava_to_kill.add(id(lp))
+                    lava_to_kill.append(lp)
         if get_sand:
             sands = get_sand(lp.x, lp.y, radius=2)
             sands = _limit(sands, MAX_N)
@@ -146,7 +166,7 @@ def apply(game: Any) -> None:
                         metal.add_particle(s.x, s.y)
                     except Exception:
                         pass
-                    sand_to_kill.add(id(s))
+                    sand_to_kill.append(s)
         if dirt and get_dirt:
             dirts = get_dirt(lp.x, lp.y, radius=2)
             dirts = _limit(dirts, MAX_N)
@@ -156,17 +176,17 @@ def apply(game: Any) -> None:
                         metal.add_particle(d.x, d.y)
                     except Exception:
                         pass
-                    dirt_to_kill.add(id(d))
+                    dirt_to_kill.append(d)
                 if len(dirts) >= 3:
-                    lava_to_kill.add(id(lp))
+                    lava_to_kill.append(lp)
         if milk and get_milk:
             milks = get_milk(lp.x, lp.y, radius=2)
             milks = _limit(milks, MAX_N)
             if milks:
                 for m in milks:
-                    milk_to_kill.add(id(m))
+                    milk_to_kill.append(m)
                 if len(milks) >= 2:
-                    lava_to_kill.add(id(lp))
+                    lava_to_kill.append(lp)
         if oil and get_oil:
             oils = get_oil(lp.x, lp.y, radius=2)
             oils = _limit(oils, MAX_N)
@@ -184,7 +204,7 @@ def apply(game: Any) -> None:
                         metal.add_particle(tp.x, tp.y)
                     except Exception:
                         pass
-                    toxic_to_kill.add(id(tp))
+                    toxic_to_kill.append(tp)
                                       
     if blue_lava:
         for bp in list(blue_lava.particles):
@@ -198,10 +218,7 @@ def apply(game: Any) -> None:
                             metal.add_particle(w.x, w.y)
                         except Exception:
                             pass
-                        water_to_kill.add(id(w))
-                                                                            
-                    if len(waters) >= 2 and random.random() < 0.4:
-                        lava_to_kill.add(id(bp))
+                        water_to_kill.append(w)
                                                                                                    
             if get_sand:
                 sands = get_sand(bp.x, bp.y, radius=2)
@@ -212,7 +229,7 @@ def apply(game: Any) -> None:
                         setattr(metal.particles[-1], 'blue_glass', True)
                     except Exception:
                         pass
-                    sand_to_kill.add(id(s))
+                    sand_to_kill.append(s)
                                                      
             if dirt and get_dirt:
                 dirts = get_dirt(bp.x, bp.y, radius=2)
@@ -222,7 +239,7 @@ def apply(game: Any) -> None:
                         metal.add_particle(d.x, d.y)
                     except Exception:
                         pass
-                    dirt_to_kill.add(id(d))
+                    dirt_to_kill.append(d)
                                                                                         
             m_near = []
             try:
@@ -245,13 +262,13 @@ def apply(game: Any) -> None:
                         setattr(metal.particles[-1], 'radioactive', True)
                     except Exception:
                         pass
-                    toxic_to_kill.add(id(tp))
+                    toxic_to_kill.append(tp)
                                   
             if milk and get_milk:
                 milks = get_milk(bp.x, bp.y, radius=2)
                 milks = _limit(milks, MAX_N)
                 for m in milks:
-                    milk_to_kill.add(id(m))
+                    milk_to_kill.append(m)
                                          
             if blood and get_blood:
                 bloods = get_blood(bp.x, bp.y, radius=2)
@@ -261,15 +278,14 @@ def apply(game: Any) -> None:
                         setattr(b, 'dead', True)
                     except Exception:
                         pass
-                    blood_to_kill.add(id(b))
+                    blood_to_kill.append(b)
                                                                         
             if lava and random.random() < 0.02:
                                                
                 near_lava = get_lava(bp.x, bp.y, radius=2) if get_lava else []
                 if near_lava:
-                    lava_to_kill.add(id(bp))
                     for lv in near_lava[:3]:
-                        lava_to_kill.add(id(lv))
+                        lava_to_kill.append(lv)
                         try:
                             metal.add_particle(lv.x, lv.y)
                         except Exception:
@@ -283,9 +299,9 @@ def apply(game: Any) -> None:
                         metal.add_particle(w.x, w.y)
                     except Exception:
                         pass
-                    water_to_kill.add(id(w))
+                    water_to_kill.append(w)
                 if len(waters) >= 3:
-                    lava_to_kill.add(id(lp))
+                    lava_to_kill.append(lp)
         if get_sand:
             sands = get_sand(lp.x, lp.y, radius=2)
             sands = _limit(sands, MAX_N)
@@ -295,7 +311,7 @@ def apply(game: Any) -> None:
                         metal.add_particle(s.x, s.y)
                     except Exception:
                         pass
-                    sand_to_kill.add(id(s))
+                    sand_to_kill.append(s)
         if dirt and get_dirt:
             dirts = get_dirt(lp.x, lp.y, radius=2)
             dirts = _limit(dirts, MAX_N)
@@ -305,17 +321,17 @@ def apply(game: Any) -> None:
                         metal.add_particle(d.x, d.y)
                     except Exception:
                         pass
-                    dirt_to_kill.add(id(d))
+                    dirt_to_kill.append(d)
                 if len(dirts) >= 3:
-                    lava_to_kill.add(id(lp))
+                    lava_to_kill.append(lp)
         if milk and get_milk:
             milks = get_milk(lp.x, lp.y, radius=2)
             milks = _limit(milks, MAX_N)
             if milks:
                 for m in milks:
-                    milk_to_kill.add(id(m))
+                    milk_to_kill.append(m)
                 if len(milks) >= 2:
-                    lava_to_kill.add(id(lp))
+                    lava_to_kill.append(lp)
         if oil and get_oil:
             oils = get_oil(lp.x, lp.y, radius=2)
             oils = _limit(oils, MAX_N)
@@ -333,7 +349,7 @@ def apply(game: Any) -> None:
                         metal.add_particle(tp.x, tp.y)
                     except Exception:
                         pass
-                    toxic_to_kill.add(id(tp))
+                    toxic_to_kill.append(tp)
 
                        
     if ruby:
@@ -396,7 +412,7 @@ def apply(game: Any) -> None:
                     except Exception:
                         pass
                     if random.random() < 0.04:
-                        toxic_to_kill.add(id(tp))
+                        toxic_to_kill.append(tp)
                                                 
             if lava and get_lava:
                 lavas = _limit(get_lava(rp.x, rp.y, radius=1), MAX_N)
@@ -454,7 +470,7 @@ def apply(game: Any) -> None:
                     water.add_particle(tp.x, tp.y)
                 except Exception:
                     pass
-                toxic_to_kill.add(id(tp))
+                toxic_to_kill.append(tp)
 
     if get_sand and water:
         for wp in _limit(list(water.particles), 3000):
@@ -496,7 +512,7 @@ def apply(game: Any) -> None:
                 except Exception:
                     pass
                 if random.random() < 0.08:
-                    milk_to_kill.add(id(mp))
+                    milk_to_kill.append(mp)
     if milk and sand and get_sand:
         for mp in _limit(list(milk.particles), 1500):
             sands = get_sand(mp.x, mp.y, radius=1)
@@ -506,7 +522,7 @@ def apply(game: Any) -> None:
                 except Exception:
                     pass
                 if random.random() < 0.04:
-                    milk_to_kill.add(id(mp))
+                    milk_to_kill.append(mp)
     if milk and water and get_water:
         for mp in _limit(list(milk.particles), 1500):
             waters = get_water(mp.x, mp.y, radius=1)
@@ -618,45 +634,39 @@ def apply(game: Any) -> None:
                             sp.meh = True
                             if meh_img is not None:
                                 sp.image = meh_img
+                                sand.has_images = True
                         except Exception:
                             pass
             except Exception:
                 pass
 
     if sand_to_kill:
-        for p in sand.particles:
-            if id(p) in sand_to_kill:
-                setattr(p, 'dead', True)
+        for p in sand_to_kill:
+            setattr(p, 'dead', True)
         sand.sweep_dead()
     if water_to_kill:
-        for p in water.particles:
-            if id(p) in water_to_kill:
-                setattr(p, 'dead', True)
+        for p in water_to_kill:
+            setattr(p, 'dead', True)
         water.sweep_dead()
     if lava_to_kill:
-        for p in lava.particles:
-            if id(p) in lava_to_kill:
-                setattr(p, 'dead', True)
+        for p in lava_to_kill:
+            setattr(p, 'dead', True)
         lava.sweep_dead()
     if dirt and dirt_to_kill:
-        for p in dirt.particles:
-            if id(p) in dirt_to_kill:
-                setattr(p, 'dead', True)
+        for p in dirt_to_kill:
+            setattr(p, 'dead', True)
         dirt.sweep_dead()
     if toxic and toxic_to_kill:
-        for p in toxic.particles:
-            if id(p) in toxic_to_kill:
-                setattr(p, 'dead', True)
+        for p in toxic_to_kill:
+            setattr(p, 'dead', True)
         toxic.sweep_dead()
     if milk and milk_to_kill:
-        for p in milk.particles:
-            if id(p) in milk_to_kill:
-                setattr(p, 'dead', True)
+        for p in milk_to_kill:
+            setattr(p, 'dead', True)
         milk.sweep_dead()
     if blood and blood_to_kill:
-        for p in blood.particles:
-            if id(p) in blood_to_kill:
-                setattr(p, 'dead', True)
+        for p in blood_to_kill:
+            setattr(p, 'dead', True)
         try:
             blood.sweep_dead()
         except Exception:
@@ -665,6 +675,9 @@ def apply(game: Any) -> None:
                                          
     if _registered_reactions:
         for _, fn in list(_registered_reactions):
+            # plugins may rebuild grids, so the frame's neighbour cache can't span them
+            if invalidate:
+                invalidate()
             try:
                 fn(game)
             except Exception:
@@ -682,3 +695,5 @@ def apply(game: Any) -> None:
                     sys.sweep_dead()
             except Exception:
                 continue
+        if invalidate:
+            invalidate()
@@ -2,6 +2,7 @@ import math
 import random
 import pygame
 from typing import List, Tuple, Dict
+from src import brush
 
 class RubyParticle:
     __slots__ = ("x","y","vx","vy","age","charged","overcharged","unstable","cursed","dulled","corroded","heat")
@@ -57,13 +58,13 @@ class RubySystem:
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(RubyParticle(x, y))
 
+    def add_particles(self, points):
+        w = self.width
+        h = self.height
+        self.particles.extend([RubyParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
     def add_particle_cluster(self, cx: int, cy: int, brush_size: int):
-        r = max(1, int(brush_size))
-        for _ in range(r * r):
-            ox = random.uniform(-r, r)
-            oy = random.uniform(-r, r)
-            if ox*ox + oy*oy <= r*r:
-                self.add_particle(cx + ox, cy + oy)
+        self.add_particles(brush.scatter(cx, cy, brush_size))
 
     def clear(self):
         self.particles.clear()
@@ -1,6 +1,8 @@
 import math
 import pygame
 from typing import List, Tuple, Dict
+from src import _kernels, brush, soa
+from src.sweep import live
 
 class SandParticle:
 
@@ -13,6 +15,7 @@ class SandParticle:
         self.color = (194, 178, 128)
         self.settled = False
         self.wet = False
+        self.dead = False
 
     def apply_gravity(self, gravity: float):
         self.vy += gravity
@@ -31,11 +34,14 @@ class SandParticle:
             self.vy = 10
 
 class SandSystem:
+    point_size = 2
 
     def __init__(self, width: int, height: int):
         self.width = width
         self.height = height
         self.particles: List[SandParticle] = []
+        # set once any particle is given an image; those need draw()'s blits
+        self.has_images = False
         self.gravity = 0.2
         self.friction = 0.05
         self.cell_size = 3
@@ -44,6 +50,7 @@ class SandSystem:
         self.max_neighbors: int = 12
         self.skip_mod: int = 1
         self._is_solid = None
+        self._pending = None
 
     def set_obstacle_query(self, fn):
         self._is_solid = fn
@@ -52,14 +59,13 @@ class SandSystem:
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(SandParticle(x, y))
 
+    def add_particles(self, points):
+        w = self.width
+        h = self.height
+        self.particles.extend([SandParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
     def add_particle_cluster(self, center_x: float, center_y: float, radius: int=5):
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                if dx * dx + dy * dy <= radius * radius:
-                    x = center_x + dx
-                    y = center_y + dy
-                    if 0 <= x < self.width and 0 <= y < self.height:
-                        self.add_particle(x, y)
+        self.add_particles(brush.fill(center_x, center_y, radius))
 
     def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
         return (int(x // self.cell_size), int(y // self.cell_size))
@@ -112,9 +118,11 @@ class SandSystem:
                         break
 
     def _handle_boundaries(self):
+        w = self.width
+        h = self.height
         for particle in self.particles:
-            if particle.y + 1 >= self.height:
-                particle.y = self.height - 1
+            if particle.y + 1 >= h:
+                particle.y = h - 1
                 particle.vy = 0
                 particle.settled = True
             if particle.y < 0:
@@ -123,22 +131,62 @@ class SandSystem:
             if particle.x < 0:
                 particle.x = 0
                 particle.vx *= -0.5
-            if particle.x >= self.width:
-                particle.x = self.width - 1
+            if particle.x >= w:
+                particle.x = w - 1
                 particle.vx *= -0.5
 
     def update(self, frame_index: int=0):
+        self.begin_update(frame_index)
+        self.finish_update()
+
+    def begin_update(self, frame_index: int=0):
+        gravity = self.gravity
+        damp = 1 - self.friction
+        is_solid = self._is_solid
         for particle in self.particles:
-            particle.update(self.gravity, self.friction)
-            if self._is_solid and self._is_solid(int(particle.x), int(particle.y)):
-                particle.x -= particle.vx
-                particle.y -= particle.vy
-                particle.vx *= -0.1
-                particle.vy = 0.0
+            vx = particle.vx * damp
+            if -0.01 < vx < 0.01:
+                vx = 0
+            vy = particle.vy + gravity
+            x = particle.x + vx
+            y = particle.y + vy
+            if vy > 10:
+                vy = 10
+            if is_solid is not None and is_solid(int(x), int(y)):
+                x -= vx
+                y -= vy
+                vx *= -0.1
+                vy = 0.0
                 particle.settled = True
-        self._handle_collisions(frame_index)
+            particle.x = x
+            particle.y = y
+            particle.vx = vx
+            particle.vy = vy
+        self._start_collisions(frame_index)
+
+    def finish_update(self):
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            fut, particles, arrays = pending
+            fut.result()
+            _kernels.scatter(particles, *arrays)
         self._handle_boundaries()
         self.particles = [p for p in self.particles if -10 <= p.x < self.width + 10 and -10 <= p.y < self.height + 10]
+        if pending is not None:
+            # the kernel never touches the dict grid; readers of this frame's
+            # grid (NPC coupling, cursor, reactions) need the scattered positions
+            self._rebuild_grid()
+
+    def _start_collisions(self, frame_index: int=0):
+        if self.skip_mod > 1 and frame_index % self.skip_mod != 0:
+            return
+        if _kernels.NUMBA_AVAILABLE and len(self.particles) >= _kernels.MIN_BATCH:
+            arrays = _kernels.gather(self.particles)
+            fut = _kernels.submit(_kernels.sand_collide, *arrays, self.cell_size, self.neighbor_radius, self.max_neighbors, 0.1)
+            self._pending = (fut, self.particles, arrays)
+            return
+        self._handle_collisions(frame_index)
 
     def draw(self, surface: pygame.Surface):
         for particle in self.particles:
@@ -155,6 +203,10 @@ class SandSystem:
                 color = (194, 178, 128) if not particle.wet else (180, 160, 100)
                 pygame.draw.circle(surface, color, (int(particle.x), int(particle.y)), 1)
 
+    @property
+    def plots_point_groups(self) -> bool:
+        return not self.has_images
+
     def get_point_groups(self) -> Dict[Tuple[int, int, int], List[Tuple[int, int]]]:
         dry_color = (194, 178, 128)
         wet_color = (180, 160, 100)
@@ -168,13 +220,27 @@ class SandSystem:
                     groups[dry_color].append(pt)
         return {c: pts for c, pts in groups.items() if pts}
 
+    def get_point_arrays(self):
+        # get_point_groups as (xs, ys) index arrays read straight off the
+        # particles, so no per-particle tuple is built; None when too small
+        ps = self.particles
+        if not soa.NUMPY_AVAILABLE or len(ps) < soa.MIN_BATCH:
+            return None
+        xs, ys, keep = soa.pixels(ps, self.width, self.height)
+        wet = soa.flags(ps, 'wet')
+        groups = {}
+        for color, mask in (((194, 178, 128), keep & ~wet), ((180, 160, 100), keep & wet)):
+            if mask.any():
+                groups[color] = (xs[mask], ys[mask])
+        return groups
+
     def get_particle_count(self) -> int:
         return len(self.particles)
 
     def sweep_dead(self):
         if not self.particles:
             return
-        self.particles = [p for p in self.particles if not getattr(p, 'dead', False)]
+        self.particles = live(self.particles)
 
     def get_particles_at(self, x: float, y: float, radius: float=5) -> List[SandParticle]:
         result = []
@@ -188,3 +254,4 @@ class SandSystem:
     def clear(self):
         self.particles.clear()
         self.grid.clear()
+        self.has_images = False
@@ -1,6 +1,9 @@
+from functools import lru_cache
 from typing import Dict
 
 def recommend_settings(total_particles: int, fps: float, target_fps: int, gpu: bool) -> Dict:
+    # only the tier varies frame to frame; the same dicts come back for the
+    # same tier, so callers can skip re-applying unchanged settings
     if fps >= target_fps * 0.95:
         tier = 0
     elif fps >= target_fps * 0.8:
@@ -17,6 +20,11 @@ def recommend_settings(total_particles: int, fps: float, target_fps: int, gpu: b
         tier = 0
     if tier > 4:
         tier = 4
+    return _tier_settings(tier, bool(gpu))
+
+
+@lru_cache(maxsize=None)
+def _tier_settings(tier: int, gpu: bool) -> Dict:
     sand = {'neighbor_radius': 2, 'max_neighbors': 12, 'skip_mod': 1}
     water = {'neighbor_radius': 2, 'max_neighbors': 10, 'skip_mod': 1}
     if tier == 1:
@@ -0,0 +1,60 @@
+from typing import Dict, Tuple
+import pygame
+
+# rounded rects are rasterised once per colour/radius into a small template
+# and sliced out to each size, then kept for the screens that redraw the same
+# rows every frame
+_TEMPLATES: Dict[tuple, pygame.Surface] = {}
+_SHAPES: Dict[tuple, pygame.Surface] = {}
+
+
+def nine_slice(template: pygame.Surface, size: Tuple[int, int], left: int, top: int, right: int, bottom: int) -> pygame.Surface:
+    # corners are copied as drawn and the one-pixel middle row/column is
+    # stretched, so a rounded shape costs a few blits instead of a full
+    # rasterisation at every new size; MAX onto a cleared surface copies the
+    # alpha untouched
+    tw, th = template.get_size()
+    w, h = size
+    out = pygame.Surface(size, pygame.SRCALPHA)
+    cols = ((0, left, 0, left), (left, tw - left - right, left, w - left - right), (tw - right, right, w - right, right))
+    rows = ((0, top, 0, top), (top, th - top - bottom, top, h - top - bottom), (th - bottom, bottom, h - bottom, bottom))
+    for sx, sw, dx, dw in cols:
+        for sy, sh, dy, dh in rows:
+            if dw <= 0 or dh <= 0:
+                continue
+            piece = template.subsurface((sx, sy, sw, sh))
+            if (sw, sh) != (dw, dh):
+                piece = pygame.transform.scale(piece, (dw, dh))
+            out.blit(piece, (dx, dy), special_flags=pygame.BLEND_RGBA_MAX)
+    return out
+
+
+def rounded(size: Tuple[int, int], rgba: Tuple[int, int, int, int], radius: int, width: int=0) -> pygame.Surface:
+    side = 2 * radius + 1
+    if size[0] < side or size[1] < side:
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(surf, rgba, surf.get_rect(), width=width, border_radius=radius)
+        return surf
+    key = (rgba, radius, width)
+    template = _TEMPLATES.get(key)
+    if template is None:
+        template = pygame.Surface((side, side), pygame.SRCALPHA)
+        pygame.draw.rect(template, rgba, template.get_rect(), width=width, border_radius=radius)
+        _TEMPLATES[key] = template
+    return nine_slice(template, size, radius, radius, radius, radius)
+
+
+def draw_rounded(dest: pygame.Surface, color: Tuple[int, int, int], rect, radius: int, width: int=0) -> None:
+    """Blit-based stand-in for ``pygame.draw.rect(..., border_radius=radius)``
+    with an opaque colour."""
+    rect = pygame.Rect(rect)
+    if rect.w < 2 * radius + 1 or rect.h < 2 * radius + 1:
+        pygame.draw.rect(dest, color, rect, width=width, border_radius=radius)
+        return
+    key = (rect.size, tuple(color[:3]), radius, width)
+    surf = _SHAPES.get(key)
+    if surf is None:
+        if len(_SHAPES) >= 256:
+            _SHAPES.clear()
+        surf = _SHAPES[key] = rounded(rect.size, (*color[:3], 255), radius, width)
+    dest.blit(surf, rect.topleft)
@@ -0,0 +1,171 @@
+from operator import attrgetter
+from typing import List, Sequence, Tuple
+from src import _kernels
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# below this many particles the gather/write-back costs more than the ufuncs save
+MIN_BATCH = 64
+_X = attrgetter('x')
+_Y = attrgetter('y')
+_VX = attrgetter('vx')
+_VY = attrgetter('vy')
+# cells in the padded bounding box up to which neighbor_pairs uses a dense table
+_DENSE_CELLS = 1 << 21
+# stands in for the queried side's velocities when its kick is zero
+_NO_VELOCITIES = np.empty(0) if NUMPY_AVAILABLE else None
+
+
+def gather(particles: Sequence) -> tuple:
+    n = len(particles)
+    xs = np.fromiter(map(_X, particles), np.float64, n)
+    ys = np.fromiter(map(_Y, particles), np.float64, n)
+    vxs = np.fromiter(map(_VX, particles), np.float64, n)
+    vys = np.fromiter(map(_VY, particles), np.float64, n)
+    return (xs, ys, vxs, vys)
+
+
+def grid_members(system) -> Tuple[List, object, object]:
+    """The particles in ``system.grid`` cell by cell, with each one's cell.
+
+    The dict-grid lookups see the cells of the last rebuild, not the current
+    positions (boundaries, the cursor and oil lift move particles after it),
+    so the array passes index that same snapshot.
+    """
+    grid = system.grid
+    members = [p for lst in grid.values() for p in lst]
+    if not members:
+        empty = np.empty(0, np.int64)
+        return (members, empty, empty)
+    cells = np.array(list(grid.keys()), np.int64).reshape(-1, 2)
+    counts = np.fromiter(map(len, grid.values()), np.int64, len(grid))
+    return (members, np.repeat(cells[:, 0], counts), np.repeat(cells[:, 1], counts))
+
+
+def positions(particles: Sequence) -> tuple:
+    n = len(particles)
+    xs = np.fromiter(map(_X, particles), np.float64, n)
+    ys = np.fromiter(map(_Y, particles), np.float64, n)
+    return (xs, ys)
+
+
+def pixels(particles: Sequence, width: int, height: int, truncate_first: bool=False) -> tuple:
+    """Truncated pixel coords of the particles and a mask of those on the surface.
+
+    The mask follows the system's own draw test: on the float position, or on
+    the truncated one with truncate_first (which keeps -1 < x < 0 at column 0).
+    """
+    xs, ys = positions(particles)
+    ix = xs.astype(np.intp)
+    iy = ys.astype(np.intp)
+    if truncate_first:
+        keep = (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height)
+    else:
+        keep = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    return (ix, iy, keep)
+
+
+def flags(particles: Sequence, attr: str):
+    return np.fromiter(map(attrgetter(attr), particles), np.bool_, len(particles))
+
+
+def neighbor_pairs(ax, ay, bcx, bcy, cell_size: float, radius: int, max_neighbors: int) -> Tuple:
+    """Index pairs (i, j) of b-particles in the cells around each a-particle.
+
+    ``bcx``/``bcy`` are the b cells from grid_members. Mirrors the dict-grid
+    lookups: cells are visited dx-major, each cell in list order, and every a
+    keeps only its first max_neighbors candidates.
+    """
+    empty = np.empty(0, np.intp)
+    if ax.shape[0] == 0 or bcx.shape[0] == 0:
+        return (empty, empty)
+    acx = np.floor_divide(ax, cell_size).astype(np.int64)
+    acy = np.floor_divide(ay, cell_size).astype(np.int64)
+    min_x = min(acx.min(), bcx.min()) - radius
+    min_y = min(acy.min(), bcy.min()) - radius
+    span = max(acx.max(), bcx.max()) + radius - min_x + 1
+    rows = max(acy.max(), bcy.max()) + radius - min_y + 1
+    bkeys = (bcy - min_y) * span + (bcx - min_x)
+    order = np.argsort(bkeys, kind='stable')
+    akeys = (acy - min_y) * span + (acx - min_x)
+    # the padded box holds every probed cell, so while it is small a per-cell
+    # start/count table replaces two binary searches per probe
+    if span * rows <= _DENSE_CELLS:
+        counts = np.bincount(bkeys, minlength=span * rows)
+        starts = np.cumsum(counts) - counts
+    else:
+        counts = None
+        skeys = bkeys[order]
+    used = np.zeros(ax.shape[0], np.int64)
+    los: List = []
+    takes: List = []
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            k = akeys + (dy * span + dx)
+            if counts is not None:
+                lo = starts[k]
+                found = counts[k]
+            else:
+                lo = np.searchsorted(skeys, k, 'left')
+                found = np.searchsorted(skeys, k, 'right') - lo
+            take = np.minimum(found, max_neighbors - used)
+            used += take
+            los.append(lo)
+            takes.append(take)
+    # a-major, offsets in probe order within each a, so np.add.at sums every
+    # particle's kicks in the same order as the loops
+    lo = np.stack(los, axis=1).ravel()
+    take = np.stack(takes, axis=1).ravel()
+    total = int(take.sum())
+    if total == 0:
+        return (empty, empty)
+    owner = np.repeat(np.arange(ax.shape[0]), len(los))
+    ai = np.repeat(owner, take)
+    within = np.arange(total) - np.repeat(np.cumsum(take) - take, take)
+    bj = order[np.repeat(lo, take) + within]
+    return (ai, bj)
+
+
+def contacts(ax, ay, bcx, bcy, bx, by, cell_size: float, radius: int, max_neighbors: int, min_d2: float, max_d2: float) -> Tuple:
+    ai, bj = neighbor_pairs(ax, ay, bcx, bcy, cell_size, radius, max_neighbors)
+    dx = bx[bj] - ax[ai]
+    dy = by[bj] - ay[ai]
+    d2 = dx * dx + dy * dy
+    # one index gather and a reciprocal, as the loops compute the normal
+    k = np.flatnonzero((d2 > min_d2) & (d2 < max_d2))
+    inv = 1.0 / np.sqrt(d2[k])
+    return (ai[k], bj[k], dx[k] * inv, dy[k] * inv)
+
+
+def push(ax, ay, avx, avy, bcx, bcy, bx, by, bvx, bvy, cell_size: float, radius: int, max_neighbors: int, min_d2: float, max_d2: float, a_kick: float, b_kick: float) -> Tuple:
+    """Kick every contact pair apart along its normal; returns (a, b) contact indices."""
+    if _kernels.NUMBA_AVAILABLE and _kernels._load():
+        a_hit = np.zeros(ax.shape[0], np.bool_)
+        b_hit = np.zeros(bx.shape[0], np.bool_)
+        if bvx is None:
+            bvx = bvy = _NO_VELOCITIES
+        _kernels.cross_push(ax, ay, avx, avy, bcx, bcy, bx, by, bvx, bvy, float(cell_size), radius, max_neighbors, min_d2, max_d2, a_kick, b_kick, a_hit, b_hit)
+        return (np.flatnonzero(a_hit), np.flatnonzero(b_hit))
+    ai, bj, nx, ny = contacts(ax, ay, bcx, bcy, bx, by, cell_size, radius, max_neighbors, min_d2, max_d2)
+    if a_kick:
+        np.add.at(avx, ai, nx * a_kick)
+        np.add.at(avy, ai, ny * a_kick)
+    if b_kick:
+        np.add.at(bvx, bj, nx * b_kick)
+        np.add.at(bvy, bj, ny * b_kick)
+    return (ai, bj)
+
+
+def write_velocities(particles: Sequence, vxs, vys, touched) -> None:
+    if touched.shape[0] == 0:
+        return
+    idx = np.unique(touched)
+    for i, vx, vy in zip(idx.tolist(), vxs[idx].tolist(), vys[idx].tolist()):
+        p = particles[i]
+        p.vx = vx
+        p.vy = vy
@@ -0,0 +1,27 @@
+from collections import defaultdict
+from typing import Any, DefaultDict, Iterator, List, Tuple
+
+class Grid:
+
+    def __init__(self, cell_size: float):
+        self.cell_size = float(max(1.0, cell_size))
+        self.cells: DefaultDict[Tuple[int, int], List[Any]] = defaultdict(list)
+
+    def clear(self):
+        self.cells.clear()
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        cs = self.cell_size
+        return (int(x // cs), int(y // cs))
+
+    def insert(self, x: float, y: float, item: Any):
+        self.cells[self._cell(x, y)].append(item)
+
+    def query(self, x: float, y: float, radius: int=1) -> Iterator[Any]:
+        cx, cy = self._cell(x, y)
+        cells = self.cells
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                bucket = cells.get((cx + dx, cy + dy))
+                if bucket:
+                    yield from bucket
@@ -0,0 +1,19 @@
+from itertools import compress
+from operator import attrgetter, not_
+from typing import List
+
+# particle classes set ``dead = False`` up front, so the flags are normally read
+# with one C-level attrgetter pass instead of a getattr-with-default per particle
+_dead = attrgetter('dead')
+
+
+def live(particles: List) -> List:
+    """``particles`` without the ones flagged dead; the list itself when none are."""
+    try:
+        flags = list(map(_dead, particles))
+    except AttributeError:
+        # plugin-appended particles may not carry the flag; missing means alive
+        flags = [getattr(p, 'dead', False) for p in particles]
+    if not any(flags):
+        return particles
+    return list(compress(particles, map(not_, flags)))
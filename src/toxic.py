@@ -2,9 +2,11 @@ import math
 import random
 import pygame
 from typing import List, Tuple, Dict
+from src import brush, soa
+from src.sweep import live
 
 class ToxicParticle:
-    __slots__ = ('x', 'y', 'vx', 'vy', 'mass', 'age', 'bubble_t')
+    __slots__ = ('x', 'y', 'vx', 'vy', 'mass', 'age', 'bubble_t', 'dead')
 
     def __init__(self, x: float, y: float):
         self.x = x
@@ -14,6 +16,7 @@ class ToxicParticle:
         self.mass = 1.5
         self.age = 0
         self.bubble_t = random.randint(12, 28)
+        self.dead = False
 
     def update(self, gravity: float, friction: float):
         self.vy += gravity * self.mass
@@ -30,6 +33,9 @@ class ToxicParticle:
             self.vy = 12
 
 class ToxicSystem:
+    plots_point_groups = True
+    point_size = 2
+
 
     def __init__(self, width: int, height: int):
         self.width = width
@@ -51,15 +57,13 @@ class ToxicSystem:
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(ToxicParticle(x, y))
 
+    def add_particles(self, points):
+        w = self.width
+        h = self.height
+        self.particles.extend([ToxicParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
     def add_particle_cluster(self, cx: float, cy: float, radius: int=5):
-        r = max(1, int(radius))
-        for dx in range(-r, r + 1):
-            for dy in range(-r, r + 1):
-                if dx * dx + dy * dy <= r * r:
-                    x = cx + dx
-                    y = cy + dy
-                    if 0 <= x < self.width and 0 <= y < self.height:
-                        self.add_particle(x, y)
+        self.add_particles(brush.fill(cx, cy, max(1, int(radius))))
 
     def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
         return (int(x // self.cell_size), int(y // self.cell_size))
@@ -129,9 +133,12 @@ class ToxicSystem:
     def update(self, frame_index: int=0):
         if not self.particles:
             return
+        gravity = self.gravity
+        friction = self.friction
+        is_solid = self._is_solid
         for p in self.particles:
-            p.update(self.gravity, self.friction)
-            if getattr(self, '_is_solid', None) and self._is_solid(int(p.x), int(p.y)):
+            p.update(gravity, friction)
+            if is_solid is not None and is_solid(int(p.x), int(p.y)):
                 p.x -= p.vx
                 p.y -= p.vy
                 p.vx *= -0.2
@@ -156,9 +163,21 @@ class ToxicSystem:
                 pts.append((int(p.x), int(p.y)))
         return (color, pts)
 
+    def get_point_arrays(self):
+        ps = self.particles
+        if not soa.NUMPY_AVAILABLE or len(ps) < soa.MIN_BATCH:
+            return None
+        xs, ys, keep = soa.pixels(ps, self.width, self.height)
+        return ((90, 220, 90), (xs[keep], ys[keep]))
+
     def get_particle_count(self) -> int:
         return len(self.particles)
 
+    def sweep_dead(self):
+        if not self.particles:
+            return
+        self.particles = live(self.particles)
+
     def clear(self):
         self.particles.clear()
         self.grid.clear()
@@ -1,6 +1,8 @@
 import math
 import pygame
 from typing import List, Tuple
+from src import _kernels, brush, soa
+from src.sweep import live
 
 class WaterParticle:
 
@@ -12,6 +14,7 @@ class WaterParticle:
         self.mass = 0.8
         self.color = (100, 149, 237)
         self.pressure = 0.0
+        self.dead = False
 
     def apply_gravity(self, gravity: float):
         self.vy += gravity
@@ -29,6 +32,9 @@ class WaterParticle:
             self.vy = 15
 
 class WaterSystem:
+    plots_point_groups = True
+    point_size = 2
+
 
     def __init__(self, width: int, height: int):
         self.width = width
@@ -42,22 +48,28 @@ class WaterSystem:
         self.max_neighbors: int = 10
         self.skip_mod: int = 1
         self._is_solid = None
+        self._obstacle_grid = None
+        self._pending = None
 
     def set_obstacle_query(self, fn):
         self._is_solid = fn
 
+    def set_obstacle_grid(self, grid):
+        # begin_update indexes grid.data itself instead of calling the query
+        # once per particle; set_obstacle_query stays the fallback
+        self._obstacle_grid = grid
+
     def add_particle(self, x: float, y: float):
         if 0 <= x < self.width and 0 <= y < self.height:
             self.particles.append(WaterParticle(x, y))
 
+    def add_particles(self, points):
+        w = self.width
+        h = self.height
+        self.particles.extend([WaterParticle(x, y) for x, y in points if 0 <= x < w and 0 <= y < h])
+
     def add_particle_cluster(self, center_x: float, center_y: float, radius: int=5):
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                if dx * dx + dy * dy <= radius * radius:
-                    x = center_x + dx
-                    y = center_y + dy
-                    if 0 <= x < self.width and 0 <= y < self.height:
-                        self.add_particle(x, y)
+        self.add_particles(brush.fill(center_x, center_y, radius))
 
     def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
         return (int(x // self.cell_size), int(y // self.cell_size))
@@ -108,9 +120,11 @@ class WaterSystem:
                         break
 
     def _handle_boundaries(self):
+        w = self.width
+        h = self.height
         for particle in self.particles:
-            if particle.y + 1 >= self.height:
-                particle.y = self.height - 1
+            if particle.y + 1 >= h:
+                particle.y = h - 1
                 particle.vy *= -0.3
             if particle.y < 0:
                 particle.y = 0
@@ -118,21 +132,70 @@ class WaterSystem:
             if particle.x < 0:
                 particle.x = 0
                 particle.vx *= -0.3
-            if particle.x >= self.width:
-                particle.x = self.width - 1
+            if particle.x >= w:
+                particle.x = w - 1
                 particle.vx *= -0.3
 
     def update(self, frame_index: int=0):
+        self.begin_update(frame_index)
+        self.finish_update()
+
+    def begin_update(self, frame_index: int=0):
+        gravity = self.gravity
+        damp = 1 - self.viscosity
+        is_solid = self._is_solid
+        grid = self._obstacle_grid
+        if grid is not None:
+            cells = grid.data
+            gw = grid.width
+            gh = grid.height
         for particle in self.particles:
-            particle.update(self.gravity, self.viscosity)
-            if self._is_solid and self._is_solid(int(particle.x), int(particle.y)):
-                particle.x -= particle.vx
-                particle.y -= particle.vy
-                particle.vx *= -0.2
-                particle.vy *= -0.2
-        self._handle_collisions(frame_index)
+            vx = particle.vx * damp
+            vy = (particle.vy + gravity) * damp
+            x = particle.x + vx
+            y = particle.y + vy
+            if vy > 15:
+                vy = 15
+            if grid is not None:
+                xi = int(x)
+                yi = int(y)
+                hit = 0 <= xi < gw and 0 <= yi < gh and cells[yi * gw + xi]
+            else:
+                hit = is_solid is not None and is_solid(int(x), int(y))
+            if hit:
+                x -= vx
+                y -= vy
+                vx *= -0.2
+                vy *= -0.2
+            particle.x = x
+            particle.y = y
+            particle.vx = vx
+            particle.vy = vy
+        self._start_collisions(frame_index)
+
+    def finish_update(self):
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            fut, particles, arrays = pending
+            fut.result()
+            _kernels.scatter(particles, *arrays)
         self._handle_boundaries()
         self.particles = [p for p in self.particles if -10 <= p.x < self.width + 10 and -10 <= p.y < self.height + 10]
+        if pending is not None:
+            # the kernel never touches the dict grid; readers of this frame's
+            # grid (NPC coupling, cursor, reactions) need the scattered positions
+            self._rebuild_grid()
+
+    def _start_collisions(self, frame_index: int=0):
+        if self.skip_mod > 1 and frame_index % self.skip_mod != 0:
+            return
+        if _kernels.NUMBA_AVAILABLE and len(self.particles) >= _kernels.MIN_BATCH:
+            arrays = _kernels.gather(self.particles)
+            fut = _kernels.submit(_kernels.water_collide, *arrays, self.cell_size, self.neighbor_radius, self.max_neighbors, 0.3)
+            self._pending = (fut, self.particles, arrays)
+            return
+        self._handle_collisions(frame_index)
 
     def draw(self, surface: pygame.Surface):
         for particle in self.particles:
@@ -147,13 +210,20 @@ class WaterSystem:
                 points.append((int(p.x), int(p.y)))
         return (color, points)
 
+    def get_point_arrays(self):
+        ps = self.particles
+        if not soa.NUMPY_AVAILABLE or len(ps) < soa.MIN_BATCH:
+            return None
+        xs, ys, keep = soa.pixels(ps, self.width, self.height)
+        return ((100, 149, 237), (xs[keep], ys[keep]))
+
     def get_particle_count(self) -> int:
         return len(self.particles)
 
     def sweep_dead(self):
         if not self.particles:
             return
-        self.particles = [p for p in self.particles if not getattr(p, 'dead', False)]
+        self.particles = live(self.particles)
 
     def get_particles_at(self, x: float, y: float, radius: float=5) -> List[WaterParticle]:
         result = []
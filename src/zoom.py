@@ -25,11 +25,29 @@ class Camera:
     def is_identity(self) -> bool:
         return abs(self.scale - 1.0) < 1e-06 and abs(self.off_x) < 1e-06 and (abs(self.off_y) < 1e-06)
 
+    def is_scaled(self) -> bool:
+        return abs(self.scale - 1.0) >= 1e-06
+
     def world_to_view(self, x: float, y: float) -> tuple[int, int]:
         vx = int((x - self.off_x) * self.scale)
         vy = int((y - self.off_y) * self.scale)
         return (vx, vy)
 
+    def world_rect_to_view(self, x0: float, y0: float, x1: float, y1: float) -> tuple[int, int, int, int]:
+        # both corners in one call, normalised to (left, top, w, h)
+        off_x = self.off_x
+        off_y = self.off_y
+        scale = self.scale
+        ax = int((x0 - off_x) * scale)
+        bx = int((x1 - off_x) * scale)
+        ay = int((y0 - off_y) * scale)
+        by = int((y1 - off_y) * scale)
+        if ax > bx:
+            ax, bx = bx, ax
+        if ay > by:
+            ay, by = by, ay
+        return (ax, ay, bx - ax, by - ay)
+
     def view_to_world(self, vx: float, vy: float) -> tuple[float, float]:
         wx = vx / self.scale + self.off_x
         wy = vy / self.scale + self.off_y
@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import app
+from src import _kernels, soa
+
+
+def _scene():
+    random.seed(7)
+    game = app.ParticleGame(400, 300)
+    systems = (game.sand_system, game.water_system, game.lava_system, game.oil_system)
+    for system, count in zip(systems, (300, 300, 40, 300)):
+        for _ in range(count):
+            system.add_particle(random.uniform(170, 230), random.uniform(120, 180))
+        system._rebuild_grid()
+    # boundaries and the cursor move particles after the grids are built, so
+    # the fallback always reads a grid that lags the positions
+    for system in systems:
+        for p in system.particles:
+            p.x += random.uniform(-4, 4)
+            p.y += random.uniform(-4, 4)
+    return game
+
+
+def _state(game):
+    return (
+        [(p.x, p.y, p.vx, p.vy, p.wet) for p in game.sand_system.particles],
+        [(p.x, p.y, p.vx, p.vy) for p in game.water_system.particles],
+        [(p.x, p.y, p.vx, p.vy) for p in game.lava_system.particles],
+        [(p.x, p.y, p.vx, p.vy, p.burning, p.burn_timer) for p in game.oil_system.particles],
+    )
+
+
+@pytest.mark.skipif(not soa.NUMPY_AVAILABLE, reason='needs numpy')
+@pytest.mark.parametrize('jit', [False, True], ids=['numpy', 'kernels'])
+def test_array_passes_match_the_python_loops(jit, monkeypatch):
+    if jit and not (_kernels.NUMBA_AVAILABLE and _kernels._load()):
+        pytest.skip('needs numba or the AOT kernels')
+    with monkeypatch.context() as m:
+        m.setattr(soa, 'NUMPY_AVAILABLE', False)
+        m.setattr(_kernels, 'NUMBA_AVAILABLE', False)
+        game = _scene()
+        game._handle_cross_material_collisions()
+        expected = _state(game)
+    monkeypatch.setattr(_kernels, 'NUMBA_AVAILABLE', jit)
+    game = _scene()
+    game._handle_cross_material_collisions()
+    got = _state(game)
+    assert len(got[0]) < 300 and len(got[1]) < 300, 'lava killed nothing'
+    assert any(row[4] for row in got[3]), 'lava lit no oil'
+    assert got == expected
@@ -0,0 +1,28 @@
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from src import _kernels
+from src.sand import SandSystem
+from src.water import WaterSystem
+
+
+@pytest.mark.skipif(not (_kernels.NUMBA_AVAILABLE and _kernels._load()), reason='needs numba or the AOT kernels')
+@pytest.mark.parametrize('system_cls', [SandSystem, WaterSystem])
+def test_kernel_update_leaves_grid_on_new_positions(system_cls, monkeypatch):
+    system = system_cls(400, 300)
+    for i in range(_kernels.MIN_BATCH * 2):
+        system.add_particle(100 + (i % 40) * 1.5, 100 + (i // 40) * 1.5)
+    submitted = []
+    submit = _kernels.submit
+    monkeypatch.setattr(_kernels, 'submit', lambda fn, *args: submitted.append(fn) or submit(fn, *args))
+    system.update(1)
+    assert submitted, 'the kernel path did not run'
+    expected = {}
+    for p in system.particles:
+        expected.setdefault(system._get_cell(p.x, p.y), []).append(p)
+    assert system.grid == expected